@@ -0,0 +1,176 @@
+"""End-to-end throughput, latency and memory benchmarks for canonical workloads.
+
+Connects the library to an in-process `LoopbackRelay` (a fake Sidekick UI
+peer on 127.0.0.1) and runs typical workloads through the real pipeline:
+component call, command queue, JSON encoding and WebSocket send. For each
+workload it reports:
+
+*   messages/sec: messages received by the relay per second, from the first
+    component call to the last arrival.
+*   latency p50/p90/p99: time from a component call to the arrival of the
+    message it produced (for Canvas, from starting a frame to its drawBuffer).
+*   peak memory: peak Python heap during a second run under tracemalloc,
+    including the relay, which runs in the same process.
+
+The relay shares the process (and the GIL) with the library, so absolute
+numbers are lower than against a real UI; compare them between revisions.
+
+Run from the `libs/python` directory:
+
+    python benchmarks/bench_end_to_end.py [--scale X] [--only NAME ...] [--json results.json]
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+import sidekick
+from loopback_relay import LoopbackRelay
+
+
+# Each workload creates its component(s), makes its calls, and returns
+# (target instance_id, marker action, send timestamps). The relay must then
+# receive one message with the marker action per send timestamp. `run` keeps
+# instance IDs unique when a workload runs more than once.
+
+def grid_sweep(scale, run):
+    size = max(1, int(30 * math.sqrt(scale)))
+    grid = sidekick.Grid(size, size, instance_id=f"bench-grid-{run}")
+    sent = []
+    for y in range(size):
+        for x in range(size):
+            sent.append(time.perf_counter())
+            grid.set_color(x, y, "red" if (x + y) % 2 else "blue")
+    return grid.instance_id, "setColor", sent
+
+
+def canvas_particles(scale, run, particles=200):
+    canvas = sidekick.Canvas(400, 300, instance_id=f"bench-canvas-{run}")
+    sent = []
+    for frame in range(max(1, int(50 * scale))):
+        sent.append(time.perf_counter())
+        with canvas.buffer() as buf:
+            buf.clear()
+            for i in range(particles):
+                buf.draw_circle((i * 37 + frame * 5) % 400, (i * 53 + frame * 3) % 300, 3, fill_color="orange")
+    return canvas.instance_id, "drawBuffer", sent
+
+
+def console_flood(scale, run):
+    console = sidekick.Console(instance_id=f"bench-console-{run}")
+    sent = []
+    for i in range(max(1, int(5000 * scale))):
+        sent.append(time.perf_counter())
+        console.print(f"line {i}: the quick brown fox jumps over the lazy dog")
+    return console.instance_id, "append", sent
+
+
+def viz_large_dict(scale, run):
+    viz = sidekick.Viz(instance_id=f"bench-viz-dict-{run}")
+    data = {f"key{i}": [i, str(i), {"even": i % 2 == 0}] for i in range(10_000)}
+    sent = []
+    for i in range(max(1, int(10 * scale))):
+        sent.append(time.perf_counter())
+        viz.show(f"data{i}", data) # A new name each time: re-showing a name sends only a diff
+    return viz.instance_id, "set", sent
+
+
+def observable_churn(scale, run):
+    viz = sidekick.Viz(instance_id=f"bench-viz-observable-{run}")
+    items = sidekick.ObservableValue([])
+    viz.show("items", items)
+    sent = []
+    for i in range(max(1, int(5000 * scale))):
+        sent.append(time.perf_counter())
+        items.append(i)
+    return viz.instance_id, "append", sent
+
+
+WORKLOADS = {
+    "grid_sweep": grid_sweep,
+    "canvas_particles": canvas_particles,
+    "console_flood": console_flood,
+    "viz_large_dict": viz_large_dict,
+    "observable_churn": observable_churn,
+}
+
+
+def _percentile(sorted_values, percent):
+    index = min(len(sorted_values) - 1, max(0, math.ceil(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_workload(relay, workload, scale):
+    """Runs `workload` once and returns its throughput and latency figures."""
+    messages_before = relay.messages_received
+    target, action, sent = workload(scale, "timed")
+    relay.wait_for(target, len(sent), action)
+    arrivals = relay.arrivals(target, action)
+    elapsed = arrivals[-1] - sent[0]
+    latencies = sorted(arrived - started for arrived, started in zip(arrivals, sent))
+    messages = relay.messages_received - messages_before
+    return {
+        "messages": messages,
+        "seconds": elapsed,
+        "messages_per_sec": messages / elapsed if elapsed > 0 else float("inf"),
+        "latency_ms": {f"p{p}": _percentile(latencies, p) * 1000 for p in (50, 90, 99)},
+    }
+
+
+def measure_memory(relay, workload, scale):
+    """Runs `workload` again under tracemalloc and returns the peak heap in KiB."""
+    tracemalloc.start()
+    try:
+        target, action, sent = workload(scale, "memory")
+        relay.wait_for(target, len(sent), action)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the size of every workload.")
+    parser.add_argument("--only", nargs="+", choices=sorted(WORKLOADS), help="Run only these workloads.")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results to PATH as JSON.")
+    args = parser.parse_args()
+
+    relay = LoopbackRelay()
+    sidekick.set_url(relay.start())
+    sidekick.wait_for_connection()
+
+    results = {}
+    try:
+        print(f"{'workload':<18} {'messages':>9} {'msgs/sec':>11} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'peak KiB':>10}")
+        for name in args.only or WORKLOADS:
+            result = run_workload(relay, WORKLOADS[name], args.scale)
+            result["peak_memory_kib"] = measure_memory(relay, WORKLOADS[name], args.scale)
+            results[name] = result
+            latency = result["latency_ms"]
+            print(f"{name:<18} {result['messages']:>9,} {result['messages_per_sec']:>11,.0f} "
+                  f"{latency['p50']:>8.2f} {latency['p90']:>8.2f} {latency['p99']:>8.2f} {result['peak_memory_kib']:>10,.0f}")
+    finally:
+        sidekick.shutdown(wait=True)
+        relay.stop()
+
+    if args.json:
+        report = {
+            "meta": {
+                "sidekick_version": sidekick.__version__,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "scale": args.scale,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
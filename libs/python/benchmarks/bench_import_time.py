@@ -0,0 +1,78 @@
+"""Cold-start benchmark for `import sidekick`.
+
+Runs `python -X importtime -c "import sidekick"` in fresh interpreters and
+reports the best cumulative import time of the package, plus the slowest
+modules it pulls in. Exits with status 1 if the best time exceeds the budget,
+or if `import sidekick` loads modules that must stay lazy (the `websockets`
+transport and the component modules), so it can guard against regressions in
+CI.
+
+Run from the `libs/python` directory:
+
+    python benchmarks/bench_import_time.py [--repeat N] [--budget-ms MS] [--top N]
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Modules that `import sidekick` must not load; they are imported on first use.
+LAZY_MODULES = (
+    "websockets",
+    "sidekick.core.websocket_communication_manager",
+    "sidekick.grid",
+    "sidekick.console",
+    "sidekick.viz",
+    "sidekick.canvas",
+    "sidekick.label",
+    "sidekick.button",
+    "sidekick.textbox",
+    "sidekick.markdown",
+    "sidekick.row",
+    "sidekick.column",
+)
+
+
+def measure_once():
+    """Returns {module: cumulative microseconds} for one cold `import sidekick`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import sidekick"],
+        capture_output=True, text=True, check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to run (best is reported).")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Maximum allowed cumulative import time.")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules to list.")
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.repeat)]
+    best = min(runs, key=lambda timings: timings.get("sidekick", float("inf")))
+    total_ms = best["sidekick"] / 1000
+
+    print(f"import sidekick: {total_ms:.1f} ms (best of {args.repeat}, budget {args.budget_ms:.0f} ms)")
+    print(f"{'module':<50} {'cumulative ms':>14}")
+    slowest = sorted(best.items(), key=lambda item: item[1], reverse=True)[1:args.top + 1]
+    for name, cumulative in slowest:
+        print(f"{name:<50} {cumulative / 1000:>14.1f}")
+
+    eager = [name for name in LAZY_MODULES if name in best]
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        print("FAIL: import time is over budget")
+    sys.exit(1 if eager or total_ms > args.budget_ms else 0)
+
+
+if __name__ == "__main__":
+    main()
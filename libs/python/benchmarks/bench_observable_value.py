@@ -0,0 +1,76 @@
+"""Micro-benchmarks for ObservableValue mutation throughput.
+
+Measures how many `append`, `__setitem__` and `update` operations per second an
+`ObservableValue` sustains, both with no subscribers (the cost of the wrapper
+itself) and with one no-op subscriber (the cost of building and delivering
+change records).
+
+Run from the `libs/python` directory:
+
+    python benchmarks/bench_observable_value.py [--repeat N] [--number N]
+"""
+
+import argparse
+import timeit
+
+from sidekick.observable_value import ObservableValue
+
+
+def _subscriber(change_details):
+    pass
+
+
+def _make(value, subscribed):
+    observable = ObservableValue(value)
+    if subscribed:
+        observable.subscribe(_subscriber)
+    return observable
+
+
+def bench_append(subscribed, number):
+    observable = _make([], subscribed)
+    def run():
+        for i in range(number):
+            observable.append(i)
+    return run
+
+
+def bench_setitem(subscribed, number):
+    observable = _make(list(range(number)), subscribed)
+    def run():
+        for i in range(number):
+            observable[i] = i
+    return run
+
+
+def bench_update(subscribed, number):
+    observable = _make({}, subscribed)
+    items = {f"key{i}": i for i in range(number)}
+    return lambda: observable.update(items)
+
+
+BENCHMARKS = {
+    "append": bench_append,
+    "setitem": bench_setitem,
+    "update": bench_update,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per benchmark (best is reported).")
+    parser.add_argument("--number", type=int, default=100_000, help="Operations per timing run.")
+    args = parser.parse_args()
+
+    print(f"{'benchmark':<10} {'subscribers':>11} {'ops/sec':>14} {'ns/op':>10}")
+    for name, factory in BENCHMARKS.items():
+        for subscribed in (False, True):
+            best = float("inf")
+            for _ in range(args.repeat):
+                run = factory(subscribed, args.number) # Fresh value for every run
+                best = min(best, timeit.timeit(run, number=1))
+            print(f"{name:<10} {int(subscribed):>11} {args.number / best:>14,.0f} {best / args.number * 1e9:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
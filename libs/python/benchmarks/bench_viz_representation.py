@@ -0,0 +1,45 @@
+"""Micro-benchmarks for building Viz representations.
+
+Measures how many representation nodes per second `_get_representation`
+builds for typical values: scalars, nested containers, and custom objects
+(which go through the per-type handler lookup and attribute inspection).
+
+Run from the `libs/python` directory:
+
+    python benchmarks/bench_viz_representation.py [--repeat N] [--number N]
+"""
+
+import argparse
+import timeit
+
+from sidekick.viz import _count_nodes, _get_representation
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+VALUES = {
+    "scalars": lambda: list(range(50)),
+    "nested": lambda: {f"key{i}": [i, str(i), (i, i + 1.5)] for i in range(50)},
+    "objects": lambda: [Point(i, -i) for i in range(50)],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per benchmark (best is reported).")
+    parser.add_argument("--number", type=int, default=2_000, help="Representations built per timing run.")
+    args = parser.parse_args()
+
+    print(f"{'value':<10} {'nodes':>7} {'reps/sec':>12} {'nodes/sec':>14}")
+    for name, make in VALUES.items():
+        value = make()
+        nodes = _count_nodes(_get_representation(value))
+        best = min(timeit.repeat(lambda: _get_representation(value), repeat=args.repeat, number=args.number))
+        print(f"{name:<10} {nodes:>7} {args.number / best:>12,.0f} {nodes * args.number / best:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
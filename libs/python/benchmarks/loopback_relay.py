@@ -0,0 +1,117 @@
+"""An in-process WebSocket relay that stands in for the Sidekick UI.
+
+`LoopbackRelay` runs a WebSocket server on 127.0.0.1 in a background thread.
+When the Python library (the "hero" peer) announces itself, the relay answers
+with a `system/announce` from a fake "sidekick" peer, so the library finishes
+its handshake exactly as it would with the real UI. Every other message is
+recorded with its arrival time (`time.perf_counter()`, comparable with
+timestamps taken in the benchmark itself) instead of being forwarded.
+
+Used by `bench_end_to_end.py`; it is not part of the installed package.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import websockets
+
+_FAKE_PEER_ID = "sidekick-loopback"
+
+
+class LoopbackRelay:
+    """Fake Sidekick UI peer that records the messages sent to it."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._host = host
+        self._port = port
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+        self._condition = threading.Condition()
+        # target instance ID -> [(arrival time, message)]
+        self._received: Dict[str, List[Tuple[float, Dict[str, Any]]]] = {}
+        # (target, action or None for any) -> number of messages received
+        self._counts: Dict[Tuple[str, Optional[str]], int] = {}
+        self.messages_received = 0
+        self.bytes_received = 0
+        self.url = ""
+
+    def start(self) -> str:
+        """Starts the relay and returns its ws:// URL."""
+        self._thread = threading.Thread(target=self._run, name="LoopbackRelay", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("Loopback relay did not start.")
+        return self.url
+
+    def stop(self) -> None:
+        """Stops the relay and waits for its thread to finish."""
+        if self._loop and self._stop_event:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+        if self._thread:
+            self._thread.join(timeout=10)
+
+    def arrivals(self, target: str, action: Optional[str] = None) -> List[float]:
+        """Returns the arrival times of the messages for `target`, optionally only those with `action`."""
+        with self._condition:
+            return [arrived for arrived, message in self._received.get(target, ())
+                    if action is None or _action(message) == action]
+
+    def wait_for(self, target: str, count: int, action: Optional[str] = None, timeout: float = 60.0) -> None:
+        """Blocks until at least `count` matching messages for `target` have arrived."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                received = self._counts.get((target, action), 0)
+                if received >= count:
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Only {received}/{count} messages for '{target}' arrived.")
+                self._condition.wait(remaining)
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._serve())
+        self._loop.close()
+
+    async def _serve(self) -> None:
+        self._stop_event = asyncio.Event()
+        async with websockets.serve(self._handle_peer, self._host, self._port, max_size=None) as server:
+            port = next(iter(server.sockets)).getsockname()[1]
+            self.url = f"ws://{self._host}:{port}"
+            self._ready.set()
+            await self._stop_event.wait()
+
+    async def _handle_peer(self, websocket) -> None:
+        async for raw in websocket:
+            arrived = time.perf_counter()
+            message = json.loads(raw)
+            if message.get("component") == "system" and message.get("type") == "announce":
+                payload = message.get("payload", {})
+                if payload.get("role") == "hero" and payload.get("status") == "online":
+                    await websocket.send(json.dumps({
+                        "id": 0, "component": "system", "type": "announce",
+                        "payload": {"peerId": _FAKE_PEER_ID, "role": "sidekick", "status": "online",
+                                    "version": "loopback", "timestamp": int(time.time() * 1000)},
+                    }))
+                continue
+            with self._condition:
+                self.messages_received += 1
+                self.bytes_received += len(raw)
+                target = message.get("target", "")
+                self._received.setdefault(target, []).append((arrived, message))
+                self._counts[(target, None)] = self._counts.get((target, None), 0) + 1
+                action = _action(message)
+                if action is not None:
+                    self._counts[(target, action)] = self._counts.get((target, action), 0) + 1
+                self._condition.notify_all()
+
+
+def _action(message: Dict[str, Any]) -> Optional[str]:
+    payload = message.get("payload")
+    return payload.get("action") if isinstance(payload, dict) else None
@@ -48,7 +48,9 @@ Getting Started:
 Happy visual coding!
 """
 
+import importlib
 import logging
+from typing import TYPE_CHECKING
 
 # --- Version ---
 from ._version import __version__
@@ -80,10 +82,26 @@ from .connection import (
     run_forever_async,            # Keep script running (async), waits for connection first.
     shutdown,                     # Gracefully close the connection to Sidekick.
     submit_interval,              # Submits a function to be called repeatedly at a specified interval.
-    submit_task                   # Submit a user coroutine to Sidekick's event loop.
+    submit_task,                  # Submit a user coroutine to Sidekick's event loop.
+    run_in_process                # Await a CPU-heavy function run in a worker process.
 )
 # Note: Internal methods like `send_message_internally` from connection.py are not re-exported.
 
+# --- Where synchronous event callbacks run (event loop thread or worker threads) ---
+from .callbacks import set_callback_mode, callback_stats
+
+# --- Connection pipeline metrics (off by default) ---
+from .metrics import enable_stats, stats
+
+# --- Optional tracing hooks (no-op until a tracer is installed) ---
+from .tracing import Tracer, set_tracer
+
+# --- Per-component traffic profiling ---
+from .profiler import profile
+
+# --- Session recording (for bug reports and `python -m sidekick.replay`) ---
+from .recorder import record
+
 # --- Import custom application-level exception classes ---
 # Users can catch these to handle Sidekick-specific errors.
 from .exceptions import (
@@ -95,7 +113,7 @@ from .exceptions import (
 )
 
 # --- Core observable class for reactive UI updates with Viz ---
-from .observable_value import ObservableValue
+from .observable_value import ObservableValue, DeliveryPolicy
 
 # --- Event classes for structured callbacks from UI components ---
 from .events import (
@@ -103,24 +121,61 @@ from .events import (
     ButtonClickEvent,     # Event for Button clicks.
     GridClickEvent,       # Event for Grid cell clicks.
     CanvasClickEvent,     # Event for Canvas clicks.
+    CanvasPointerEvent,   # Event for throttled Canvas pointer movement and drags.
     TextboxSubmitEvent,   # Event for Textbox submissions.
     ConsoleSubmitEvent,   # Event for Console input submissions.
     ErrorEvent,           # Event for errors reported by a UI component.
 )
 
 # --- Standard Component Classes (UI building blocks) ---
-from .grid import Grid
-from .console import Console
-from .viz import Viz
-from .canvas import Canvas
-from .label import Label
-from .button import Button
-from .textbox import Textbox
-from .markdown import Markdown
-
 # --- Layout Container Classes (for arranging components) ---
-from .row import Row
-from .column import Column
+# These are imported on first access (PEP 562 module `__getattr__`), so that
+# `import sidekick` stays fast for short scripts that use only a few of them.
+# `sidekick.Grid`, `from sidekick import Grid` and `from sidekick import *`
+# all work as usual.
+_LAZY_ATTRIBUTES = {
+    'Grid': '.grid',
+    'Console': '.console',
+    'Viz': '.viz',
+    'Canvas': '.canvas',
+    'Label': '.label',
+    'Button': '.button',
+    'Textbox': '.textbox',
+    'Markdown': '.markdown',
+    'Row': '.row',
+    'Column': '.column',
+}
+
+if TYPE_CHECKING: # pragma: no cover
+    # Eager imports for type checkers and IDEs, which don't run __getattr__.
+    from .grid import Grid
+    from .console import Console
+    from .viz import Viz
+    from .canvas import Canvas
+    from .label import Label
+    from .button import Button
+    from .textbox import Textbox
+    from .markdown import Markdown
+    from .row import Row
+    from .column import Column
+
+# Their modules are lazy too, but stay reachable as attributes, e.g.,
+# `sidekick.viz.register_repr` after a plain `import sidekick`.
+_LAZY_SUBMODULES = frozenset(module_name[1:] for module_name in _LAZY_ATTRIBUTES.values())
+
+def __getattr__(name: str):
+    """Imports lazily loaded components and their modules on first access (PEP 562). (Internal)."""
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module('.' + name, __name__) # Importing also sets the attribute
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value # Later lookups no longer reach __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _LAZY_SUBMODULES)
 
 
 # --- __all__ Definition ---
@@ -145,15 +200,30 @@ __all__ = [
     'shutdown',
     'submit_interval',
     'submit_task',
+    'run_in_process',
+
+    # Callback Execution
+    'set_callback_mode',
+    'callback_stats',
+
+    # Diagnostics
+    'enable_stats',
+    'stats',
+    'Tracer',
+    'set_tracer',
+    'profile',
+    'record',
 
     # Observable Value (for Viz reactivity)
     'ObservableValue',
+    'DeliveryPolicy',
 
     # Event Classes
     'BaseSidekickEvent',
     'ButtonClickEvent',
     'GridClickEvent',
     'CanvasClickEvent',
+    'CanvasPointerEvent',
     'TextboxSubmitEvent',
     'ConsoleSubmitEvent',
     'ErrorEvent',
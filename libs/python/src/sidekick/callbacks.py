@@ -0,0 +1,204 @@
+"""Controls where Sidekick runs your synchronous event callbacks.
+
+By default, a regular (non-async) callback such as a button's `on_click`
+handler runs directly on Sidekick's event loop thread. That is simple and
+fast, but a slow handler (reading a large file, a long computation) blocks
+everything else Sidekick does meanwhile: sending updates, receiving events
+and keeping the connection alive.
+
+With `sidekick.set_callback_mode("thread")`, synchronous callbacks run on a
+small pool of worker threads instead. Callbacks of the *same* component still
+run one after another, in the order their events arrived, so a handler never
+runs concurrently with itself. Callbacks of different components may run in
+parallel, so protect shared data with a lock if needed. The mode can also be
+chosen per component with `component.set_callback_mode(...)`.
+
+`sidekick.callback_stats()` reports how long callbacks take to run and how
+long they waited for a worker, which helps to find slow handlers.
+
+Async callbacks (`async def`) are not affected: they are always scheduled on
+the event loop.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+
+from . import logger
+from .core import runtime
+
+# Supported callback modes.
+CALLBACK_MODE_INLINE = "inline"  # Run on the event loop thread (default)
+CALLBACK_MODE_THREAD = "thread"  # Run on the shared worker thread pool
+_CALLBACK_MODES = (CALLBACK_MODE_INLINE, CALLBACK_MODE_THREAD)
+
+_DEFAULT_MAX_WORKERS = 4
+
+
+class _CallbackMetrics:
+    """Running counters and timings of callback execution. (Internal)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.invoked = 0           # Callbacks started
+        self.failed = 0            # Callbacks that raised an exception
+        self.run_total = 0.0       # Seconds spent running callbacks
+        self.run_max = 0.0
+        self.wait_total = 0.0      # Seconds callbacks waited in a queue before running
+        self.wait_max = 0.0
+
+    def record(self, wait: float, run: float, failed: bool):
+        with self.lock:
+            self.invoked += 1
+            self.failed += failed
+            self.run_total += run
+            self.wait_total += wait
+            if run > self.run_max: self.run_max = run
+            if wait > self.wait_max: self.wait_max = wait
+
+
+class _CallbackDispatcher:
+    """Runs synchronous callbacks inline or on a bounded thread pool. (Internal).
+
+    Work for the thread pool is queued per key (the component's instance ID).
+    At most one pool task drains a given key's queue at a time, which keeps
+    the callbacks of one component serialized and in order while different
+    components can run in parallel.
+    """
+
+    def __init__(self):
+        self.default_mode = CALLBACK_MODE_INLINE
+        self.max_workers = _DEFAULT_MAX_WORKERS
+        self.metrics = _CallbackMetrics()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queues: Dict[str, Deque[Tuple[Callable[[], Any], float]]] = {}
+        self._draining: Set[str] = set()
+        # Bumped by `shutdown`, so drain tasks of a shut down pool leave new work alone.
+        self._generation = 0
+
+    def dispatch(self, key: str, func: Callable[[], Any], mode: Optional[str] = None):
+        """Runs `func` according to `mode` (or the default mode)."""
+        if (mode or self.default_mode) == CALLBACK_MODE_THREAD and runtime.threads_available:
+            queued_at = time.perf_counter()
+            with self._lock:
+                self._queues.setdefault(key, deque()).append((func, queued_at))
+                if key in self._draining:
+                    return # The running drain task will pick it up, preserving order
+                self._draining.add(key)
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sidekick-callback")
+                executor = self._executor
+                generation = self._generation
+            executor.submit(self._drain, key, generation)
+        else:
+            self._run(func, 0.0)
+
+    def pending(self) -> int:
+        """Returns the number of callbacks waiting for a worker thread."""
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def shutdown(self, wait: bool = False):
+        """Stops the worker threads. Queued callbacks that haven't started are dropped."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._queues.clear()
+            self._draining.clear()
+            self._generation += 1
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _drain(self, key: str, generation: int):
+        while True:
+            with self._lock:
+                if generation != self._generation:
+                    return # Shut down; the queues and drain flags now belong to a new pool
+                queue = self._queues.get(key)
+                if not queue:
+                    self._queues.pop(key, None)
+                    self._draining.discard(key)
+                    return
+                func, queued_at = queue.popleft()
+            self._run(func, time.perf_counter() - queued_at)
+
+    def _run(self, func: Callable[[], Any], wait: float):
+        started = time.perf_counter()
+        failed = False
+        try:
+            func()
+        except Exception as e:
+            failed = True
+            logger.exception(f"Error occurred inside a Sidekick callback: {e}")
+        finally:
+            self.metrics.record(wait, time.perf_counter() - started, failed)
+
+
+_dispatcher = _CallbackDispatcher()
+
+
+def set_callback_mode(mode: str, max_workers: Optional[int] = None) -> None:
+    """Chooses where synchronous event callbacks run by default.
+
+    Args:
+        mode (str): "inline" (the default) runs callbacks on Sidekick's event
+            loop thread. "thread" runs them on a pool of worker threads, so
+            slow callbacks don't block Sidekick. Callbacks of the same
+            component still run one at a time, in order. In Pyodide, where
+            threads are unavailable, "thread" behaves like "inline".
+        max_workers (Optional[int]): Maximum number of worker threads used by
+            "thread" mode. Takes effect when the pool is next created, i.e.
+            before the first threaded callback runs. Defaults to 4.
+
+    Raises:
+        ValueError: If `mode` or `max_workers` is invalid.
+
+    Example:
+        >>> sidekick.set_callback_mode("thread")
+        >>> button = sidekick.Button("Load", on_click=load_big_file)  # Doesn't freeze Sidekick
+    """
+    if mode not in _CALLBACK_MODES:
+        raise ValueError(f"Callback mode must be one of {_CALLBACK_MODES}, got {mode!r}.")
+    if max_workers is not None:
+        if isinstance(max_workers, bool) or not isinstance(max_workers, int) or max_workers <= 0:
+            raise ValueError(f"max_workers must be a positive integer, got {max_workers!r}.")
+        _dispatcher.max_workers = max_workers
+    _dispatcher.default_mode = mode
+    logger.info(f"Sidekick callback mode set to '{mode}' (max workers: {_dispatcher.max_workers}).")
+
+
+def callback_stats(reset: bool = False) -> Dict[str, Any]:
+    """Returns timing statistics about the event callbacks run so far.
+
+    Args:
+        reset (bool): If True, the counters are reset after reading them.
+
+    Returns:
+        Dict[str, Any]: A dictionary with the keys 'mode' (default callback
+            mode), 'invoked' (callbacks run), 'failed' (callbacks that raised),
+            'pending' (callbacks waiting for a worker thread), and the average
+            and maximum run time and queue wait time in seconds
+            ('run_avg', 'run_max', 'wait_avg', 'wait_max').
+    """
+    metrics = _dispatcher.metrics
+    with metrics.lock:
+        invoked = metrics.invoked
+        stats = {
+            "mode": _dispatcher.default_mode,
+            "invoked": invoked,
+            "failed": metrics.failed,
+            "pending": 0,
+            "run_avg": metrics.run_total / invoked if invoked else 0.0,
+            "run_max": metrics.run_max,
+            "wait_avg": metrics.wait_total / invoked if invoked else 0.0,
+            "wait_max": metrics.wait_max,
+        }
+        if reset:
+            metrics.reset()
+    stats["pending"] = _dispatcher.pending()
+    return stats
@@ -25,7 +25,9 @@ Key Features:
     before displaying it all at once.
 *   **Interactivity:** Make your canvas respond to user clicks using the
     `on_click()` method or the `on_click` constructor parameter to register a
-    callback function that receives a `CanvasClickEvent` object.
+    callback function that receives a `CanvasClickEvent` object. For drawing
+    apps, `on_drag()` and `on_pointer_move()` report pointer movement as
+    `CanvasPointerEvent` objects, throttled by the UI to a configurable rate.
 
 Basic Usage:
     >>> import sidekick
@@ -59,11 +61,14 @@ from typing import Optional, Dict, Any, Callable, List, Tuple, ContextManager, U
 
 from . import logger
 from .component import Component
-from .events import CanvasClickEvent, ErrorEvent
+from .events import CanvasClickEvent, CanvasPointerEvent, ErrorEvent
 
 # Type hint for a list of points used in polylines/polygons
 PointList = List[Tuple[int, int]]
 
+# Default maximum number of pointer stream events per second sent by the UI.
+_DEFAULT_POINTER_EVENT_RATE = 30
+
 
 class _CanvasBufferProxy:
     """Internal helper object used with the `canvas.buffer()` context manager. (Internal).
@@ -301,6 +306,10 @@ class Canvas(Component):
         self._width = width
         self._height = height
         self._click_callback: Optional[Callable[[CanvasClickEvent], Union[None, Coroutine[Any, Any, None]]]] = None
+        self._pointer_move_callback: Optional[Callable[[CanvasPointerEvent], Union[None, Coroutine[Any, Any, None]]]] = None
+        self._drag_callback: Optional[Callable[[CanvasPointerEvent], Union[None, Coroutine[Any, Any, None]]]] = None
+        # Maximum events per second of each pointer stream in the UI (None: stream disabled).
+        self._pointer_event_rates: Dict[str, Optional[float]] = {"move": None, "drag": None}
         self._buffer_pool: Dict[int, bool] = {} # Stores {buffer_id: is_in_use}
         self._next_buffer_id: int = 1 # Start offscreen buffer IDs from 1 (0 is onscreen)
         self._buffer_lock = threading.Lock() # Protects access to _buffer_pool and _next_buffer_id
@@ -371,6 +380,24 @@ class Canvas(Component):
                         f"with missing/invalid coordinates: {payload}"
                      )
                 return
+            elif event_type in ("pointerMove", "drag"):
+                # The UI sends all positions sampled since its previous event.
+                points = [
+                    (point.get('x'), point.get('y')) for point in payload.get('points') or []
+                    if isinstance(point, dict) and isinstance(point.get('x'), int) and isinstance(point.get('y'), int)
+                ]
+                if not points:
+                    logger.warning(f"Canvas '{self.instance_id}' received '{event_type}' event without valid points: {payload}")
+                    return
+                if event_type == "drag":
+                    self._invoke_callback(self._drag_callback, CanvasPointerEvent(
+                        instance_id=self.instance_id, type="drag", points=points, phase=payload.get('phase', 'move')
+                    ))
+                else:
+                    self._invoke_callback(self._pointer_move_callback, CanvasPointerEvent(
+                        instance_id=self.instance_id, type="pointer_move", points=points
+                    ))
+                return
 
         # Call the base handler for potential 'error' messages or other base handling.
         super()._internal_message_handler(message)
@@ -444,6 +471,89 @@ class Canvas(Component):
         self.on_click(func) # Register the function using the standard method
         return func # Return the original function
 
+    def on_pointer_move(self, callback: Optional[Callable[[CanvasPointerEvent], Union[None, Coroutine[Any, Any, None]]]],
+                        max_rate: float = _DEFAULT_POINTER_EVENT_RATE):
+        """Registers a function to call when the pointer moves over this canvas.
+
+        This reports hovering, i.e. movement while no mouse button is pressed;
+        use `on_drag()` for movement with the button held down. To avoid
+        flooding your script, the UI sends at most `max_rate` events per second.
+        Each `CanvasPointerEvent` holds all positions sampled since the previous
+        one in `event.points`; `event.x` and `event.y` give the latest position.
+
+        Args:
+            callback (Optional[Callable[[CanvasPointerEvent], Union[None, Coroutine[Any, Any, None]]]]): The function
+                to call. It must accept one `CanvasPointerEvent` argument and can be a
+                regular function or a coroutine function (async def). Pass `None`
+                to stop receiving pointer movement.
+            max_rate (float): Maximum number of events per second. Defaults to 30.
+
+        Raises:
+            TypeError: If `callback` is not a callable function or `None`.
+            ValueError: If `max_rate` is not a positive number.
+
+        Example:
+            >>> def follow(event):
+            ...     status.text = f"Pointer at ({event.x}, {event.y})"
+            ...
+            >>> canvas.on_pointer_move(follow, max_rate=10)
+        """
+        if callback is not None and not callable(callback):
+            raise TypeError("The provided on_pointer_move callback must be a callable function or None.")
+        self._set_pointer_event_rate("move", max_rate if callback is not None else None)
+        self._pointer_move_callback = callback
+
+    def on_drag(self, callback: Optional[Callable[[CanvasPointerEvent], Union[None, Coroutine[Any, Any, None]]]],
+                max_rate: float = _DEFAULT_POINTER_EVENT_RATE):
+        """Registers a function to call when the user drags the pointer across this canvas.
+
+        A drag starts when the primary mouse button is pressed on the canvas
+        and ends when it is released. The callback receives a
+        `CanvasPointerEvent` whose `phase` is "start" when the button is
+        pressed, "move" while dragging and "end" when it is released. While
+        dragging, the UI sends at most `max_rate` events per second, each
+        holding all positions sampled since the previous event in `event.points`.
+
+        Args:
+            callback (Optional[Callable[[CanvasPointerEvent], Union[None, Coroutine[Any, Any, None]]]]): The function
+                to call. It must accept one `CanvasPointerEvent` argument and can be a
+                regular function or a coroutine function (async def). Pass `None`
+                to stop receiving drag events.
+            max_rate (float): Maximum number of events per second. Defaults to 30.
+
+        Raises:
+            TypeError: If `callback` is not a callable function or `None`.
+            ValueError: If `max_rate` is not a positive number.
+
+        Example:
+            >>> last_point = None
+            >>> def draw(event):
+            ...     global last_point
+            ...     points = event.points if event.phase == "start" else [last_point] + event.points
+            ...     if len(points) >= 2:
+            ...         canvas.draw_polyline(points, line_color='black', line_width=2)
+            ...     last_point = event.points[-1]
+            ...
+            >>> canvas.on_drag(draw)
+        """
+        if callback is not None and not callable(callback):
+            raise TypeError("The provided on_drag callback must be a callable function or None.")
+        self._set_pointer_event_rate("drag", max_rate if callback is not None else None)
+        self._drag_callback = callback
+
+    def _set_pointer_event_rate(self, stream: str, max_rate: Optional[float]):
+        """Enables, re-rates or disables a pointer event stream in the UI. (Internal)."""
+        if max_rate is not None and (isinstance(max_rate, bool) or not isinstance(max_rate, (int, float)) or max_rate <= 0):
+            raise ValueError(f"max_rate must be a positive number of events per second, got {max_rate!r}.")
+        if self._pointer_event_rates[stream] == max_rate:
+            return
+        self._pointer_event_rates[stream] = max_rate
+        logger.info(f"Canvas '{self.instance_id}': pointer '{stream}' events set to max rate {max_rate}.")
+        self._send_update({
+            "action": "setPointerEvents",
+            "options": dict(self._pointer_event_rates)
+        })
+
     def buffer(self) -> ContextManager[_CanvasBufferProxy]:
         """Provides a context manager (`with` statement) for efficient double buffering.
 
@@ -891,7 +1001,10 @@ class Canvas(Component):
         """Internal: Resets canvas-specific callbacks when the component is removed."""
         super()._reset_specific_callbacks()
         self._click_callback = None
-        logger.debug(f"Canvas '{self.instance_id}': Click callback reset.")
+        self._pointer_move_callback = None
+        self._drag_callback = None
+        self._pointer_event_rates = {"move": None, "drag": None}
+        logger.debug(f"Canvas '{self.instance_id}': Click and pointer callbacks reset.")
 
     def remove(self):
         """Removes the canvas and its associated offscreen buffers from the Sidekick UI.
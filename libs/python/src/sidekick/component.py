@@ -38,10 +38,14 @@ Note:
 """
 
 import asyncio
+import time
 from typing import Optional, Dict, Any, Callable, Union, Coroutine
 
 from . import logger
 from . import connection as sidekick_connection_module # Alias for clarity
+from . import callbacks as sidekick_callbacks_module
+from . import profiler
+from . import tracing
 from .exceptions import SidekickConnectionError, SidekickDisconnectedError
 from .utils import generate_unique_id
 from .events import ErrorEvent, BaseSidekickEvent
@@ -62,6 +66,11 @@ class Component:
             This ID is used in protocol messages to target this specific component
             in the Sidekick UI.
     """
+    # Whether the inbound routing table holds this component's handler weakly.
+    # Interactive components stay registered (and alive) until removed, since
+    # containers don't keep references to their children.
+    _weak_message_handler: bool = False
+
     def __init__(
         self,
         component_type: str,
@@ -126,6 +135,7 @@ class Component:
         """
         self.component_type = component_type
         self._error_callback: Optional[Callable[[ErrorEvent], Union[None, Coroutine[Any, Any, None]]]] = None
+        self._callback_mode: Optional[str] = None # None follows sidekick.set_callback_mode()
 
         # --- Instance ID Assignment ---
         final_instance_id: str
@@ -144,7 +154,7 @@ class Component:
         # --- Register with ConnectionService ---
         try:
             sidekick_connection_module.register_message_handler(
-                self.instance_id, self._internal_message_handler
+                self.instance_id, self._internal_message_handler, weak=self._weak_message_handler
             )
         except ValueError as e_id_dup:
             logger.error(
@@ -251,15 +261,24 @@ class Component:
         try:
             if asyncio.iscoroutinefunction(callback):
                 coro_obj = callback(event_object) # type: ignore [operator] # Known to be coroutine if check passes
+                if tracing.is_enabled() or profiler.active_profile() is not None:
+                    coro_obj = self._await_instrumented_callback(coro_obj, event_object)
                 sidekick_connection_module.submit_task(coro_obj)
                 logger.debug(
                     f"Component '{self.instance_id}': Submitted async callback "
                     f"for event '{event_object.type}' to TaskManager."
                 )
             else:
-                callback(event_object)
+                # Runs inline or on the callback thread pool, serialized per component. The trace
+                # context is captured here, since a worker thread doesn't inherit it.
+                trace_context = tracing.capture_context()
+                sidekick_callbacks_module._dispatcher.dispatch(
+                    self.instance_id,
+                    lambda: self._call_instrumented_callback(callback, event_object, trace_context),
+                    self._callback_mode,
+                )
                 logger.debug(
-                    f"Component '{self.instance_id}': Invoked sync callback "
+                    f"Component '{self.instance_id}': Dispatched sync callback "
                     f"for event '{event_object.type}'."
                 )
         except Exception as e: # pragma: no cover
@@ -268,6 +287,47 @@ class Component:
                 f"for event type '{event_object.type}': {e}"
             )
 
+    def _callback_span(self, event_object: BaseSidekickEvent, parent: Any = None):
+        """Opens a tracing span for a user callback, if tracing is enabled."""
+        if not tracing.is_enabled():
+            return tracing.span("sidekick.callback")
+        return tracing.span("sidekick.callback", {
+            "sidekick.component": self.component_type,
+            "sidekick.instance_id": self.instance_id,
+            "sidekick.event": str(event_object.type),
+        }, parent=parent)
+
+    def _call_instrumented_callback(
+        self,
+        callback: Callable[[BaseSidekickEvent], Any],
+        event_object: BaseSidekickEvent,
+        trace_context: Any = None,
+    ) -> None:
+        """Runs a synchronous callback inside a `sidekick.callback` span, timing it when profiling.
+
+        `trace_context` (from `tracing.capture_context()`) parents the span when
+        the callback runs on another thread than the one that dispatched it.
+        """
+        traffic = profiler.active_profile()
+        started = time.perf_counter()
+        try:
+            with self._callback_span(event_object, trace_context):
+                callback(event_object)
+        finally:
+            if traffic is not None:
+                traffic.record_callback(self.instance_id, str(event_object.type), time.perf_counter() - started)
+
+    async def _await_instrumented_callback(self, coro: Coroutine[Any, Any, Any], event_object: BaseSidekickEvent) -> None:
+        """Awaits an async callback's coroutine inside a `sidekick.callback` span, timing it when profiling."""
+        traffic = profiler.active_profile()
+        started = time.perf_counter()
+        try:
+            with self._callback_span(event_object):
+                await coro
+        finally:
+            if traffic is not None:
+                traffic.record_callback(self.instance_id, str(event_object.type), time.perf_counter() - started)
+
     def _internal_message_handler(self, message: Dict[str, Any]) -> None:
         """Handles incoming messages (events/errors) for this component instance.
 
@@ -351,6 +411,31 @@ class Component:
         )
         self._error_callback = callback
 
+    def set_callback_mode(self, mode: Optional[str]) -> None:
+        """Chooses where this component's synchronous callbacks run.
+
+        Overrides the global setting made with `sidekick.set_callback_mode()`
+        for this component only. In "thread" mode, the component's callbacks
+        run on Sidekick's worker thread pool, one at a time and in the order
+        their events arrived.
+
+        Args:
+            mode (Optional[str]): "inline", "thread", or `None` to follow the
+                global setting again.
+
+        Raises:
+            ValueError: If `mode` is not a supported callback mode.
+        """
+        if mode is not None and mode not in sidekick_callbacks_module._CALLBACK_MODES:
+            raise ValueError(
+                f"Callback mode must be one of {sidekick_callbacks_module._CALLBACK_MODES} "
+                f"or None, got {mode!r}."
+            )
+        logger.info(
+            f"Setting callback mode for component '{self.component_type}' (ID: '{self.instance_id}') to {mode!r}."
+        )
+        self._callback_mode = mode
+
     def _send_command(self, msg_type: str, payload: Optional[Dict[str, Any]] = None) -> None:
         """Internal helper to construct and schedule a command message for sending.
 
@@ -386,7 +471,16 @@ class Component:
         # Delegates to the module-level send_message in connection.py,
         # which calls ConnectionService.send_message_internally().
         # This function may raise SidekickDisconnectedError.
-        sidekick_connection_module.send_message(message)
+        if not tracing.is_enabled():
+            sidekick_connection_module.send_message(message)
+            return
+        span_attributes = {
+            "sidekick.component": self.component_type,
+            "sidekick.instance_id": self.instance_id,
+            "sidekick.message.type": msg_type,
+        }
+        with tracing.span("sidekick.send_command", span_attributes):
+            sidekick_connection_module.send_message(message)
 
     def _send_update(self, payload: Dict[str, Any]) -> None:
         """Convenience method for sending an 'update' command for this component.
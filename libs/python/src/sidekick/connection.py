@@ -44,6 +44,18 @@ def _get_service_instance() -> ConnectionService:
                 _connection_service_singleton_instance = ConnectionService()
     return _connection_service_singleton_instance
 
+def _discard_service_instance() -> None:
+    """Shuts down the ConnectionService singleton, if any, and forgets it. (Internal).
+
+    A service cannot be restarted once shut down, so the next API call creates
+    a fresh one. Used by `sidekick.testing.HeadlessUI` to isolate sessions.
+    """
+    global _connection_service_singleton_instance
+    with _connection_service_singleton_init_lock:
+        service, _connection_service_singleton_instance = _connection_service_singleton_instance, None
+    if service is not None:
+        service.shutdown_service(wait=True)
+
 
 # --- Module-level public API functions that delegate to ConnectionService ---
 
@@ -117,7 +129,22 @@ def send_message(message_dict: Dict[str, Any]) -> None:
     """
     _get_service_instance().send_message_internally(message_dict)
 
-def register_message_handler(instance_id: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+def wait_for_pending_messages(timeout: float = 10.0) -> bool:
+    """Blocks until every message sent so far has gone out on the wire.
+
+    Used when a diagnostic (`sidekick.profile()`, `sidekick.record()`) stops,
+    so it sees the messages its block queued. Does not start a service.
+
+    Args:
+        timeout (float): Maximum seconds to wait.
+
+    Returns:
+        bool: False if the wait timed out or was impossible (on the event loop).
+    """
+    service = _connection_service_singleton_instance
+    return service.wait_for_pending_messages_sync(timeout) if service is not None else True
+
+def register_message_handler(instance_id: str, handler: Callable[[Dict[str, Any]], None], weak: bool = False) -> None:
     """Registers a message handler for a specific component instance ID.
 
     Used internally by `Component` subclasses to route incoming UI events.
@@ -126,8 +153,10 @@ def register_message_handler(instance_id: str, handler: Callable[[Dict[str, Any]
         instance_id (str): The unique ID of the component instance.
         handler (Callable[[Dict[str, Any]], None]): The function to call when a
             message for this instance_id is received.
+        weak (bool): If True, `handler` must be a bound method and is held
+            weakly, so registering does not keep its component alive.
     """
-    _get_service_instance().register_component_message_handler(instance_id, handler)
+    _get_service_instance().register_component_message_handler(instance_id, handler, weak)
 
 def unregister_message_handler(instance_id: str) -> None:
     """Unregisters a message handler for a specific component instance ID.
@@ -137,7 +166,10 @@ def unregister_message_handler(instance_id: str) -> None:
     Args:
         instance_id (str): The unique ID of the component instance.
     """
-    _get_service_instance().unregister_component_message_handler(instance_id)
+    # Without a service there is nothing to unregister; don't start one (e.g., from `__del__`).
+    service = _connection_service_singleton_instance
+    if service is not None:
+        service.unregister_component_message_handler(instance_id)
 
 def clear_all() -> None:
     """Sends a command to remove all components from the Sidekick UI."""
@@ -239,6 +271,43 @@ def submit_task(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
     task_manager: TaskManager = _get_service_instance()._task_manager
     return task_manager.submit_task(coro)
 
+async def run_in_process(fn: Callable[..., Any], *args: Any) -> Any:
+    """Runs a CPU-heavy function in a separate process and awaits its result.
+
+    Python threads cannot run Python code in parallel, so a long computation
+    (e.g., a simulation step started by a button click) freezes Sidekick even
+    when run on a thread. `run_in_process` hands the work to a pool of worker
+    processes managed by Sidekick, one per CPU core, so it runs in parallel
+    while Sidekick stays responsive. The pool is started on first use and shut
+    down together with Sidekick.
+
+    Because the work runs in another process, which starts a fresh Python
+    interpreter, `fn` must be defined at the top level of a module the worker
+    can import, and its arguments and return value must be picklable. It
+    cannot update Sidekick components itself; use its return value instead.
+    The worker imports the main script, so the script's code must be inside
+    an `if __name__ == "__main__":` block. Not available in Pyodide.
+
+    Args:
+        fn (Callable[..., Any]): The function to run.
+        *args (Any): Positional arguments passed to `fn`.
+
+    Returns:
+        Any: The value returned by `fn`.
+
+    Raises:
+        CoreTaskManagerError: If worker processes are not supported (Pyodide).
+        Exception: Any exception raised by `fn` is re-raised here.
+
+    Example:
+        >>> async def handle_click(event):
+        ...     result = await sidekick.run_in_process(simulate_step, state)
+        ...     label.text = f"Energy: {result:.2f}"
+        >>> button.on_click(handle_click)
+    """
+    task_manager: TaskManager = _get_service_instance()._task_manager
+    return await task_manager.run_in_process(fn, *args)
+
 def register_global_message_handler(handler: Optional[Callable[[Dict[str, Any]], None]]) -> None:
     """Registers a global handler for *all* incoming messages from the UI.
 
@@ -10,6 +10,12 @@ the `TaskManager`'s event loop, processes these commands sequentially. This
 ensures that all state modifications and I/O operations are centralized within
 the event loop, significantly reducing threading complexity and race conditions.
 
+Incoming messages take a shorter path: the communication manager's listener
+(which already runs on the event loop) hands them to `_dispatch_inbound_message`,
+which parses them once and routes them through a prebuilt `(component, type)`
+routing table. UI events and errors are delivered to component handlers
+directly; only lifecycle-relevant system messages go through the master loop.
+
 The `ConnectionService` is responsible for:
 
 - Managing the service's lifecycle via commands (ACTIVATE, SHUTDOWN).
@@ -23,12 +29,17 @@ import json
 import threading
 import time
 import uuid
+import weakref
 from collections import deque
 from enum import Enum, auto
-from typing import Dict, Any, Callable, Optional, Deque, Union, Coroutine
+from typing import Dict, Any, Callable, List, Optional, Deque, Union, Coroutine, Tuple
 
 from . import _version
+from . import callbacks
 from . import logger
+from . import metrics
+from . import profiler
+from . import tracing
 from .core import (
     get_task_manager,
     TaskManager,
@@ -43,12 +54,14 @@ from .exceptions import (
     SidekickDisconnectedError,
     SidekickError
 )
+from .recorder import MessageRecorder, RECEIVED, SENT
 from .server_connector import ServerConnector, ConnectionResult
 
 # --- Constants ---
 _SIDEKICK_UI_WAIT_TIMEOUT_SECONDS = 180.0
 _MAX_INTERNAL_MESSAGE_QUEUE_SIZE = 1000
 _ACTIVATION_SYNC_WAIT_TIMEOUT_SECONDS = 180.0
+_FLUSH_SYNC_WAIT_TIMEOUT_SECONDS = 10.0
 
 class _ServiceStatus(Enum):
     """Internal states for the ConnectionService lifecycle, managed by the master coroutine."""
@@ -65,11 +78,9 @@ class _Command(Enum):
     SEND_MESSAGE = auto()
     SHUTDOWN = auto()
     CLEAR_ALL = auto()
-    REGISTER_HANDLER = auto()
-    UNREGISTER_HANDLER = auto()
-    REGISTER_GLOBAL_HANDLER = auto()
+    FLUSH = auto()
     # Internal commands submitted by CM callbacks to be processed by the master loop
-    _PROCESS_RAW_MESSAGE = auto()
+    _PROCESS_SYSTEM_MESSAGE = auto()
     _PROCESS_STATUS_CHANGE = auto()
     _PROCESS_ERROR = auto()
 
@@ -82,6 +93,9 @@ class ConnectionService:
     as commands to a dedicated master coroutine running in the event loop. This
     design centralizes state management and I/O, preventing race conditions.
     """
+    # Records every message sent and received while set (see `set_recorder`).
+    _recorder: Optional[MessageRecorder] = None
+
     def __init__(self):
         """Initializes the ConnectionService and starts its master processing loop."""
         self._task_manager: TaskManager = get_task_manager()
@@ -99,6 +113,12 @@ class ConnectionService:
 
         self._hero_peer_id: str = f"hero-py-{uuid.uuid4().hex}"
 
+        # Inbound routing state, read by `_dispatch_inbound_message` on the event loop.
+        # Registration replaces dict entries atomically, so it can happen from any thread.
+        self._component_handlers: Dict[str, Union[Callable[[Dict[str, Any]], None], weakref.WeakMethod]] = {}
+        self._global_handler: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._inbound_routes = self._build_inbound_routes()
+
         # Start the master coroutine that will drive all state and I/O.
         self._master_task: asyncio.Task = self._task_manager.submit_task(self._master_loop_coro())
         self._master_task.add_done_callback(self._master_loop_done_callback)
@@ -116,12 +136,116 @@ class ConnectionService:
             command (tuple): The command and its arguments to be sent to the master loop.
         """
         try:
+            # On the event loop itself (e.g., from a communication manager callback),
+            # the unbounded queue can be filled directly without creating a task.
+            if self._is_on_event_loop():
+                self._command_queue.put_nowait(command)
+                return
             # self._command_queue.put(command) is a coroutine.
             # Submitting it as a task ensures it's executed on the event loop.
             self._task_manager.submit_task(self._command_queue.put(command))
         except Exception as e: # pragma: no cover
             logger.error(f"Failed to submit command {command[0].name} to queue: {e}")
 
+    def _is_on_event_loop(self) -> bool:
+        """Checks if the caller is running on the TaskManager's event loop."""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return self._task_manager.is_loop_running() and running_loop is self._task_manager.get_loop()
+
+    def _build_inbound_routes(self) -> Dict[Tuple[Optional[str], str], Callable[[Dict[str, Any]], None]]:
+        """Builds the routing table for incoming messages.
+
+        Keys are `(component, type)` pairs; a component of None matches any
+        component with that message type. Exact matches take precedence.
+        """
+        def to_master_loop(msg: Dict[str, Any]) -> None:
+            self._submit_command((_Command._PROCESS_SYSTEM_MESSAGE, msg))
+        return {
+            ("system", "announce"): to_master_loop,  # Peer lifecycle, owned by the master loop
+            (None, "event"): self._dispatch_to_component,
+            (None, "error"): self._dispatch_to_component,
+        }
+
+    def _dispatch_inbound_message(self, msg_str: str) -> None:
+        """Parses an incoming message and routes it. Called on the event loop by the CM."""
+        recorder = self._recorder
+        if recorder is not None: recorder.record(RECEIVED, msg_str)
+        registry = metrics.registry
+        tracing_enabled = tracing.is_enabled()
+        if not registry.enabled and not tracing_enabled:
+            self._route_inbound_message(msg_str); return # Nothing to measure
+        span_attributes = {"sidekick.message.size": len(msg_str)} if tracing_enabled else None
+        with tracing.span("sidekick.inbound_dispatch", span_attributes):
+            if not registry.enabled:
+                self._route_inbound_message(msg_str); return
+            started = time.perf_counter()
+            self._route_inbound_message(msg_str)
+            registry.observe("inbound_dispatch", time.perf_counter() - started)
+        registry.increment("messages_received")
+        registry.increment("bytes_received", len(msg_str.encode("utf-8"))) # UI messages may contain non-ASCII text
+
+    def _route_inbound_message(self, msg_str: str) -> None:
+        """Parses an incoming message and calls the handlers it is routed to."""
+        try:
+            msg = json.loads(msg_str)
+        except json.JSONDecodeError:
+            logger.error(f"Failed to parse incoming JSON: {msg_str[:200]}"); return
+        try:
+            if self._global_handler: self._global_handler(msg)
+            msg_type = msg.get("type")
+            route = self._inbound_routes.get((msg.get("component"), msg_type)) or self._inbound_routes.get((None, msg_type))
+            if route: route(msg)
+        except Exception as e:
+            logger.exception(f"Exception while dispatching incoming message of type '{msg.get('type')}': {e}")
+
+    def _dispatch_to_component(self, msg: Dict[str, Any]) -> None:
+        """Delivers a UI event or error message to the handler of its source component."""
+        handler = self._component_handlers.get(msg.get("src"))
+        if isinstance(handler, weakref.WeakMethod): handler = handler()
+        if handler: handler(msg)
+
+    async def _send_to_wire(
+        self,
+        cm: CommunicationManager,
+        message_dict: Dict[str, Any],
+        enqueued_at: Optional[float] = None,
+        trace_context: Any = None,
+    ) -> None:
+        """Serializes a message and sends it through the CM, recording metrics, profile and span if enabled."""
+        registry = metrics.registry
+        traffic = profiler.active_profile()
+        span_attributes = {
+            "sidekick.component": str(message_dict.get("component")),
+            "sidekick.message.type": str(message_dict.get("type")),
+            "sidekick.instance_id": str(message_dict.get("target")),
+        } if tracing.is_enabled() else None
+        with tracing.span("sidekick.send", span_attributes, parent=trace_context):
+            if not registry.enabled and traffic is None:
+                await self._send_raw(cm, json.dumps(message_dict)); return
+            started = time.perf_counter()
+            msg_str = json.dumps(message_dict)
+            serialized = time.perf_counter()
+            await self._send_raw(cm, msg_str)
+            sent = time.perf_counter()
+        # json.dumps output is ASCII, so characters are bytes.
+        if traffic is not None: traffic.record_message(message_dict, len(msg_str), serialized - started)
+        if not registry.enabled: return
+        registry.observe("serialize", serialized - started)
+        registry.observe("send", sent - serialized)
+        if enqueued_at is not None: registry.observe("enqueue_to_wire", sent - enqueued_at)
+        registry.increment("messages_sent")
+        registry.increment("bytes_sent", len(msg_str))
+        registry.count_component_message(message_dict.get("component", "unknown"))
+
+    async def _send_raw(self, cm: CommunicationManager, msg_str: str) -> None:
+        """Sends an encoded message through the CM, recording it if a recorder is attached."""
+        recorder = self._recorder
+        if recorder is not None: recorder.record(SENT, msg_str)
+        await cm.send_message_async(msg_str)
+
     def _master_loop_done_callback(self, task: asyncio.Task) -> None:
         """Callback for when the master coroutine finishes unexpectedly."""
         if not task.cancelled() and task.exception(): # pragma: no cover
@@ -138,11 +262,15 @@ class ConnectionService:
         status = _ServiceStatus.IDLE
         cm: Optional[CommunicationManager] = None
         server_connector = ServerConnector(self._task_manager)
-        message_queue_internal: Deque[Dict[str, Any]] = deque(maxlen=_MAX_INTERNAL_MESSAGE_QUEUE_SIZE)
-        component_handlers: Dict[str, Callable] = {}
-        global_handler: Optional[Callable] = None
+        # Messages sent before activation completes, as (message_dict, enqueued_at, trace_context).
+        message_queue_internal: Deque[Tuple[Dict[str, Any], Optional[float], Any]] = deque(maxlen=_MAX_INTERNAL_MESSAGE_QUEUE_SIZE)
         sidekick_peers: Dict[str, Dict] = {}
         activation_task: Optional[asyncio.Task] = None
+        # FLUSH callbacks waiting for the messages queued during activation.
+        pending_flushes: List[Callable[[], None]] = []
+
+        def complete_pending_flushes():
+            while pending_flushes: pending_flushes.pop(0)()
 
         def update_status(new_status: _ServiceStatus):
             """Atomically updates the internal and externally visible status."""
@@ -164,6 +292,7 @@ class ConnectionService:
             # Always set the event to unblock any synchronous waiters.
             self._sync_activation_complete_event.set()
             activation_task = None
+            complete_pending_flushes() # Queued messages are sent or dropped by now
 
         async def perform_activation_sequence() -> None:
             """The coroutine that performs the actual connection and handshake logic."""
@@ -171,7 +300,7 @@ class ConnectionService:
             try:
                 # 1. Connect using ServerConnector. It will try servers sequentially.
                 conn_result: ConnectionResult = await server_connector.connect_async(
-                    message_handler=lambda msg: self._submit_command((_Command._PROCESS_RAW_MESSAGE, msg)),
+                    message_handler=self._dispatch_inbound_message,
                     status_change_handler=lambda s: self._submit_command((_Command._PROCESS_STATUS_CHANGE, s)),
                     error_handler=lambda e: self._submit_command((_Command._PROCESS_ERROR, e))
                 )
@@ -182,7 +311,7 @@ class ConnectionService:
 
                 # 2. Perform Sidekick protocol handshake.
                 hero_announce = { "id": 0, "component": "system", "type": "announce", "payload": { "peerId": self._hero_peer_id, "role": "hero", "status": "online", "version": _version.__version__, "timestamp": int(time.time() * 1000) }}
-                await cm.send_message_async(json.dumps(hero_announce))
+                await self._send_raw(cm, json.dumps(hero_announce))
 
                 sidekick_online_event = self._task_manager.create_event()
                 sidekick_peers['_online_event_'] = sidekick_online_event
@@ -193,11 +322,10 @@ class ConnectionService:
                 if conn_result.show_ui_url_hint: print("Sidekick UI is connected.")
 
                 # 3. Clear UI and process any messages that were queued during activation.
-                await cm.send_message_async(json.dumps({"id": 0, "component": "global", "type": "clearAll"}))
+                await self._send_raw(cm, json.dumps({"id": 0, "component": "global", "type": "clearAll"}))
                 logger.info(f"Processing {len(message_queue_internal)} queued messages.")
                 while message_queue_internal:
-                    msg = message_queue_internal.popleft()
-                    await cm.send_message_async(json.dumps(msg))
+                    await self._send_to_wire(cm, *message_queue_internal.popleft())
 
                 # 4. Activation is complete.
                 update_status(_ServiceStatus.ACTIVE)
@@ -214,6 +342,7 @@ class ConnectionService:
         # --- Main command processing loop ---
         while status != _ServiceStatus.SHUTDOWN_COMPLETE:
             cmd, *args = await self._command_queue.get()
+            if metrics.registry.enabled: metrics.registry.set_gauge("queue_depth", self._command_queue.qsize())
             try:
                 if cmd == _Command.ACTIVATE:
                     if status in [_ServiceStatus.IDLE, _ServiceStatus.FAILED, _ServiceStatus.SHUTDOWN_COMPLETE]:
@@ -225,27 +354,20 @@ class ConnectionService:
                     else: logger.debug(f"Activate command ignored, status is {status.name}")
 
                 elif cmd == _Command.SEND_MESSAGE:
-                    message_dict, = args
-                    if status == _ServiceStatus.ACTIVE and cm: await cm.send_message_async(json.dumps(message_dict))
-                    elif status in [_ServiceStatus.ACTIVATING, _ServiceStatus.IDLE]: message_queue_internal.append(message_dict)
+                    message_dict, enqueued_at, trace_context = args
+                    if status == _ServiceStatus.ACTIVE and cm: await self._send_to_wire(cm, message_dict, enqueued_at, trace_context)
+                    elif status in [_ServiceStatus.ACTIVATING, _ServiceStatus.IDLE]: message_queue_internal.append((message_dict, enqueued_at, trace_context))
                     else: logger.warning(f"Message dropped, service status is {status.name}: {message_dict.get('type')}")
 
-                elif cmd == _Command._PROCESS_RAW_MESSAGE:
-                    msg_str, = args
-                    try:
-                        msg = json.loads(msg_str)
-                        if global_handler: global_handler(msg)
-                        if msg.get("component") == "system" and msg.get("type") == "announce":
-                            payload = msg.get("payload", {})
-                            peer_id, role, p_status = payload.get("peerId"), payload.get("role"), payload.get("status")
-                            if role == "sidekick" and p_status == "online":
-                                sidekick_peers[peer_id] = payload
-                                if (online_event := sidekick_peers.get('_online_event_')): online_event.set()
-                            elif role == "sidekick" and p_status == "offline":
-                                if sidekick_peers.pop(peer_id, None): logger.info(f"Sidekick UI peer {peer_id} went offline.")
-                        elif msg.get("type") in ["event", "error"]:
-                            if (instance_id := msg.get("src")) in component_handlers: component_handlers[instance_id](msg)
-                    except json.JSONDecodeError: logger.error(f"Failed to parse incoming JSON: {msg_str[:200]}")
+                elif cmd == _Command._PROCESS_SYSTEM_MESSAGE:
+                    msg, = args
+                    payload = msg.get("payload", {})
+                    peer_id, role, p_status = payload.get("peerId"), payload.get("role"), payload.get("status")
+                    if role == "sidekick" and p_status == "online":
+                        sidekick_peers[peer_id] = payload
+                        if (online_event := sidekick_peers.get('_online_event_')): online_event.set()
+                    elif role == "sidekick" and p_status == "offline":
+                        if sidekick_peers.pop(peer_id, None): logger.info(f"Sidekick UI peer {peer_id} went offline.")
 
                 elif cmd == _Command._PROCESS_STATUS_CHANGE:
                     core_status, = args
@@ -272,13 +394,15 @@ class ConnectionService:
                                 if not self._activation_exception: self._activation_exception = SidekickConnectionError(f"Core communication error: {exc}", original_exception=exc)
                                 self._sync_activation_complete_event.set()
 
-                elif cmd == _Command.REGISTER_HANDLER: component_handlers[args[0]] = args[1]
-                elif cmd == _Command.UNREGISTER_HANDLER: component_handlers.pop(args[0], None)
-                elif cmd == _Command.REGISTER_GLOBAL_HANDLER: global_handler = args[0]
                 elif cmd == _Command.CLEAR_ALL:
-                    if status == _ServiceStatus.ACTIVE and cm: await cm.send_message_async(json.dumps({"id": 0, "component": "global", "type": "clearAll"}))
+                    if status == _ServiceStatus.ACTIVE and cm: await self._send_raw(cm, json.dumps({"id": 0, "component": "global", "type": "clearAll"}))
                     else: logger.warning(f"clearAll command ignored, status is {status.name}")
 
+                elif cmd == _Command.FLUSH:
+                    on_flushed, = args
+                    if status == _ServiceStatus.ACTIVATING: pending_flushes.append(on_flushed)
+                    else: on_flushed()
+
                 elif cmd == _Command.SHUTDOWN:
                     if status == _ServiceStatus.SHUTDOWN_COMPLETE: continue
                     logger.info("Master coroutine received SHUTDOWN command.")
@@ -294,10 +418,11 @@ class ConnectionService:
         if cm and cm.is_connected():
             try:
                 offline = {"id": 0, "component": "system", "type": "announce", "payload": { "peerId": self._hero_peer_id, "role": "hero", "status": "offline", "version": _version.__version__, "timestamp": int(time.time() * 1000) }}
-                await cm.send_message_async(json.dumps(offline))
+                await self._send_raw(cm, json.dumps(offline))
             except Exception: pass
             await cm.close_async()
-        component_handlers.clear(); message_queue_internal.clear(); sidekick_peers.clear(); global_handler = None
+        self._component_handlers.clear(); message_queue_internal.clear(); sidekick_peers.clear(); self._global_handler = None
+        complete_pending_flushes()
         self._task_manager.stop_loop()
         update_status(_ServiceStatus.SHUTDOWN_COMPLETE)
         with self._status_lock:
@@ -332,22 +457,58 @@ class ConnectionService:
     def send_message_internally(self, message_dict: Dict[str, Any]) -> None:
         """Schedules a message to be sent to the UI, queueing if not yet active."""
         self.activate_connection_internally()
-        self._submit_command((_Command.SEND_MESSAGE, message_dict))
+        enqueued_at = time.perf_counter() if metrics.registry.enabled else None
+        self._submit_command((_Command.SEND_MESSAGE, message_dict, enqueued_at, tracing.capture_context()))
+
+    def wait_for_pending_messages_sync(self, timeout: float = _FLUSH_SYNC_WAIT_TIMEOUT_SECONDS) -> bool:
+        """Blocks until every message submitted so far has been sent (or dropped).
 
-    def register_component_message_handler(self, instance_id: str, handler: Callable) -> None:
-        """Schedules the registration of a component message handler."""
+        Returns False if `timeout` expires first, or if waiting is impossible
+        because the caller is on the event loop (or in Pyodide).
+        """
+        if is_pyodide() or self._is_on_event_loop(): return False
+        with self._status_lock:
+            if self._service_status in (_ServiceStatus.SHUTTING_DOWN, _ServiceStatus.SHUTDOWN_COMPLETE): return True
+        flushed = threading.Event()
+        self._submit_command((_Command.FLUSH, flushed.set))
+        if flushed.wait(timeout): return True
+        logger.warning(f"Timed out after {timeout}s waiting for queued messages to be sent.")
+        return False
+
+    def register_component_message_handler(self, instance_id: str, handler: Callable, weak: bool = False) -> None:
+        """Registers a component message handler in the inbound routing table.
+
+        With `weak=True`, `handler` must be a bound method, and the table does not
+        keep its object alive; the entry is dropped when the object is collected.
+        """
         if not isinstance(instance_id, str) or not instance_id: raise ValueError("instance_id must be a non-empty string.")
         if not callable(handler): raise TypeError("handler must be a callable function.")
-        self._submit_command((_Command.REGISTER_HANDLER, instance_id, handler))
+        if not weak:
+            self._component_handlers[instance_id] = handler; return
+        handlers = self._component_handlers
+        def drop_dead_entry(ref: weakref.WeakMethod) -> None:
+            if handlers.get(instance_id) is ref: handlers.pop(instance_id, None)
+        handlers[instance_id] = weakref.WeakMethod(handler, drop_dead_entry)
 
     def unregister_component_message_handler(self, instance_id: str) -> None:
-        """Schedules the un-registration of a component message handler."""
-        self._submit_command((_Command.UNREGISTER_HANDLER, instance_id))
+        """Removes a component message handler from the inbound routing table."""
+        self._component_handlers.pop(instance_id, None)
+
+    def set_recorder(self, recorder: Optional[MessageRecorder]) -> None:
+        """Attaches a recorder for all messages sent and received, or detaches it with None.
+
+        Raises:
+            RuntimeError: If a different recorder is already attached.
+        """
+        if recorder is not None and self._recorder is not None and self._recorder is not recorder:
+            raise RuntimeError("A recorder is already attached to the Sidekick connection.")
+        self._recorder = recorder
+        logger.info(f"Message recording {'started: ' + recorder.path if recorder else 'stopped'}.")
 
     def register_user_global_message_handler(self, handler: Optional[Callable]) -> None:
-        """Schedules the registration of a global message handler."""
+        """Registers (or clears, with None) the global message handler."""
         if handler and not callable(handler): raise TypeError("Global handler must be callable.")
-        self._submit_command((_Command.REGISTER_GLOBAL_HANDLER, handler))
+        self._global_handler = handler
 
     def clear_all_ui_components(self) -> None:
         """Schedules a command to clear all UI components."""
@@ -355,6 +516,7 @@ class ConnectionService:
 
     def shutdown_service(self, wait: bool = False) -> None:
         """Schedules the shutdown of the service and optionally waits for it."""
+        callbacks._dispatcher.shutdown(wait=False) # Callback threads must not outlive the service
         self._submit_command((_Command.SHUTDOWN,))
         if wait and not is_pyodide():
             logger.info("shutdown_service: Waiting for TaskManager to stop.")
@@ -15,7 +15,8 @@ Key components provided by this core package include:
     obtain appropriate instances of these managers.
 -   Core status enumerations (`CoreConnectionStatus`) and custom exceptions
     (e.g., `CoreConnectionError`) related to these fundamental operations.
--   Utility functions like `is_pyodide()` for environment detection.
+-   The `runtime` profile (environment and capabilities, detected once) and
+    utility functions like `is_pyodide()`.
 
 Modules within `sidekick` (like `sidekick.connection`) will build upon
 these core components to implement higher-level application logic.
@@ -37,7 +38,8 @@ from .exceptions import (
     CoreTaskSubmissionError,
 )
 
-# --- Utility Functions ---
+# --- Runtime Environment and Utility Functions ---
+from .environment import RuntimeProfile, runtime
 from .utils import is_pyodide
 
 # --- Abstract Base Classes for Managers ---
@@ -68,7 +70,9 @@ __all__ = [
     'CoreLoopNotRunningError',
     'CoreTaskSubmissionError',
 
-    # Utilities
+    # Runtime Environment and Utilities
+    'RuntimeProfile',
+    'runtime',
     'is_pyodide',
 
     # ABCs
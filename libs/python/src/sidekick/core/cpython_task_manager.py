@@ -13,10 +13,12 @@ concurrently by the event loop in its dedicated thread.
 """
 
 import asyncio
+import sys
 import threading
 import concurrent.futures
 import logging
-from typing import Any, Coroutine, Optional, Set
+import multiprocessing
+from typing import Any, Callable, Coroutine, Optional, Set
 
 from .task_manager import TaskManager
 from .exceptions import CoreLoopNotRunningError, CoreTaskSubmissionError, CoreTaskManagerError
@@ -28,6 +30,11 @@ _LOOP_STARTUP_TIMEOUT_SECONDS = 10.0
 _TASK_REF_TIMEOUT_SECONDS = 5.0
 _EVENT_CREATION_TIMEOUT_SECONDS = 5.0
 
+def _process_pool_context() -> multiprocessing.context.BaseContext:
+    """Returns the start method for `run_in_process` workers: forkserver or spawn, never fork."""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
 class CPythonTaskManager(TaskManager):
     """Manages an asyncio event loop in a separate thread for CPython environments.
 
@@ -63,6 +70,9 @@ class CPythonTaskManager(TaskManager):
         # A set to keep track of tasks submitted by this manager for graceful cleanup.
         self._active_tasks: Set[asyncio.Task] = set()
 
+        # Worker processes for `run_in_process`, created on first use.
+        self._process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
     def _run_loop_thread_target(self) -> None:
         """The target function executed by the dedicated event loop thread.
 
@@ -155,6 +165,8 @@ class CPythonTaskManager(TaskManager):
         else:
             logger.debug("No active tasks tracked by this TaskManager to cancel.")
 
+        self._shutdown_process_pool()
+
         current_loop = asyncio.get_running_loop()
         if hasattr(current_loop, 'shutdown_asyncgens'):
             try:
@@ -163,6 +175,37 @@ class CPythonTaskManager(TaskManager):
             except Exception as e_gens_other: # pragma: no cover
                 logger.exception(f"Unexpected error during shutdown_asyncgens: {e_gens_other}")
 
+    def _shutdown_process_pool(self) -> None:
+        """Stops the worker processes of `run_in_process`, dropping work that hasn't started."""
+        with self._lock:
+            pool, self._process_pool = self._process_pool, None
+        if pool is None:
+            return
+        logger.debug("Shutting down the process pool used by run_in_process.")
+        try:
+            # Don't block the loop on running jobs: workers exit after their current job.
+            if sys.version_info >= (3, 9):
+                pool.shutdown(wait=False, cancel_futures=True)
+            else: # pragma: no cover
+                pool.shutdown(wait=False)
+        except Exception as e_pool: # pragma: no cover
+            logger.error(f"Error shutting down the process pool: {e_pool}")
+
+    async def run_in_process(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Runs `fn(*args)` on the managed process pool and awaits its result.
+
+        Workers are started fresh rather than forked: this process already runs
+        several threads, and a forked child could deadlock on a lock one of them
+        held. So `fn`, its arguments and its result must be picklable, and `fn`
+        must be importable by the worker (defined at the top level of a module).
+        """
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = concurrent.futures.ProcessPoolExecutor(mp_context=_process_pool_context())
+                logger.info("Started process pool for run_in_process.")
+            pool = self._process_pool
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
     def ensure_loop_running(self) -> None:
         """Ensures the asyncio event loop is created and running in its dedicated thread."""
         with self._lock:
@@ -0,0 +1,100 @@
+"""Detects the runtime environment once and records what it can do.
+
+Several parts of Sidekick need to know whether they run in Pyodide or CPython,
+and whether optional capabilities (threads, worker processes, NumPy, a fast
+JSON library) are available. Rather than probing on every call (a failed
+`import` walks every finder on `sys.path`), the environment is inspected once,
+when this module is first imported, and the result is stored in the immutable
+`runtime` profile.
+
+Example:
+    >>> from sidekick.core import runtime
+    >>> if runtime.threads_available:
+    ...     print("Callbacks may run on worker threads.")
+"""
+
+import importlib.util
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+# Fast JSON libraries, in order of preference.
+_FAST_JSON_MODULES = ("orjson", "ujson")
+
+
+@dataclass(frozen=True)
+class RuntimeProfile:
+    """Immutable description of the environment Sidekick is running in.
+
+    Attributes:
+        is_pyodide (bool): True when running in Pyodide (Python in the browser).
+        threads_available (bool): True if new threads can be started.
+        processes_available (bool): True if worker processes can be spawned.
+        numpy_available (bool): True if NumPy is installed. It is not imported.
+        fast_json (Optional[str]): Name of an installed fast JSON module
+            ("orjson" or "ujson"), or None if only the standard `json` is available.
+        python_version (tuple): `sys.version_info[:3]`.
+    """
+    is_pyodide: bool
+    threads_available: bool
+    processes_available: bool
+    numpy_available: bool
+    fast_json: Optional[str]
+    python_version: tuple
+
+
+def _detect_pyodide() -> bool:
+    """Checks for Pyodide's platform name, module, or JavaScript globals. (Internal)."""
+    # Pyodide sets sys.platform to "emscripten".
+    if sys.platform == "emscripten":
+        return True
+
+    # The 'pyodide' module is a strong indicator.
+    try:
+        import pyodide # type: ignore[import-not-found,import-untyped]
+        return True
+    except ImportError:
+        pass
+
+    # Sometimes only the `js` module is available; check for Pyodide's global.
+    try:
+        import js # type: ignore[import-not-found]
+        if hasattr(js.globalThis, 'pyodide'):
+            return True # pragma: no cover (less common path, harder to test reliably in all CIs)
+    except ImportError:
+        pass
+    except Exception: # pragma: no cover
+        pass # Catch any other errors from js access
+
+    return False
+
+
+def _module_available(name: str) -> bool:
+    """Checks whether a top-level module is installed without importing it. (Internal)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError): # pragma: no cover
+        return False
+
+
+def detect_runtime() -> RuntimeProfile:
+    """Inspects the current environment and returns a new `RuntimeProfile`.
+
+    Most code should use the shared `runtime` profile instead, which is
+    detected once at import time.
+    """
+    in_pyodide = _detect_pyodide()
+    # WebAssembly builds of Python (Pyodide, WASI) can't start OS threads or processes.
+    is_wasm = in_pyodide or sys.platform in ("emscripten", "wasi")
+    return RuntimeProfile(
+        is_pyodide=in_pyodide,
+        threads_available=not is_wasm,
+        processes_available=not is_wasm,
+        numpy_available=_module_available("numpy"),
+        fast_json=next((name for name in _FAST_JSON_MODULES if _module_available(name)), None),
+        python_version=tuple(sys.version_info[:3]),
+    )
+
+
+# The profile of the running interpreter, shared by all of Sidekick.
+runtime = detect_runtime()
@@ -8,15 +8,21 @@ are created on demand.
 
 import logging
 import threading # For _task_manager_lock
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Callable, Optional, Dict, Any
 
 from .task_manager import TaskManager
+from .communication_manager import CommunicationManager
 from .cpython_task_manager import CPythonTaskManager
 from .pyodide_task_manager import PyodideTaskManager
-from .websocket_communication_manager import WebSocketCommunicationManager
-from .pyodide_communication_manager import PyodideCommunicationManager
 from .utils import is_pyodide # Import is_pyodide for get_task_manager
 
+# The communication managers are imported inside their factory functions:
+# the WebSocket one pulls in the `websockets` package, which scripts that
+# never connect (and Pyodide, which has its own transport) shouldn't pay for.
+if TYPE_CHECKING: # pragma: no cover
+    from .websocket_communication_manager import WebSocketCommunicationManager
+    from .pyodide_communication_manager import PyodideCommunicationManager
+
 logger = logging.getLogger(__name__)
 
 # --- TaskManager Factory (Singleton) ---
@@ -61,7 +67,7 @@ def get_task_manager() -> TaskManager:
 def create_websocket_communication_manager(
     url: str,
     task_manager: TaskManager
-) -> WebSocketCommunicationManager:
+) -> 'WebSocketCommunicationManager':
     """Creates and returns a new instance of WebSocketCommunicationManager.
 
     This manager is responsible for handling WebSocket communication, typically
@@ -75,13 +81,14 @@ def create_websocket_communication_manager(
     Returns:
         WebSocketCommunicationManager: A new instance configured for the given URL.
     """
+    from .websocket_communication_manager import WebSocketCommunicationManager
 
     logger.info(f"Creating new WebSocketCommunicationManager instance for URL: {url}")
     return WebSocketCommunicationManager(url=url, task_manager=task_manager)
 
 def create_pyodide_communication_manager(
     task_manager: TaskManager
-) -> PyodideCommunicationManager:
+) -> 'PyodideCommunicationManager':
     """Creates and returns a new instance of PyodideCommunicationManager.
 
     This manager handles communication within a Pyodide environment, typically
@@ -95,5 +102,34 @@ def create_pyodide_communication_manager(
     Returns:
         PyodideCommunicationManager: A new instance.
     """
+    from .pyodide_communication_manager import PyodideCommunicationManager
+
     logger.info("Creating new PyodideCommunicationManager instance.")
     return PyodideCommunicationManager(task_manager=task_manager)
+
+
+# --- CommunicationManager Override (In-Process Transports) ---
+_communication_manager_override: Optional[Callable[[TaskManager], CommunicationManager]] = None
+
+def set_communication_manager_override(
+    factory: Optional[Callable[[TaskManager], CommunicationManager]]
+) -> None:
+    """Installs a factory whose CommunicationManager is used instead of any server.
+
+    While an override is set, `ServerConnector` skips Pyodide detection, the
+    user-set URL and the default server list, and connects through the manager
+    returned by `factory(task_manager)`. This lets an in-process peer, such as
+    `sidekick.testing.HeadlessUI`, stand in for the Sidekick UI without a
+    browser or network.
+
+    Args:
+        factory (Optional[Callable[[TaskManager], CommunicationManager]]): The
+            factory to use for the next connections, or None to remove it.
+    """
+    global _communication_manager_override
+    _communication_manager_override = factory
+    logger.info(f"CommunicationManager override {'installed' if factory else 'removed'}.")
+
+def get_communication_manager_override() -> Optional[Callable[[TaskManager], CommunicationManager]]:
+    """Returns the factory set by `set_communication_manager_override`, or None."""
+    return _communication_manager_override
@@ -12,11 +12,14 @@ The TaskManager is responsible for:
 - Submitting asynchronous tasks (coroutines) to be executed on the loop.
 - Providing mechanisms to request the loop to stop and to wait for its completion.
 - Creating event loop-specific synchronization primitives like asyncio.Event.
+- Optionally, running CPU-bound functions in worker processes.
 """
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Coroutine
+from typing import Any, Callable, Coroutine
+
+from .exceptions import CoreTaskManagerError
 
 
 class TaskManager(ABC):
@@ -122,3 +125,23 @@ class TaskManager(ABC):
             where the loop's lifecycle is not managed by the TaskManager (e.g., Pyodide).
         """
         pass
+
+    async def run_in_process(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Runs `fn(*args)` in a worker process and awaits its result.
+
+        Must be awaited on the managed event loop. Implementations that can
+        spawn processes (CPythonTaskManager) override this with a managed
+        process pool; the default raises, since environments like Pyodide
+        cannot create processes.
+
+        Args:
+            fn (Callable[..., Any]): A picklable (module-level) function.
+            *args (Any): Picklable arguments for `fn`.
+
+        Returns:
+            Any: The value returned by `fn`.
+
+        Raises:
+            CoreTaskManagerError: If worker processes are not supported.
+        """
+        raise CoreTaskManagerError(f"{type(self).__name__} does not support running functions in worker processes.")
@@ -16,6 +16,7 @@ Using structured event objects provides several benefits:
 """
 
 from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 # field can be used for more advanced dataclass features if needed in the future,
 # like default_factory or custom metadata, but not strictly necessary for this initial proposal.
 
@@ -83,6 +84,38 @@ class CanvasClickEvent(BaseSidekickEvent):
     y: int
 
 
+@dataclass
+class CanvasPointerEvent(BaseSidekickEvent):
+    """
+    Event dispatched for pointer movement over a `sidekick.Canvas`, see
+    `Canvas.on_pointer_move()` and `Canvas.on_drag()`.
+
+    The UI sends these events at a limited rate, so a single event carries all
+    pointer positions sampled since the previous one, ready to be drawn with
+    `Canvas.draw_polyline()`.
+
+    Attributes:
+        instance_id (str): The ID of the `Canvas` instance.
+        type (str): "pointer_move" or "drag".
+        points (List[Tuple[int, int]]): The sampled (x, y) positions relative to
+            the canvas's top-left origin, oldest first. Never empty.
+        phase (Optional[str]): For "drag" events, "start" (button pressed),
+            "move", or "end" (button released). None for "pointer_move" events.
+    """
+    points: List[Tuple[int, int]]
+    phase: Optional[str] = None
+
+    @property
+    def x(self) -> int:
+        """int: The x-coordinate of the most recent position."""
+        return self.points[-1][0]
+
+    @property
+    def y(self) -> int:
+        """int: The y-coordinate of the most recent position."""
+        return self.points[-1][1]
+
+
 @dataclass
 class TextboxSubmitEvent(BaseSidekickEvent):
     """
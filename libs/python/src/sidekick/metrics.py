@@ -0,0 +1,216 @@
+"""Lightweight metrics for Sidekick's connection pipeline.
+
+Sidekick can count the messages and bytes it sends and receives, track how
+deep its internal command queue gets, and measure how long the steps of the
+send path take. Collection is off by default and costs a single attribute
+check per message while disabled. Turn it on with `sidekick.enable_stats()`
+and read the numbers with `sidekick.stats()`:
+
+    >>> sidekick.enable_stats(log_interval=10)  # Also log a summary every 10 s
+    >>> ...                                     # Run the app
+    >>> print(sidekick.stats()["histograms"]["enqueue_to_wire"])
+
+Recorded metrics:
+
+*   Counters: `messages_sent`, `bytes_sent`, `messages_received`,
+    `bytes_received`, and per component type in `component_messages`.
+*   Gauges: `queue_depth` (commands waiting for the master loop; current and max).
+*   Histograms (seconds): `serialize` (JSON encoding of an outgoing message),
+    `send` (handing it to the transport), `enqueue_to_wire` (from the
+    component call to the transport), and `inbound_dispatch` (parsing and
+    routing an incoming message, including synchronous handlers).
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+
+from . import logger
+
+# Histogram buckets: values below _SUB_BUCKETS microseconds are exact; above
+# that, every power of two is split into _SUB_BUCKETS linear buckets, which
+# bounds the relative error to 1 / _SUB_BUCKETS (about 6%).
+_SUB_BUCKETS = 16
+_SUB_BUCKET_BITS = _SUB_BUCKETS.bit_length() # Bits of a value kept in its bucket index
+_PERCENTILES = (50, 90, 99)
+
+
+def _bucket_index(micros: int) -> int:
+    """Maps a value in microseconds to its log-linear bucket. (Internal)."""
+    if micros < _SUB_BUCKETS:
+        return micros
+    shift = micros.bit_length() - _SUB_BUCKET_BITS
+    return shift * _SUB_BUCKETS + (micros >> shift)
+
+
+def _bucket_value(index: int) -> float:
+    """Returns the midpoint, in microseconds, of a bucket. (Internal)."""
+    if index < 2 * _SUB_BUCKETS:
+        return float(index)
+    shift = index // _SUB_BUCKETS - 1
+    lower = (index % _SUB_BUCKETS + _SUB_BUCKETS) << shift
+    return lower + (1 << shift) / 2
+
+
+class _Histogram:
+    """HDR-style histogram of durations with bounded relative error. (Internal)."""
+
+    __slots__ = ('buckets', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        index = _bucket_index(int(seconds * 1_000_000))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min: self.min = seconds
+        if seconds > self.max: self.max = seconds
+
+    def percentile(self, percent: float) -> float:
+        """Returns the approximate `percent`-th percentile in seconds."""
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # The bucket midpoint can lie outside the observed range.
+                return min(max(_bucket_value(index) / 1_000_000, self.min), self.max)
+        return self.max # pragma: no cover
+
+    def summary(self) -> Dict[str, float]:
+        summary = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+        for percent in _PERCENTILES:
+            summary[f"p{percent}"] = self.percentile(percent)
+        return summary
+
+
+class MetricsRegistry:
+    """Holds Sidekick's counters, gauges and histograms.
+
+    Call sites check `enabled` before recording, so a disabled registry costs
+    one attribute lookup. All methods are thread-safe.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears all recorded values."""
+        with self._lock:
+            self._counters: Dict[str, int] = {}
+            self._component_messages: Dict[str, int] = {}
+            self._gauges: Dict[str, Dict[str, float]] = {}
+            self._histograms: Dict[str, _Histogram] = {}
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def count_component_message(self, component_type: str) -> None:
+        with self._lock:
+            self._component_messages[component_type] = self._component_messages.get(component_type, 0) + 1
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            gauge = self._gauges.get(name)
+            if gauge is None:
+                self._gauges[name] = {"current": value, "max": value}
+            else:
+                gauge["current"] = value
+                if value > gauge["max"]: gauge["max"] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Records a duration in the histogram `name`."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = _Histogram()
+            histogram.record(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns a copy of all metrics as plain dictionaries."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "counters": dict(self._counters),
+                "component_messages": dict(self._component_messages),
+                "gauges": {name: dict(gauge) for name, gauge in self._gauges.items()},
+                "histograms": {name: histogram.summary() for name, histogram in self._histograms.items()},
+            }
+
+
+registry = MetricsRegistry()
+_log_task: Optional[asyncio.Task] = None
+
+
+def _log_stats() -> None:
+    """Logs a one-line summary of the current metrics. (Internal)."""
+    snapshot = registry.snapshot()
+    counters = snapshot["counters"]
+    queue_depth = snapshot["gauges"].get("queue_depth", {})
+    latency = snapshot["histograms"].get("enqueue_to_wire", {})
+    logger.info(
+        f"Sidekick stats: sent {counters.get('messages_sent', 0)} msgs / {counters.get('bytes_sent', 0)} B, "
+        f"received {counters.get('messages_received', 0)} msgs / {counters.get('bytes_received', 0)} B, "
+        f"queue depth max {queue_depth.get('max', 0):.0f}, "
+        f"enqueue-to-wire p50 {latency.get('p50', 0) * 1000:.2f} ms / p99 {latency.get('p99', 0) * 1000:.2f} ms."
+    )
+
+
+def enable_stats(enabled: bool = True, log_interval: Optional[float] = None) -> None:
+    """Turns collection of Sidekick's connection metrics on or off.
+
+    Args:
+        enabled (bool): True to start recording, False to stop. Values
+            recorded so far are kept until `sidekick.stats(reset=True)`.
+        log_interval (Optional[float]): If given (and `enabled`), a summary is
+            logged at INFO level on the "sidekick" logger every
+            `log_interval` seconds. Any previous periodic logger is stopped.
+
+    Raises:
+        ValueError: If `log_interval` is not a positive number.
+    """
+    global _log_task
+    if log_interval is not None and (not isinstance(log_interval, (int, float)) or log_interval <= 0):
+        raise ValueError("log_interval must be a positive number of seconds.")
+    registry.enabled = enabled
+    if _log_task is not None:
+        task, _log_task = _log_task, None
+        task.get_loop().call_soon_threadsafe(task.cancel)
+    if enabled and log_interval is not None:
+        from .connection import submit_interval # Deferred: connection imports this module
+        _log_task = submit_interval(_log_stats, log_interval)
+    logger.info(f"Sidekick stats collection {'enabled' if enabled else 'disabled'}.")
+
+
+def stats(reset: bool = False) -> Dict[str, Any]:
+    """Returns the metrics recorded since stats were enabled (or last reset).
+
+    Args:
+        reset (bool): If True, all values are cleared after reading them.
+
+    Returns:
+        Dict[str, Any]: A dictionary with the keys 'enabled', 'counters',
+            'component_messages' (messages sent per component type), 'gauges'
+            (each with 'current' and 'max') and 'histograms' (each with
+            'count', 'mean', 'min', 'max', 'p50', 'p90' and 'p99', in seconds).
+    """
+    snapshot = registry.snapshot()
+    if reset:
+        registry.reset()
+    return snapshot
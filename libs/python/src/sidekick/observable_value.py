@@ -26,21 +26,54 @@ How it works:
 This makes it much easier to track how your data structures evolve during your
 script's execution without needing to manually call `viz.show()` after every single change.
 
+For bulk modifications, wrap them in `with my_list.batch():` so that Viz receives
+a single update when the block ends instead of one per element.
+
 Note on Limitations:
 
 *   Automatic updates only occur when you modify the data *through* the
     `ObservableValue` wrapper's methods (like `.append()`, `[key]=value`, `.add()`).
     Changes made directly to the underlying object obtained via `.get()` might not
     be detected automatically.
-*   For nested structures (e.g., a list inside a dictionary), you would need to
-    wrap the inner mutable structures with `ObservableValue` as well if you want
-    their internal changes to trigger automatic updates.
+*   For nested structures (e.g., a list inside a dictionary), changes made to
+    the inner structures are only detected with `ObservableValue(data, deep=True)`
+    (see below), or if you wrap them with `ObservableValue` as well.
 *   Changes made by directly setting attributes on a wrapped *custom object* are
-    generally not detected automatically.
+    only detected in deep mode.
+
+Deep Observation:
+
+With `ObservableValue(data, deep=True)`, nested lists, dicts, sets and custom
+objects reached through the wrapper (`obs[0]`, `obs["key"]`, `obs.attribute`)
+are returned wrapped in observable proxies. Modifying them, e.g.
+`obs[0].append(x)` or `obs.player.score = 10`, notifies subscribers with the full
+path of the change, so Viz updates just that part of the display. Proxies are
+created on access and are meant to be used right away: after items are inserted
+or removed above them, a proxy kept in a variable may point to the wrong path.
+
+History:
+
+With `ObservableValue(data, history=1000)`, every change is also recorded, so
+earlier states can be looked at again: `obs.versions()` lists the versions that
+can be reconstructed, `obs.value_at(version)` returns a copy of the value as it
+was, and `obs.restore(version)` makes that state current again. Only the
+changes themselves (plus an occasional full copy) are stored, not a copy of the
+value for every step.
 """
 
+import asyncio
+import collections
 import collections.abc # Used for checking mutable collection types like list, dict, set
-from typing import Any, List, Set, Dict, Callable, Optional, Union, Tuple, Iterable, Mapping
+import contextlib
+import copy
+import functools
+import logging
+import threading
+import time
+import types
+import weakref
+from dataclasses import dataclass
+from typing import Any, Deque, List, Set, Dict, Callable, Optional, Union, Tuple, Iterable, Mapping
 from . import logger
 
 # Type Alias for clarity: Represents a function that subscribers provide to receive notifications.
@@ -49,6 +82,58 @@ SubscriptionCallback = Callable[[Dict[str, Any]], None]
 # Type Alias for clarity: Represents the function returned by 'subscribe', which can be called to stop the subscription.
 UnsubscribeFunction = Callable[[], None]
 
+
+@dataclass(frozen=True)
+class DeliveryPolicy:
+    """Controls when a subscriber of an `ObservableValue` is told about changes.
+
+    Create policies with the class methods rather than the constructor:
+
+    *   `DeliveryPolicy.immediate()`: every change is delivered synchronously,
+        right after the modification (the default).
+    *   `DeliveryPolicy.debounced(seconds)`: changes are held back until no new
+        change has happened for `seconds`.
+    *   `DeliveryPolicy.rate_limited(max_per_second)`: changes are delivered at
+        most `max_per_second` times per second.
+
+    With the last two, pending changes are merged and delivered later on
+    Sidekick's event loop as a single "batch" change (the same format produced
+    by `ObservableValue.batch()`), so a value modified thousands of times per
+    second in a loop only produces a few updates.
+
+    Example:
+        >>> viz.show("Particles", particles, delivery=sidekick.DeliveryPolicy.rate_limited(30))
+    """
+    mode: str = "immediate"
+    interval: float = 0.0  # Seconds; quiet period (debounce) or minimum time between deliveries (rate)
+
+    @classmethod
+    def immediate(cls) -> 'DeliveryPolicy':
+        """Delivers every change synchronously, as soon as it happens."""
+        return cls()
+
+    @classmethod
+    def debounced(cls, seconds: float) -> 'DeliveryPolicy':
+        """Delivers pending changes once no new change happened for `seconds`.
+
+        Raises:
+            ValueError: If `seconds` is not a positive number.
+        """
+        if not isinstance(seconds, (int, float)) or seconds <= 0:
+            raise ValueError(f"Debounce delay must be a positive number of seconds, got {seconds!r}.")
+        return cls("debounce", float(seconds))
+
+    @classmethod
+    def rate_limited(cls, max_per_second: float) -> 'DeliveryPolicy':
+        """Delivers pending changes at most `max_per_second` times per second.
+
+        Raises:
+            ValueError: If `max_per_second` is not a positive number.
+        """
+        if not isinstance(max_per_second, (int, float)) or max_per_second <= 0:
+            raise ValueError(f"Maximum deliveries per second must be a positive number, got {max_per_second!r}.")
+        return cls("rate", 1.0 / max_per_second)
+
 class ObservableValue:
     """Wraps a Python value (list, dict, set) to notify subscribers about changes.
 
@@ -92,28 +177,58 @@ class ObservableValue:
     # --- Internal Attributes ---
     # Define names of attributes used internally by ObservableValue itself.
     # This helps __getattr__ and __setattr__ distinguish between accessing/setting
-    # internal state vs. delegating to the wrapped value.
-    _obs_internal_attrs = ('_value', '_subscribers', '_obs_value_id')
+    # internal state vs. delegating to the wrapped value. Using them as __slots__
+    # keeps instances small and attribute access fast.
+    __slots__ = ('_value', '_kind', '_subscribers', '_obs_value_id', '_batch_depth', '_batch_changes', '_deep',
+                 '_history', '__weakref__')
+    _obs_internal_attrs = __slots__
 
-    def __init__(self, value: Any):
+    def __init__(self, value: Any, deep: bool = False, history: Optional[int] = None):
         """Initializes the ObservableValue by wrapping the provided Python value.
 
         Args:
             value: The Python value (e.g., a list, dict, set, number, string, etc.)
                 that you want to make observable.
+            deep (bool): If True, nested containers and objects accessed through
+                this wrapper are observed too (see "Deep Observation" in the
+                module docstring). Defaults to False.
+            history (Optional[int]): If given, record changes so that at least
+                this many past versions can be reconstructed with `value_at()`
+                and `restore()` (see "History" in the module docstring).
+                Defaults to None (no history).
+
+        Raises:
+            ValueError: If `history` is not a positive integer.
         """
         # The actual Python object being wrapped and observed.
         self._value: Any = value
+        # Kind of container wrapped (one of the _KIND_* constants), cached so the
+        # intercepted methods don't repeat the ABC isinstance checks.
+        self._kind: str = _container_kind(value)
         # A set holding the callback functions of active subscribers (like Viz).
         self._subscribers: Set[SubscriptionCallback] = set()
         # A relatively stable internal ID string based on the memory address of this
         # ObservableValue wrapper instance. Used by Viz to track this specific
         # observable across updates, helping maintain UI state (like expanded nodes).
         self._obs_value_id: str = f"obs_{id(self)}"
+        # Nesting level of active `batch()` blocks, and the changes collected by them.
+        self._batch_depth: int = 0
+        self._batch_changes: List[Dict[str, Any]] = []
+        # Whether nested children are returned as path-aware observable proxies.
+        self._deep: bool = deep
+        # Recorded changes for time travel. The recorder is an ordinary subscriber,
+        # so it sees exactly the changes (and batches) other subscribers see.
+        self._history: Optional[_History] = None
+        if history is not None:
+            if isinstance(history, bool) or not isinstance(history, int) or history <= 0:
+                raise ValueError(f"ObservableValue history must be a positive number of versions, got {history!r}.")
+            self._history = _History(self.get, history)
+            self._subscribers.add(self._history.record)
 
     # --- Subscription Management (Primarily for internal use by Viz) ---
 
-    def subscribe(self, callback: SubscriptionCallback) -> UnsubscribeFunction:
+    def subscribe(self, callback: SubscriptionCallback,
+                  policy: Optional[DeliveryPolicy] = None, weak: bool = False) -> UnsubscribeFunction:
         """Registers a function to be called whenever the wrapped value changes. (Internal).
 
         This method is primarily intended for internal use by the `sidekick.Viz`
@@ -129,6 +244,17 @@ class ObservableValue:
             callback: A function that accepts one argument: a dictionary
                 describing the change event (common keys include 'type', 'path',
                 'value', 'key', 'old_value', 'length').
+            policy: When to deliver changes to this callback (see
+                `DeliveryPolicy`). Defaults to immediate delivery. With a
+                debounced or rate-limited policy, the callback is invoked later
+                from Sidekick's event loop with a merged "batch" change.
+            weak (bool): If True, only a weak reference to the object the
+                callback is bound to is kept, so subscribing does not keep that
+                object alive. The callback must then be a bound method or a
+                `functools.partial` of one. Once the object is garbage
+                collected, the subscription is removed automatically. Viz
+                subscribes this way, so a discarded Viz panel is not kept alive
+                by the values it displayed.
 
         Returns:
             UnsubscribeFunction: A function that, when called with no arguments,
@@ -137,19 +263,36 @@ class ObservableValue:
                 removed from the display or the Viz panel itself is removed.
 
         Raises:
-            TypeError: If the provided `callback` is not a callable function.
+            TypeError: If the provided `callback` is not a callable function, or
+                if `weak` is True and it is not bound to an object.
         """
         if not callable(callback):
             raise TypeError("Callback provided to ObservableValue.subscribe must be callable")
+        if policy is not None and not isinstance(policy, DeliveryPolicy):
+            raise TypeError("Policy provided to ObservableValue.subscribe must be a DeliveryPolicy")
         # Add the provided callback function to the set of active subscribers.
-        self._subscribers.add(callback)
-        logger.debug(f"Subscribed callback {callback} to ObservableValue (id: {self._obs_value_id})")
+        # Weak subscriptions and deferred policies wrap it; the outermost wrapper
+        # is what is stored in the subscriber set.
+        subscriber = weak_subscriber = _WeakSubscriber(callback) if weak else None
+        if subscriber is None:
+            subscriber = callback
+        if policy is not None and policy.mode != "immediate":
+            subscriber = _CoalescedDelivery(subscriber, policy, self._current_length)
+        if weak_subscriber is not None:
+            # Remove the whole subscription once the callback's object is collected.
+            weak_subscriber.on_collected = functools.partial(self._subscribers.discard, subscriber)
+        self._subscribers.add(subscriber)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Subscribed callback {callback} to ObservableValue (id: {self._obs_value_id})")
 
         # Create and return a dedicated function to unsubscribe this specific callback.
         # This avoids potential issues with removing the wrong callback if multiple
-        # subscribers exist.
+        # subscribers exist. It refers to the stored subscriber rather than to
+        # `callback`, so it doesn't undo a weak subscription by holding a strong reference.
         def unsubscribe():
-            self.unsubscribe(callback)
+            if isinstance(subscriber, _CoalescedDelivery):
+                subscriber.cancel() # Drop changes that have not been delivered yet
+            self._subscribers.discard(subscriber)
         return unsubscribe
 
     def unsubscribe(self, callback: SubscriptionCallback):
@@ -165,7 +308,13 @@ class ObservableValue:
         # Use set.discard() which safely removes the callback if it's present,
         # but does nothing (without error) if it was already removed.
         self._subscribers.discard(callback)
-        logger.debug(f"Unsubscribed callback {callback} from ObservableValue (id: {self._obs_value_id})")
+        for subscriber in list(self._subscribers):
+            if isinstance(subscriber, (_CoalescedDelivery, _WeakSubscriber)) and subscriber.is_for(callback):
+                if isinstance(subscriber, _CoalescedDelivery):
+                    subscriber.cancel() # Drop changes that have not been delivered yet
+                self._subscribers.discard(subscriber)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Unsubscribed callback {callback} from ObservableValue (id: {self._obs_value_id})")
 
     def _notify(self, change_details: Dict[str, Any]):
         """Internal method to inform all registered subscribers about a change. (Internal).
@@ -175,28 +324,33 @@ class ObservableValue:
         has been successfully made to the wrapped `_value`.
 
         It iterates through all currently registered subscriber callbacks and calls
-        each one, passing the `change_details` dictionary.
+        each one, passing the `change_details` dictionary. The intercepted methods
+        only build the dictionary (with `_change()`) when there are subscribers.
 
         Args:
             change_details (Dict[str, Any]): A dictionary containing information
-                about the change that occurred. Standard keys include 'type' (e.g.,
-                "setitem", "append"), 'path' (list indices/dict keys), 'value' (new
-                value involved), 'key' (for dict changes), 'old_value' (value replaced
-                or removed), and 'length' (new container length).
+                about the change that occurred, as built by `_change()`. It always
+                has the keys 'type' (e.g., "setitem", "append"), 'path' (list
+                indices/dict keys), 'value' (new value involved), 'key' (for dict
+                changes), 'old_value' (value replaced or removed), and 'length'
+                (new container length).
         """
         # Optimization: If no subscribers are registered, do nothing.
         if not self._subscribers:
             return
 
-        # Ensure common keys exist in the details dictionary for a consistent structure,
-        # even if their value is None for a particular change type. Helps subscribers.
-        change_details.setdefault('path', []) # Path from root to change location
-        change_details.setdefault('value', None) # New value involved (if any)
-        change_details.setdefault('key', None)   # Key involved (for dicts, if any)
-        change_details.setdefault('old_value', None) # Old value replaced/removed (if any)
-        change_details.setdefault('length', None)    # New length of container (if applicable)
+        # Inside a `batch()` block, collect the change instead of delivering it.
+        if self._batch_depth:
+            _merge_change(self._batch_changes, change_details)
+            return
+
+        self._deliver(change_details)
 
-        logger.debug(f"Notifying {len(self._subscribers)} subscribers for ObservableValue (id: {self._obs_value_id}): {change_details}")
+    def _deliver(self, change_details: Dict[str, Any]):
+        """Calls every subscriber with the given change details. (Internal)."""
+        if logger.isEnabledFor(logging.DEBUG):
+            # Formatting the change details can be expensive for large values, so only do it when needed.
+            logger.debug(f"Notifying {len(self._subscribers)} subscribers for ObservableValue (id: {self._obs_value_id}): {change_details}")
 
         # Iterate over a *copy* of the subscribers set. This prevents modification
         # issues if a subscriber callback itself tries to subscribe or unsubscribe
@@ -212,6 +366,137 @@ class ObservableValue:
                 # for potential future subscribers.
                 logger.exception(f"Error occurred inside ObservableValue subscriber callback {callback}: {e}")
 
+    @contextlib.contextmanager
+    def batch(self):
+        """Groups several modifications into a single notification.
+
+        Inside a `with observable.batch():` block, modifications made through the
+        wrapper are applied immediately as usual, but subscribers are only
+        notified once, when the block exits. They then receive a single "batch"
+        change whose 'changes' list holds the individual changes in order.
+        Repeated assignments to the same key or index in a row are merged.
+
+        For `sidekick.Viz`, this turns a bulk modification into a single update
+        message instead of one message per element. Batches can be nested; only
+        the outermost block sends the notification.
+
+        Example:
+            >>> scores = sidekick.ObservableValue({})
+            >>> viz.show("Scores", scores)
+            >>> with scores.batch():
+            ...     for i in range(1000):
+            ...         scores[f"player{i}"] = 0
+            >>> # Viz received one update instead of 1000.
+
+        Yields:
+            ObservableValue: This ObservableValue instance.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_changes:
+                changes, self._batch_changes = self._batch_changes, []
+                if self._subscribers:
+                    self._deliver(_batch_change(changes, self._current_length()))
+
+    def _current_length(self) -> Optional[int]:
+        """Returns the length of the wrapped value, or None if it has none. (Internal)."""
+        try:
+            return len(self._value) if hasattr(self._value, '__len__') else None
+        except TypeError:
+            return None
+
+    # --- Deep Observation ---
+
+    def _deep_context(self) -> Tuple['ObservableValue', List[Any]]:
+        """Returns the ObservableValue that notifies subscribers, and the path to this value. (Internal)."""
+        return self, []
+
+    def _wrap_child(self, key: Any, child: Any, is_attribute: bool = False) -> Any:
+        """Wraps a child of the wrapped value in a path-aware proxy, in deep mode. (Internal).
+
+        Args:
+            key: The index, key or attribute name of the child.
+            child: The child value itself.
+            is_attribute (bool): True if `child` is an attribute rather than an item.
+
+        Returns:
+            Any: A `_NestedObservable` for mutable children in deep mode, `child` otherwise.
+        """
+        if not self._deep or isinstance(key, slice) or not _is_deep_observable(child):
+            return child
+        if isinstance(key, int) and key < 0 and isinstance(self._value, collections.abc.Sequence):
+            key += len(self._value) # Paths always use absolute indices
+        root, path = self._deep_context()
+        return _NestedObservable(child, root, path + [key], self._value, key, is_attribute)
+
+    # --- History (Time Travel) ---
+
+    def versions(self) -> range:
+        """Returns the range of versions that can be reconstructed.
+
+        Version 0 is the value when the ObservableValue was created, and every
+        notification (a single change or a whole `batch()`) adds one version.
+        The last element of the range is the current version. Older versions
+        are forgotten once more than `history` newer ones exist.
+
+        Returns:
+            range: The available versions, oldest first.
+
+        Raises:
+            RuntimeError: If the ObservableValue was created without `history`.
+        """
+        return self._require_history().versions()
+
+    def value_at(self, version: int) -> Any:
+        """Reconstructs the wrapped value as it was at a past version.
+
+        The result is an independent copy: modifying it changes neither the
+        current value nor the recorded history.
+
+        Args:
+            version (int): A version from `versions()`.
+
+        Returns:
+            Any: A copy of the value at that version.
+
+        Raises:
+            RuntimeError: If the ObservableValue was created without `history`.
+            IndexError: If `version` is not available (anymore).
+
+        Example:
+            >>> steps = sidekick.ObservableValue([3, 1, 2], history=100)
+            >>> steps.append(4)
+            >>> steps[0] = 0
+            >>> steps.value_at(1)
+            [3, 1, 2, 4]
+        """
+        return self._require_history().value_at(version)
+
+    def restore(self, version: int):
+        """Makes the value of a past version current again.
+
+        This replaces the wrapped value using `set()`, so subscribers like Viz
+        are notified and the restore itself becomes a new version in the
+        history (later versions stay available).
+
+        Args:
+            version (int): A version from `versions()`.
+
+        Raises:
+            RuntimeError: If the ObservableValue was created without `history`.
+            IndexError: If `version` is not available (anymore).
+        """
+        self.set(self.value_at(version))
+
+    def _require_history(self) -> '_History':
+        """Returns the history recorder, raising if history is disabled. (Internal)."""
+        if self._history is None:
+            raise RuntimeError("This ObservableValue does not record history; create it with ObservableValue(value, history=N).")
+        return self._history
+
     # --- Accessing and Replacing the Wrapped Value ---
 
     def get(self) -> Any:
@@ -281,14 +566,11 @@ class ObservableValue:
         if self._value is not new_value:
             old_value = self._value # Keep a reference to the old value for the notification.
             self._value = new_value # Update the internal reference to the new value.
-            # Send a notification indicating a 'set' operation at the root path.
-            self._notify({
-                "type": "set",        # Type of change: wholesale replacement
-                "path": [],           # Path is empty, indicating the root value changed
-                "value": self._value, # The new value now being wrapped
-                "old_value": old_value # The value that was just replaced
-                # Length is typically handled by the Viz component during 'set' based on new value.
-            })
+            self._kind = _container_kind(new_value)
+            # Send a notification indicating a 'set' operation at the root path
+            # (empty path). Length is handled by Viz based on the new value.
+            if self._subscribers:
+                self._notify(_change("set", [], value=new_value, old_value=old_value))
 
     # --- Intercepted Methods for Mutable Containers ---
     # These methods override standard Python operations for lists, dicts, and sets.
@@ -315,8 +597,8 @@ class ObservableValue:
             >>> viz.show("Items", items)
             >>> items.append('c') # Viz automatically updates to show ['a', 'b', 'c']
         """
-        # Check if the wrapped object supports append (duck typing).
-        if not isinstance(self._value, collections.abc.MutableSequence):
+        # Check if the wrapped object supports append.
+        if self._kind is not _KIND_SEQUENCE:
             # Provide a more specific error message.
             raise TypeError("ObservableValue: append() requires the wrapped value to be a mutable sequence (e.g., list).")
 
@@ -324,17 +606,15 @@ class ObservableValue:
         current_len = len(self._value)
         # Perform the actual append operation on the wrapped list.
         try:
+            item = _unwrap_nested(item) # Store the plain value, not a deep-observation proxy
             self._value.append(item) # type: ignore # Assume append exists if MutableSequence passed
         except AttributeError:
              raise AttributeError(f"ObservableValue: Wrapped object of type {type(self._value).__name__} has no 'append' method.")
 
-        # Notify subscribers about the successful append operation.
-        self._notify({
-            "type": "append",
-            "path": [current_len],      # Path identifies the index of the newly added item
-            "value": item,              # The item that was actually added
-            "length": len(self._value)  # The new total length of the list
-        })
+        # Notify subscribers about the successful append operation. The path
+        # identifies the index of the newly added item.
+        if self._subscribers:
+            self._notify(_change("append", [current_len], value=item, length=current_len + 1))
 
     def insert(self, index: int, item: Any):
         """Inserts an item at a specific index in the wrapped list/sequence and notifies subscribers.
@@ -350,21 +630,18 @@ class ObservableValue:
             TypeError: If the wrapped value is not a list or similar.
             IndexError: If the index is out of range for insertion (behavior matches list.insert).
         """
-        if not isinstance(self._value, collections.abc.MutableSequence):
+        if self._kind is not _KIND_SEQUENCE:
             raise TypeError("ObservableValue: insert() requires the wrapped value to be a mutable sequence.")
         # Perform the actual insert operation on the wrapped list.
         try:
+            item = _unwrap_nested(item) # Store the plain value, not a deep-observation proxy
             self._value.insert(index, item) # type: ignore # Assume insert exists
         except AttributeError:
              raise AttributeError(f"ObservableValue: Wrapped object of type {type(self._value).__name__} has no 'insert' method.")
 
-        # Notify subscribers about the successful insertion.
-        self._notify({
-            "type": "insert",
-            "path": [index],            # Path identifies the index where insertion occurred
-            "value": item,              # The item that was inserted
-            "length": len(self._value)  # The new total length of the list
-        })
+        # Notify subscribers about the successful insertion at `index`.
+        if self._subscribers:
+            self._notify(_change("insert", [index], value=item, length=len(self._value)))
 
     def pop(self, index: int = -1) -> Any:
         """Removes and returns the item at the given index (default last) and notifies subscribers.
@@ -382,7 +659,7 @@ class ObservableValue:
             TypeError: If the wrapped value is not a list or similar.
             IndexError: If the list is empty or the index is out of range.
         """
-        if not isinstance(self._value, collections.abc.MutableSequence):
+        if self._kind is not _KIND_SEQUENCE:
             raise TypeError("ObservableValue: pop() requires the wrapped value to be a mutable sequence.")
 
         # Determine the actual index being popped *before* mutation for accurate reporting.
@@ -407,14 +684,10 @@ class ObservableValue:
             raise e
 
 
-        # Notify subscribers about the successful pop operation.
-        self._notify({
-            "type": "pop",
-            "path": [actual_index],     # Path identifies the index from which the item was removed
-            "value": None,              # No *new* value is associated with a pop
-            "old_value": popped_value,  # The value that was actually removed
-            "length": len(self._value)  # The new total length of the list
-        })
+        # Notify subscribers about the successful pop operation. The path
+        # identifies the index from which the item was removed.
+        if self._subscribers:
+            self._notify(_change("pop", [actual_index], old_value=popped_value, length=len(self._value)))
         # Return the removed value, just like standard list.pop().
         return popped_value
 
@@ -436,7 +709,7 @@ class ObservableValue:
                         `list.index` call used for notification *could* raise it if the
                         value disappears between the check and the call (highly unlikely).
          """
-         if not isinstance(self._value, collections.abc.MutableSequence):
+         if self._kind is not _KIND_SEQUENCE:
              raise TypeError("ObservableValue: remove() requires the wrapped value to be a mutable sequence.")
 
          try:
@@ -449,13 +722,9 @@ class ObservableValue:
              self._value.remove(value) # type: ignore # Assume remove exists
 
              # If remove succeeded (i.e., index() didn't raise ValueError), notify.
-             self._notify({
-                "type": "remove", # Specific type for removing by value rather than index
-                "path": [index_to_remove], # Path is the index where the value was found
-                "value": None,             # No *new* value associated with removal
-                "old_value": value,        # The value that was actually removed
-                "length": len(self._value) # The new total length of the list
-             })
+             # "remove" is specific to removing by value; the path is the index where it was found.
+             if self._subscribers:
+                 self._notify(_change("remove", [index_to_remove], old_value=value, length=len(self._value)))
          except ValueError:
             # Standard list.remove() behavior: if the value isn't found, do nothing.
             # So, we catch the ValueError from index() and do not notify.
@@ -479,23 +748,13 @@ class ObservableValue:
             # Raise error if no clear method exists or it's not callable.
             raise AttributeError(f"ObservableValue: Wrapped object of type {type(self._value).__name__} has no callable 'clear' method.")
 
-        # Store old length *before* clearing for potential use in notification (though not strictly required by Viz currently).
-        try:
-            old_len = len(self._value) if hasattr(self._value, '__len__') else None
-        except TypeError:
-            old_len = None # Handle cases like custom objects without len()
-
         # Call the wrapped object's actual clear method.
         clear_method()
 
-        # Notify subscribers that the container was cleared.
-        self._notify({
-            "type": "clear",
-            "path": [],              # Path is empty, indicates the root container was cleared
-            "value": self._value,    # Include the (now empty) container state in the notification
-            "length": 0,             # New length is always 0 after clear
-            # Optionally include old_length if needed by UI: "old_length": old_len
-        })
+        # Notify subscribers that the root container was cleared, including
+        # the (now empty) container state. New length is always 0 after clear.
+        if self._subscribers:
+            self._notify(_change("clear", [], value=self._value, length=0))
 
     # --- Dictionary/Mapping Methods ---
 
@@ -523,31 +782,36 @@ class ObservableValue:
         """
         # Check if the wrapped object supports item assignment (MutableSequence or MutableMapping).
         # Using abstract base classes makes this check more robust for custom collections.
-        if not isinstance(self._value, (collections.abc.MutableSequence, collections.abc.MutableMapping)):
+        kind = self._kind
+        if kind is not _KIND_SEQUENCE and kind is not _KIND_MAPPING:
             raise TypeError(f"ObservableValue: Wrapped object of type {type(self._value).__name__} does not support item assignment using []=.")
 
         old_value = None
-        is_mapping = isinstance(self._value, collections.abc.MutableMapping)
-        is_sequence = isinstance(self._value, collections.abc.MutableSequence)
+        is_mapping = kind is _KIND_MAPPING
+        is_sequence = kind is _KIND_SEQUENCE
+        has_subscribers = bool(self._subscribers)
 
         # Attempt to retrieve the *old* value associated with the key/index *before*
-        # overwriting it. This is useful for notifications (e.g., Viz highlighting).
+        # overwriting it. This is useful for notifications (e.g., Viz highlighting),
+        # so it is skipped when nobody is listening.
         # We wrap this in a try/except because the key/index might not exist yet.
-        try:
-            if is_mapping:
-                # For dicts, use get() which returns None if key doesn't exist.
-                old_value = self._value.get(key)
-            elif is_sequence and isinstance(key, int):
-                # For lists, check index validity before accessing to avoid IndexError here.
-                if 0 <= key < len(self._value):
-                     old_value = self._value[key] # Access only if index is valid
-        except Exception:
-            # Ignore potential errors retrieving the old value (e.g., key not found, index error).
-            # old_value will remain None, which is acceptable.
-            pass
+        if has_subscribers:
+            try:
+                if is_mapping:
+                    # For dicts, use get() which returns None if key doesn't exist.
+                    old_value = self._value.get(key)
+                elif is_sequence and isinstance(key, int):
+                    # For lists, check index validity before accessing to avoid IndexError here.
+                    if 0 <= key < len(self._value):
+                         old_value = self._value[key] # Access only if index is valid
+            except Exception:
+                # Ignore potential errors retrieving the old value (e.g., key not found, index error).
+                # old_value will remain None, which is acceptable.
+                pass
 
         # Perform the actual assignment operation on the wrapped object.
         # This is the core action that modifies the user's data.
+        value = _unwrap_nested(value) # Store the plain value, not a deep-observation proxy
         try:
             self._value[key] = value # type: ignore # Assume __setitem__ exists if type checks passed
         except IndexError as e:
@@ -561,16 +825,10 @@ class ObservableValue:
             logger.error(f"ObservableValue: Unexpected error during __setitem__ for key '{key}': {e}")
             return # Avoid notifying if the assignment failed
 
-        # If assignment succeeded, notify subscribers about the change.
-        self._notify({
-            "type": "setitem",
-            "path": [key],              # Path is the key or index that was assigned to
-            "value": value,             # The new value that was assigned
-            # Include 'key' only for dictionary/mapping types for clarity in Viz.
-            "key": key if is_mapping else None,
-            "old_value": old_value      # The value that was replaced (or None if it was a new key/index)
-            # Length is usually not changed by setitem unless list grows (not standard)
-        })
+        # If assignment succeeded, notify subscribers about the change. 'key' is
+        # only included for dictionary/mapping types for clarity in Viz.
+        if has_subscribers:
+            self._notify(_change("setitem", [key], value=value, key=key if is_mapping else None, old_value=old_value))
 
     def __delitem__(self, key: Any):
         """Deletes an item/key from the wrapped container (dict/list) and notifies subscribers.
@@ -590,10 +848,10 @@ class ObservableValue:
             KeyError: If the wrapped value is a dictionary and the key is not found.
             IndexError: If the wrapped value is a list and the index is out of range.
         """
-        if not isinstance(self._value, (collections.abc.MutableSequence, collections.abc.MutableMapping)):
+        if self._kind is not _KIND_SEQUENCE and self._kind is not _KIND_MAPPING:
             raise TypeError(f"ObservableValue: Wrapped object of type {type(self._value).__name__} does not support item deletion using del [].")
 
-        is_mapping = isinstance(self._value, collections.abc.MutableMapping)
+        is_mapping = self._kind is _KIND_MAPPING
         old_len = None
         old_value = None
 
@@ -622,25 +880,19 @@ class ObservableValue:
              raise e_del
 
 
-        # If deletion succeeded, notify subscribers.
-        new_len = len(self._value) if hasattr(self._value, '__len__') else None
-        self._notify({
-            "type": "delitem",          # Use "delitem" or potentially "pop" if consistent
-            "path": [key],              # Path is the key or index that was deleted
-            "value": None,              # No *new* value associated with deletion
-            "key": key if is_mapping else None, # Include key only for mappings
-            "old_value": old_value,     # The value that was actually deleted
-            "length": new_len           # The new length after deletion
-        })
+        # If deletion succeeded, notify subscribers (key included only for mappings).
+        if self._subscribers:
+            new_len = len(self._value) if hasattr(self._value, '__len__') else None
+            self._notify(_change("delitem", [key], key=key if is_mapping else None, old_value=old_value, length=new_len))
 
     def update(self, other: Union[Dict[Any, Any], Mapping[Any, Any], Iterable[Tuple[Any, Any]]] = {}, **kwargs: Any):
-        """Updates the wrapped dictionary with key-value pairs from another mapping and/or keyword arguments, notifying subscribers for each change.
+        """Updates the wrapped dictionary with key-value pairs from another mapping and/or keyword arguments, notifying subscribers once.
 
         Mimics the behavior of `dict.update()`. It iterates through the items to be
-        added or updated and uses the intercepted `__setitem__` method for each one.
-        This ensures that subscribers (like Viz) receive individual "setitem"
-        notifications for every key that is added or whose value is changed, allowing
-        for more granular UI updates compared to a single bulk update notification.
+        added or updated and uses the intercepted `__setitem__` method for each one,
+        inside a `batch()` block. Subscribers (like Viz) therefore receive a single
+        "batch" notification listing a "setitem" change for every key that is added
+        or whose value is changed, which still allows granular UI updates.
 
         Requires the wrapped value (`self.get()`) to be a mutable mapping (like a
         standard Python `dict`).
@@ -662,18 +914,18 @@ class ObservableValue:
             >>> viz.show("Settings", settings)
             >>>
             >>> # Update using another dictionary
-            >>> settings.update({'size': 12, 'theme': 'dark'}) # Sends 2 notifications
+            >>> settings.update({'size': 12, 'theme': 'dark'}) # Sends 1 notification with 2 changes
             >>> # Update using keyword arguments
-            >>> settings.update(line_numbers=True, theme='light') # Sends 2 notifications (theme overwritten)
+            >>> settings.update(line_numbers=True, theme='light') # Sends 1 notification with 2 changes (theme overwritten)
         """
-        if not isinstance(self._value, collections.abc.MutableMapping):
+        if self._kind is not _KIND_MAPPING:
             raise TypeError("ObservableValue: update() requires the wrapped value to be a mutable mapping (e.g., dict).")
 
         # Combine the dictionary/mapping `other` and the keyword arguments `kwargs`.
         # We process `other` first, then `kwargs` to match dict.update behavior
         # where kwargs can override keys present in `other`.
         # We perform the updates item by item using self[key] = value to trigger
-        # individual notifications via our intercepted __setitem__.
+        # individual change records via our intercepted __setitem__.
         # We don't call self._value.update() directly, as that would bypass notifications.
 
         items_to_process: List[Tuple[Any, Any]] = []
@@ -700,13 +952,15 @@ class ObservableValue:
 
         # Now, iterate through the combined items and use our intercepted __setitem__
         # for each one. This ensures individual notifications are sent.
-        for key, value in items_to_process:
-            try:
-                self[key] = value # Calls our intercepted __setitem__(key, value)
-            except Exception as e_set:
-                 # Log errors during the individual setitem calls but continue update if possible.
-                 logger.error(f"ObservableValue.update(): Error setting key '{key}' during update: {e_set}")
-                 # Optionally re-raise if strictness is needed: raise e_set
+        # The individual notifications are delivered together as a single batch.
+        with self.batch():
+            for key, value in items_to_process:
+                try:
+                    self[key] = value # Calls our intercepted __setitem__(key, value)
+                except Exception as e_set:
+                     # Log errors during the individual setitem calls but continue update if possible.
+                     logger.error(f"ObservableValue.update(): Error setting key '{key}' during update: {e_set}")
+                     # Optionally re-raise if strictness is needed: raise e_set
 
 
     # --- Set Methods ---
@@ -726,7 +980,7 @@ class ObservableValue:
             TypeError: If the wrapped value is not a set or similar mutable set.
         """
         # Check if the wrapped value behaves like a set.
-        if not isinstance(self._value, collections.abc.MutableSet):
+        if self._kind is not _KIND_SET:
             raise TypeError("ObservableValue: add() requires the wrapped value to be a mutable set.")
 
         # Check if the element is already present *before* attempting to add.
@@ -745,13 +999,10 @@ class ObservableValue:
             # Perform the actual add operation on the wrapped set.
             try:
                 self._value.add(element) # type: ignore # Assume add exists
-                # If add succeeded, notify subscribers.
-                self._notify({
-                    "type": "add_set",       # Specific type for set addition
-                    "path": [],              # Set operations don't have a simple path index
-                    "value": element,        # The element that was actually added
-                    "length": len(self._value) # The new size of the set
-                })
+                # If add succeeded, notify subscribers. Set operations don't
+                # have a simple path index.
+                if self._subscribers:
+                    self._notify(_change("add_set", [], value=element, length=len(self._value)))
             except AttributeError:
                  raise AttributeError(f"ObservableValue: Wrapped object of type {type(self._value).__name__} has no 'add' method.")
             except TypeError as e_add:
@@ -774,7 +1025,7 @@ class ObservableValue:
              AttributeError: If the wrapped value does not have a `discard` method.
              TypeError: If the wrapped value is not a set or similar.
          """
-         if not isinstance(self._value, collections.abc.MutableSet):
+         if self._kind is not _KIND_SET:
              raise TypeError("ObservableValue: discard() requires the wrapped value to be a mutable set.")
 
          # Check if the element is actually in the set *before* attempting to discard.
@@ -795,13 +1046,8 @@ class ObservableValue:
              try:
                  self._value.discard(element) # type: ignore # Assume discard exists
                  # If discard potentially removed the element (it was present), notify.
-                 self._notify({
-                     "type": "discard_set", # Specific type for set removal
-                     "path": [],            # No simple path index for set elements
-                     "value": None,         # No *new* value associated with removal
-                     "old_value": element,  # The element that was targeted for removal
-                     "length": len(self._value) # The new size of the set
-                 })
+                 if self._subscribers:
+                     self._notify(_change("discard_set", [], old_value=element, length=len(self._value)))
              except AttributeError:
                   raise AttributeError(f"ObservableValue: Wrapped object of type {type(self._value).__name__} has no 'discard' method.")
              except TypeError as e_disc:
@@ -839,17 +1085,21 @@ class ObservableValue:
                             have an attribute with the given `name`.
         """
         # Prevent accidental delegation of the wrapper's internal attributes.
-        if name in ObservableValue._obs_internal_attrs:
+        if name in type(self)._obs_internal_attrs:
              # Raise standard AttributeError if trying to access internal attributes this way.
              raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}' (use .get() maybe? Internal attributes are protected)")
 
         # If the attribute name is not internal, try to get it from the wrapped value.
         # This will raise AttributeError naturally if the wrapped value doesn't have it.
         try:
-            return getattr(self._value, name)
+            attribute = getattr(self._value, name)
         except AttributeError:
             # Re-raise AttributeError with a more informative message.
              raise AttributeError(f"'{type(self._value).__name__}' object (wrapped by ObservableValue) has no attribute '{name}'")
+        # In deep mode, mutable attributes of a wrapped custom object are observed too.
+        if self._deep and not isinstance(self._value, _DEEP_CONTAINER_TYPES):
+            return self._wrap_child(name, attribute, is_attribute=True)
+        return attribute
 
 
     def __setattr__(self, name: str, value: Any):
@@ -864,7 +1114,8 @@ class ObservableValue:
             attribute with the given `name` and `value` directly on the *wrapped object*
             (`self._value`).
 
-        **Important:** Delegating attribute setting to the wrapped object via this method
+        **Important:** Unless the ObservableValue was created with `deep=True`,
+        delegating attribute setting to the wrapped object via this method
         does **not** automatically trigger notifications to subscribers like Viz.
         If you need the Viz panel to update when you change an attribute of a wrapped
         *custom object*, you have several options:
@@ -886,19 +1137,23 @@ class ObservableValue:
                             `__dict__` allowing the assignment).
         """
         # Check if the attribute name is one of the predefined internal ones.
-        if name in ObservableValue._obs_internal_attrs:
+        if name in type(self)._obs_internal_attrs:
             # If internal, set the attribute directly on the ObservableValue instance itself
             # using object.__setattr__ to bypass our own __setattr__ override.
             object.__setattr__(self, name, value)
         else:
             # If not internal, delegate the attribute setting to the wrapped object.
-            # Note: This delegation does NOT automatically trigger self._notify().
+            # Note: Outside deep mode, this delegation does NOT trigger self._notify().
+            value = _unwrap_nested(value)
             try:
                 setattr(self._value, name, value)
             except AttributeError as e:
                  # Provide a clearer error if setting the attribute on the wrapped object fails.
                  raise AttributeError(f"Cannot set attribute '{name}' on wrapped object of type "
                                       f"'{type(self._value).__name__}': {e}")
+            if self._deep and self._subscribers:
+                # The path is the attribute name, as used by Viz for object nodes.
+                self._notify(_change("setitem", [name], value=value))
 
 
     def __repr__(self) -> str:
@@ -982,7 +1237,7 @@ class ObservableValue:
         if isinstance(self._value, (collections.abc.Sequence, collections.abc.Mapping)):
              try:
                 # This will naturally raise KeyError or IndexError if the key/index is invalid.
-                return self._value[key] # type: ignore # Assume subscriptable
+                return self._wrap_child(key, self._value[key]) # type: ignore # Assume subscriptable
              except (KeyError, IndexError) as e:
                  raise e # Re-raise standard access errors
              except Exception as e:
@@ -992,7 +1247,7 @@ class ObservableValue:
         # If not a standard sequence/mapping, check if it implements __getitem__ anyway.
         elif hasattr(self._value, '__getitem__'):
              try:
-                 return self._value[key] # type: ignore
+                 return self._wrap_child(key, self._value[key]) # type: ignore
              except (TypeError, KeyError, IndexError) as e: # Catch standard errors
                  raise e
              except Exception as e:
@@ -1052,3 +1307,382 @@ class ObservableValue:
              # Catch other unexpected errors during the 'in' check.
              logger.debug(f"Error during ObservableValue __contains__ for item '{item}': {e_cont}")
              raise e_cont # Re-raise original error
+
+
+# --- Change History Support ---
+
+# Number of versions between full copies of the value kept by `_History`.
+_HISTORY_CHECKPOINT_INTERVAL = 100
+
+
+def _snapshot(value: Any) -> Any:
+    """Returns a deep copy of a value, or the value itself if it cannot be copied. (Internal)."""
+    try:
+        return copy.deepcopy(value)
+    except Exception:
+        return value
+
+
+class _History:
+    """Records the changes of an ObservableValue for time travel. (Internal).
+
+    Every notification is stored as one entry: a list of compact
+    (type, path, value) records that turn one version into the next. Values
+    are copied when recorded, so later mutations don't alter the history.
+    Every `_HISTORY_CHECKPOINT_INTERVAL` versions a full copy of the value is
+    kept as a checkpoint. A past version is rebuilt by copying the nearest
+    earlier checkpoint and replaying the entries after it. Once enough newer
+    versions exist, the oldest checkpoint is dropped together with its
+    entries, which bounds memory like a ring buffer.
+    """
+    __slots__ = ('_get_value', '_capacity', '_entries', '_checkpoints', '_version')
+
+    def __init__(self, get_value: Callable[[], Any], capacity: int):
+        self._get_value = get_value
+        self._capacity = capacity # Minimum number of past versions kept
+        # Entry i turns version (first available version + i) into the next one.
+        self._entries: Deque[List[Tuple[str, Tuple[Any, ...], Any]]] = collections.deque()
+        # (version, copy of the value at that version), oldest first.
+        self._checkpoints: Deque[Tuple[int, Any]] = collections.deque([(0, _snapshot(get_value()))])
+        self._version = 0
+
+    def versions(self) -> range:
+        return range(self._checkpoints[0][0], self._version + 1)
+
+    def record(self, change_details: Dict[str, Any]):
+        """Subscriber callback storing a notification as the next version. (Internal)."""
+        changes = change_details['changes'] if change_details['type'] == 'batch' else (change_details,)
+        entry = []
+        for change in changes:
+            change_type = change['type']
+            # Forward replay needs the new value, except for removals from sets.
+            value = change['old_value'] if change_type == 'discard_set' else change['value']
+            if change_type in _REPLAY_NEEDS_VALUE:
+                value = _snapshot(value)
+            else:
+                value = None
+            entry.append((change_type, tuple(change['path']), value))
+        self._entries.append(entry)
+        self._version += 1
+
+        if self._version % _HISTORY_CHECKPOINT_INTERVAL == 0:
+            self._checkpoints.append((self._version, _snapshot(self._get_value())))
+        # Drop the oldest checkpoint and its entries once the next checkpoint
+        # alone covers the required number of versions.
+        while len(self._checkpoints) > 1 and self._checkpoints[1][0] <= self._version - self._capacity:
+            dropped_version = self._checkpoints.popleft()[0]
+            for _ in range(self._checkpoints[0][0] - dropped_version):
+                self._entries.popleft()
+
+    def value_at(self, version: int) -> Any:
+        first = self._checkpoints[0][0]
+        if not isinstance(version, int) or not first <= version <= self._version:
+            raise IndexError(f"Version {version!r} is not available; available versions are {first} to {self._version}.")
+        checkpoint_version, value = next(
+            (v, snapshot) for v, snapshot in reversed(self._checkpoints) if v <= version
+        )
+        value = _snapshot(value)
+        for index in range(checkpoint_version - first, version - first):
+            for change_type, path, change_value in self._entries[index]:
+                value = _replay_change(value, change_type, path, change_value)
+        return value
+
+
+# Change types whose recorded value is needed to replay them.
+_REPLAY_NEEDS_VALUE = frozenset(("set", "setitem", "append", "insert", "add_set", "discard_set"))
+
+
+def _replay_change(root: Any, change_type: str, path: Tuple[Any, ...], value: Any) -> Any:
+    """Applies a recorded change to a copy of the value, returning the new root. (Internal)."""
+    if change_type == "set":
+        return _snapshot(value)
+    container = root
+    for segment in path[:-1]:
+        if isinstance(container, (collections.abc.Sequence, collections.abc.Mapping)):
+            container = container[segment]
+        else:
+            container = getattr(container, segment) # Attribute of a custom object (deep mode)
+    if change_type == "clear":
+        root.clear()
+    elif change_type == "add_set":
+        root.add(_snapshot(value))
+    elif change_type == "discard_set":
+        root.discard(value)
+    elif change_type == "setitem":
+        if isinstance(container, (collections.abc.MutableSequence, collections.abc.MutableMapping)):
+            container[path[-1]] = _snapshot(value)
+        else:
+            setattr(container, path[-1], _snapshot(value))
+    elif change_type == "append":
+        container.append(_snapshot(value))
+    elif change_type == "insert":
+        container.insert(path[-1], _snapshot(value))
+    elif change_type in ("pop", "remove", "delitem"):
+        del container[path[-1]]
+    return root
+
+
+# Kinds of wrapped values, as cached in `ObservableValue._kind`.
+_KIND_SEQUENCE = "sequence"
+_KIND_MAPPING = "mapping"
+_KIND_SET = "set"
+_KIND_OTHER = "other"
+
+# Container kind per wrapped type, so the ABC isinstance checks run once per type.
+# Weak keys, so the cache doesn't keep dynamically created classes alive.
+_kind_cache: 'weakref.WeakKeyDictionary[type, str]' = weakref.WeakKeyDictionary()
+
+
+def _container_kind(value: Any) -> str:
+    """Returns the `_KIND_*` constant describing the type of a wrapped value. (Internal)."""
+    value_type = type(value)
+    kind = _kind_cache.get(value_type)
+    if kind is None:
+        if isinstance(value, collections.abc.MutableSequence):
+            kind = _KIND_SEQUENCE
+        elif isinstance(value, collections.abc.MutableMapping):
+            kind = _KIND_MAPPING
+        elif isinstance(value, collections.abc.MutableSet):
+            kind = _KIND_SET
+        else:
+            kind = _KIND_OTHER
+        _kind_cache[value_type] = kind
+    return kind
+
+
+def _change(change_type: str, path: List[Any], value: Any = None, key: Any = None,
+            old_value: Any = None, length: Optional[int] = None) -> Dict[str, Any]:
+    """Builds the change details passed to subscribers, with all standard keys. (Internal)."""
+    return {"type": change_type, "path": path, "value": value, "key": key,
+            "old_value": old_value, "length": length}
+
+
+def _merge_change(changes: List[Dict[str, Any]], change_details: Dict[str, Any]):
+    """Appends a change to a list of pending changes, merging where possible. (Internal).
+
+    Repeated assignments to the same key/index in a row are merged into one
+    (keeping the first 'old_value'), and "batch" changes are flattened.
+    """
+    if change_details['type'] == 'batch':
+        for nested_change in change_details['changes']:
+            _merge_change(changes, nested_change)
+        return
+    previous = changes[-1] if changes else None
+    if (previous is not None and change_details['type'] == 'setitem'
+            and previous['type'] == 'setitem' and previous['path'] == change_details['path']):
+        # Repeated assignment to the same key/index: only the last value matters.
+        # Merge into a copy, as other subscribers receive `change_details` as is.
+        changes[-1] = dict(change_details, old_value=previous['old_value'])
+    else:
+        changes.append(change_details)
+
+
+def _batch_change(changes: List[Dict[str, Any]], length: Optional[int]) -> Dict[str, Any]:
+    """Builds the "batch" change details delivered for a list of changes. (Internal)."""
+    return {
+        "type": "batch",
+        "path": [],         # The changes carry their own paths
+        "value": None,
+        "key": None,
+        "old_value": None,
+        "length": length,   # Length of the container after all changes
+        "changes": changes  # The individual change details, in order
+    }
+
+
+class _CoalescedDelivery:
+    """Subscriber wrapper implementing debounced and rate-limited delivery. (Internal).
+
+    Changes are merged into a pending list as they arrive. The first pending
+    change schedules a flush coroutine on Sidekick's event loop, which waits
+    until the policy allows a delivery and then calls the wrapped callback once
+    with everything collected so far. Modifications may come from any thread,
+    so the pending state is guarded by a lock.
+    """
+
+    def __init__(self, callback: SubscriptionCallback, policy: DeliveryPolicy,
+                 length_getter: Callable[[], Optional[int]]):
+        self.callback = callback
+        self._policy = policy
+        self._get_length = length_getter
+        self._lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self._flush_scheduled = False
+        self._deadline = 0.0    # time.monotonic() at which the pending changes are due
+        self._last_flush = float('-inf')
+        self._cancelled = False
+
+    def __call__(self, change_details: Dict[str, Any]):
+        now = time.monotonic()
+        with self._lock:
+            if self._cancelled:
+                return
+            _merge_change(self._pending, change_details)
+            if self._policy.mode == "debounce":
+                self._deadline = now + self._policy.interval # Every change restarts the quiet period
+            elif not self._flush_scheduled:
+                self._deadline = max(now, self._last_flush + self._policy.interval)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        flush_coro = None
+        try:
+            from .core.factories import get_task_manager
+            flush_coro = self._flush_when_due()
+            get_task_manager().submit_task(flush_coro)
+        except Exception as e:
+            if flush_coro is not None:
+                flush_coro.close() # Never scheduled; avoids the "never awaited" warning
+            # Without an event loop the changes must not be lost: deliver them now.
+            logger.warning(f"Could not schedule deferred ObservableValue delivery ({e}); delivering immediately.")
+            self._flush()
+
+    def is_for(self, callback: SubscriptionCallback) -> bool:
+        """Returns True if this wrapper delivers to `callback`. (Internal)."""
+        if isinstance(self.callback, _WeakSubscriber):
+            return self.callback.is_for(callback)
+        return self.callback == callback
+
+    def cancel(self):
+        """Discards pending changes and stops future deliveries. (Internal)."""
+        with self._lock:
+            self._cancelled = True
+            self._pending = []
+
+    async def _flush_when_due(self):
+        """Waits until the pending changes are due, then delivers them. (Internal)."""
+        while True:
+            with self._lock:
+                delay = self._deadline - time.monotonic()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        self._flush()
+
+    def _flush(self):
+        """Delivers all pending changes to the wrapped callback. (Internal)."""
+        with self._lock:
+            changes, self._pending = self._pending, []
+            self._flush_scheduled = False
+            self._last_flush = time.monotonic()
+            if self._cancelled or not changes:
+                return
+        try:
+            self.callback(changes[0] if len(changes) == 1 else _batch_change(changes, self._get_length()))
+        except Exception as e:
+            logger.exception(f"Error occurred inside ObservableValue subscriber callback {self.callback}: {e}")
+
+
+def _split_partial(callback: Callable) -> Tuple[Callable, tuple, dict]:
+    """Returns the function, positional and keyword arguments of a (possibly partial) callback. (Internal)."""
+    if isinstance(callback, functools.partial):
+        return callback.func, callback.args, callback.keywords
+    return callback, (), {}
+
+
+class _WeakSubscriber:
+    """Subscriber wrapper holding only a weak reference to a bound method. (Internal).
+
+    Wraps a bound method, or a `functools.partial` of one such as the
+    callbacks Viz subscribes with, using `weakref.WeakMethod`. Once the
+    method's object is garbage collected, calls are ignored and `on_collected`
+    (set by `ObservableValue.subscribe`) removes the subscription.
+    """
+    __slots__ = ('_method', '_args', '_kwargs', 'on_collected', '__weakref__')
+
+    def __init__(self, callback: SubscriptionCallback):
+        func, self._args, self._kwargs = _split_partial(callback)
+        if not isinstance(func, types.MethodType):
+            raise TypeError("Weak subscriptions require a bound method or a functools.partial of one")
+        self._method = weakref.WeakMethod(func, self._collected)
+        self.on_collected: Optional[Callable[[], None]] = None
+
+    def __call__(self, change_details: Dict[str, Any]):
+        method = self._method()
+        if method is not None:
+            method(*self._args, change_details, **self._kwargs)
+
+    def is_for(self, callback: SubscriptionCallback) -> bool:
+        """Returns True if this wrapper delivers to `callback`. (Internal)."""
+        func, args, kwargs = _split_partial(callback)
+        method = self._method()
+        return method is not None and method == func and args == self._args and kwargs == self._kwargs
+
+    def _collected(self, _ref: weakref.ref):
+        if self.on_collected is not None:
+            self.on_collected()
+
+
+# --- Deep Observation Support ---
+
+# Nested containers observed in deep mode. Other mutable children are observed
+# when they are plain objects with attributes (see `_is_deep_observable`).
+_DEEP_CONTAINER_TYPES = (list, dict, set)
+
+
+def _is_deep_observable(value: Any) -> bool:
+    """Checks if a nested value should be wrapped in a proxy in deep mode. (Internal)."""
+    if isinstance(value, ObservableValue):
+        return False # Already observable on its own
+    if isinstance(value, _DEEP_CONTAINER_TYPES):
+        return True
+    # Custom objects whose attributes can change, but not classes, functions or modules.
+    return (hasattr(value, '__dict__') and not callable(value)
+            and not isinstance(value, types.ModuleType))
+
+
+def _unwrap_nested(value: Any) -> Any:
+    """Returns the plain value behind a deep-observation proxy. (Internal)."""
+    return value._value if isinstance(value, _NestedObservable) else value
+
+
+class _NestedObservable(ObservableValue):
+    """Path-aware proxy for a child of a deeply observed ObservableValue. (Internal).
+
+    Created on access by `ObservableValue._wrap_child()`. It supports the same
+    operations as `ObservableValue`, but instead of notifying its own
+    subscribers, it reports every change to the root ObservableValue with the
+    path of the child prepended.
+    """
+    __slots__ = ('_root', '_path', '_parent', '_key', '_is_attribute')
+    _obs_internal_attrs = ObservableValue._obs_internal_attrs + __slots__
+
+    def __init__(self, value: Any, root: ObservableValue, path: List[Any], parent: Any, key: Any, is_attribute: bool):
+        super().__init__(value, deep=True)
+        # Share the root's subscriber set, so the "anyone listening?" checks see the root's subscribers.
+        self._subscribers = root._subscribers
+        self._root = root                 # ObservableValue whose subscribers are notified
+        self._path = path                 # Path from the root value to this child
+        self._parent = parent             # Container (or object) holding this child
+        self._key = key                   # Index, key or attribute name of this child in its parent
+        self._is_attribute = is_attribute # Whether `_key` is an attribute name
+
+    def _deep_context(self) -> Tuple[ObservableValue, List[Any]]:
+        return self._root, self._path
+
+    def _notify(self, change_details: Dict[str, Any]):
+        if change_details.get("type") in ("set", "clear", "add_set", "discard_set"):
+            # These changes are addressed relative to the root of a variable by Viz,
+            # so report them as a replacement of this whole child instead.
+            change_details = _change("setitem", list(self._path), value=self._value)
+        else:
+            change_details["path"] = self._path + list(change_details.get("path", []))
+        self._root._notify(change_details)
+
+    def batch(self):
+        # Changes are collected by the root, which notifies the subscribers.
+        return self._root.batch()
+
+    def set(self, new_value: Any):
+        """Replaces this child in its parent container (or object) and notifies subscribers."""
+        new_value = _unwrap_nested(new_value)
+        if self._value is new_value:
+            return
+        if self._is_attribute:
+            setattr(self._parent, self._key, new_value)
+        else:
+            self._parent[self._key] = new_value
+        self._value = new_value
+        self._kind = _container_kind(new_value)
+        if self._subscribers:
+            self._notify(_change("set", [], value=new_value))
@@ -0,0 +1,196 @@
+"""Finds the components that generate the most Sidekick traffic.
+
+When a Sidekick app feels slow, the cause is often one component flooding
+the connection, e.g., `Console.print` inside a tight loop or `Viz.show` of a
+very large object. `sidekick.profile()` records, for each component and
+action, how many messages were sent, how many bytes they took, how long
+Sidekick spent encoding them, how long the component spent building their
+payloads, and how much time that component's callbacks took:
+
+    >>> with sidekick.profile():
+    ...     run_simulation()
+    Sidekick traffic profile (3.20 s, 12,480 messages, 1,532,117 bytes)
+    instance_id    action     messages       bytes  encode ms   build ms  callbacks  callback ms
+    console-1      append       10,000   1,120,000      41.20       0.00          0         0.00
+    viz-1          show              0           0       0.00     850.10          0         0.00
+    ...
+
+Build time is recorded for the methods that do expensive work before
+sending, such as `Viz.show` turning a value into its display structure. It
+is reported under the method's name, next to the rows of the messages it
+sent.
+
+Pass `output="profile.json"` to write the data as JSON instead of printing.
+
+Messages are recorded when they are put on the wire; when the block ends,
+the profile waits for the messages it queued to be sent before reporting.
+"""
+
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+_SORT_KEYS = ("bytes", "messages", "encode_time", "build_time", "callback_time")
+
+_Method = TypeVar("_Method", bound=Callable[..., Any])
+
+
+class TrafficProfile:
+    """Traffic and callback statistics per (instance_id, action), filled in by `sidekick.profile()`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._started = time.perf_counter()
+        self.duration = 0.0
+
+    def _row(self, instance_id: str, action: str) -> Dict[str, float]:
+        row = self._rows.get((instance_id, action))
+        if row is None:
+            row = self._rows[(instance_id, action)] = {
+                "messages": 0, "bytes": 0, "encode_time": 0.0, "build_time": 0.0,
+                "callbacks": 0, "callback_time": 0.0,
+            }
+        return row
+
+    def record_message(self, message: Dict[str, Any], size: int, encode_time: float) -> None:
+        """Records one outgoing message. (Internal)."""
+        payload = message.get("payload")
+        action = payload.get("action") if isinstance(payload, dict) else None
+        with self._lock:
+            row = self._row(message.get("target") or f"({message.get('component')})", action or message.get("type", "?"))
+            row["messages"] += 1
+            row["bytes"] += size
+            row["encode_time"] += encode_time
+
+    def record_build(self, instance_id: str, action: str, duration: float) -> None:
+        """Records time a component spent building payloads. (Internal)."""
+        with self._lock:
+            self._row(instance_id, action)["build_time"] += duration
+
+    def record_callback(self, instance_id: str, event_type: str, duration: float) -> None:
+        """Records one user callback run. (Internal)."""
+        with self._lock:
+            row = self._row(instance_id, event_type)
+            row["callbacks"] += 1
+            row["callback_time"] += duration
+
+    def rows(self, sort_by: str = "bytes") -> List[Dict[str, Any]]:
+        """Returns one dict per (instance_id, action), sorted by `sort_by` (descending).
+
+        Args:
+            sort_by (str): One of "bytes", "messages", "encode_time", "build_time"
+                or "callback_time".
+
+        Raises:
+            ValueError: If `sort_by` is not a supported key.
+        """
+        if sort_by not in _SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {_SORT_KEYS}, got {sort_by!r}.")
+        with self._lock:
+            rows = [dict(row, instance_id=key[0], action=key[1]) for key, row in self._rows.items()]
+        return sorted(rows, key=lambda row: row[sort_by], reverse=True)
+
+    def to_dict(self, sort_by: str = "bytes") -> Dict[str, Any]:
+        """Returns the profile as a JSON-serializable dictionary."""
+        rows = self.rows(sort_by)
+        return {
+            "duration": self.duration,
+            "messages": sum(row["messages"] for row in rows),
+            "bytes": sum(row["bytes"] for row in rows),
+            "rows": rows,
+        }
+
+    def report(self, sort_by: str = "bytes", top: Optional[int] = 20) -> str:
+        """Returns a human-readable table of the `top` rows (all rows if None)."""
+        data = self.to_dict(sort_by)
+        lines = [
+            f"Sidekick traffic profile ({data['duration']:.2f} s, {data['messages']:,} messages, {data['bytes']:,} bytes)",
+            f"{'instance_id':<24} {'action':<16} {'messages':>10} {'bytes':>12} {'encode ms':>10} {'build ms':>10} "
+            f"{'callbacks':>10} {'callback ms':>12}",
+        ]
+        for row in data["rows"][:top]:
+            lines.append(
+                f"{row['instance_id']:<24} {row['action']:<16} {row['messages']:>10,} {row['bytes']:>12,} "
+                f"{row['encode_time'] * 1000:>10.2f} {row['build_time'] * 1000:>10.2f} "
+                f"{row['callbacks']:>10,} {row['callback_time'] * 1000:>12.2f}"
+            )
+        return "\n".join(lines)
+
+
+_active_profile: Optional[TrafficProfile] = None
+
+
+def active_profile() -> Optional[TrafficProfile]:
+    """Returns the profile being recorded, or None. (Internal)."""
+    return _active_profile
+
+
+def times_payload_build(action: str) -> Callable[[_Method], _Method]:
+    """Decorates a component method so `sidekick.profile()` records its run time as build time. (Internal).
+
+    Args:
+        action (str): The action the time is reported under, for the
+            component's `instance_id`.
+    """
+    def decorator(method: _Method) -> _Method:
+        @functools.wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            traffic = _active_profile
+            if traffic is None:
+                return method(self, *args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                traffic.record_build(self.instance_id, action, time.perf_counter() - started)
+        return wrapper # type: ignore[return-value]
+    return decorator
+
+
+@contextmanager
+def profile(output: Optional[str] = None, sort_by: str = "bytes", top: Optional[int] = 20) -> Iterator[TrafficProfile]:
+    """Records Sidekick traffic per component while the `with` block runs.
+
+    On exit, prints a report sorted by `sort_by`, or writes it as JSON to
+    `output`. The `TrafficProfile` is also available as the `as` target, for
+    custom reporting.
+
+    Args:
+        output (Optional[str]): Path of a JSON file to write instead of
+            printing the report.
+        sort_by (str): "bytes" (default), "messages", "encode_time",
+            "build_time" or "callback_time".
+        top (Optional[int]): Number of rows to print (all if None). The JSON
+            output always contains all rows.
+
+    Raises:
+        ValueError: If `sort_by` is invalid.
+        RuntimeError: If another `sidekick.profile()` is already active.
+
+    Example:
+        >>> with sidekick.profile(sort_by="messages") as traffic:
+        ...     for i in range(1000):
+        ...         console.print(i)
+    """
+    global _active_profile
+    if sort_by not in _SORT_KEYS:
+        raise ValueError(f"sort_by must be one of {_SORT_KEYS}, got {sort_by!r}.")
+    if _active_profile is not None:
+        raise RuntimeError("A sidekick.profile() is already active.")
+    traffic = _active_profile = TrafficProfile()
+    try:
+        yield traffic
+    finally:
+        from .connection import wait_for_pending_messages # Deferred: connection imports this module
+        wait_for_pending_messages()
+        _active_profile = None
+        traffic.duration = time.perf_counter() - traffic._started
+        if output is not None:
+            with open(output, "w", encoding="utf-8") as f:
+                json.dump(traffic.to_dict(sort_by), f, indent=2)
+        else:
+            print(traffic.report(sort_by, top))
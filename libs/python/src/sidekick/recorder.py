@@ -0,0 +1,282 @@
+"""Records every message of a Sidekick session to a compact log file.
+
+A recording captures what the script sent to the UI and what the UI sent
+back, with the time of each message, for attaching to bug reports or
+replaying later (see `python -m sidekick.replay`):
+
+    >>> with sidekick.record("session.log"):
+    ...     run_app()
+
+Recording happens on the send and receive paths, where it only timestamps
+the message and appends it to an in-memory buffer. A background thread
+batches the buffer into compressed blocks and appends them to the file.
+
+File format (all integers big-endian):
+
+*   Header: the magic bytes `SKREC`, a format version byte (1), a codec
+    byte (1 = deflate, 2 = zstd) and the wall-clock start time as a float64
+    (seconds since the epoch).
+*   Blocks, until the end of the file: a uint32 length, then that many
+    bytes compressed with the codec. Each block holds whole records, so a
+    file cut short by a crash can still be read up to its last full block.
+*   Records, inside a decompressed block: a direction byte (`>` for sent,
+    `<` for received), the time since the recording started as a float64
+    (from `time.monotonic()`), a uint32 length and the message as UTF-8.
+
+Deflate (zlib) is always available. Zstandard compresses faster and
+smaller and needs the `zstandard` package (`pip install sidekick-py[zstd]`).
+"""
+
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Deque, Iterator, Optional, Tuple
+
+from . import logger
+
+_MAGIC = b"SKREC"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct(">5sBBd")
+_BLOCK_LENGTH = struct.Struct(">I")
+_RECORD = struct.Struct(">cdI")
+_CODECS = {"deflate": 1, "zstd": 2}
+
+SENT = ">"
+"""Direction of a message sent by the script to the UI."""
+
+RECEIVED = "<"
+"""Direction of a message received by the script from the UI."""
+
+
+@dataclass(frozen=True)
+class RecordedMessage:
+    """One message read back from a recording.
+
+    Attributes:
+        timestamp (float): Seconds since the recording started.
+        direction (str): `SENT` (">") or `RECEIVED` ("<").
+        message (str): The raw JSON message.
+    """
+    timestamp: float
+    direction: str
+    message: str
+
+
+def _compressor(codec: str, level: Optional[int]) -> Callable[[bytes], bytes]:
+    """Returns a function compressing one block with `codec`. (Internal)."""
+    if codec == "deflate":
+        deflate_level = 6 if level is None else level
+        return lambda data: zlib.compress(data, deflate_level)
+    import zstandard # type: ignore[import-not-found]
+    return zstandard.ZstdCompressor(level=3 if level is None else level).compress
+
+
+def _decompressor(codec: str) -> Callable[[bytes], bytes]:
+    """Returns a function decompressing one block with `codec`. (Internal)."""
+    if codec == "deflate":
+        return zlib.decompress
+    try:
+        import zstandard # type: ignore[import-not-found]
+    except ImportError as e:
+        raise ImportError(
+            "This recording is zstd-compressed, which requires the 'zstandard' package. "
+            "Install it with: pip install zstandard"
+        ) from e
+    return zstandard.ZstdDecompressor().decompress
+
+
+class MessageRecorder:
+    """Writes messages to a recording file from a background thread.
+
+    Attach it to the connection with `sidekick.record()`, or call `record()`
+    directly. `close()` writes any buffered messages and closes the file.
+
+    Args:
+        path (str): The file to create (overwritten if it exists).
+        codec (str): "deflate" (default) or "zstd".
+        level (Optional[int]): Compression level for the codec (codec default if None).
+        flush_interval (float): Longest time, in seconds, that a message stays
+            in memory before being written.
+        block_size (int): Number of buffered messages that triggers a write
+            before `flush_interval` has passed.
+
+    Raises:
+        ValueError: If `codec` is unknown or `flush_interval`/`block_size` is not positive.
+        ImportError: If `codec` is "zstd" and `zstandard` is not installed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        codec: str = "deflate",
+        level: Optional[int] = None,
+        flush_interval: float = 0.25,
+        block_size: int = 4096,
+    ):
+        if codec not in _CODECS:
+            raise ValueError(f"codec must be one of {tuple(_CODECS)}, got {codec!r}.")
+        if flush_interval <= 0 or block_size <= 0:
+            raise ValueError("flush_interval and block_size must be positive.")
+        try:
+            self._compress = _compressor(codec, level)
+        except ImportError as e:
+            raise ImportError(
+                "The 'zstd' codec requires the 'zstandard' package. Install it with: pip install zstandard"
+            ) from e
+        self.path = path
+        self.codec = codec
+        self._flush_interval = flush_interval
+        self._block_size = block_size
+        self._pending: Deque[Tuple[str, float, str]] = deque()
+        self._wake = threading.Event()
+        self._closed = False
+        self.messages_recorded = 0
+        self.bytes_written = 0
+
+        self._file: BinaryIO = open(path, "wb")
+        self._started = time.monotonic()
+        self._file.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, _CODECS[codec], time.time()))
+        self._file.flush()
+        self.bytes_written = _HEADER.size
+        self._writer = threading.Thread(target=self._run_writer, name="sidekick-recorder", daemon=True)
+        self._writer.start()
+
+    def record(self, direction: str, message: str) -> None:
+        """Timestamps a message and queues it for writing. Thread-safe.
+
+        Args:
+            direction (str): `SENT` or `RECEIVED`.
+            message (str): The raw message string.
+        """
+        if self._closed:
+            return
+        # deque.append is atomic, so the hot path needs no lock.
+        self._pending.append((direction, time.monotonic() - self._started, message))
+        if len(self._pending) >= self._block_size:
+            self._wake.set()
+
+    def close(self) -> None:
+        """Writes the messages still buffered and closes the file. Idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        self._file.close()
+        logger.info(
+            f"Recording '{self.path}' closed: {self.messages_recorded} messages, {self.bytes_written} bytes."
+        )
+
+    def __enter__(self) -> 'MessageRecorder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run_writer(self) -> None:
+        while True:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            closing = self._closed
+            try:
+                self._write_pending()
+            except Exception as e: # pragma: no cover
+                logger.exception(f"Recording '{self.path}' failed, dropping further messages: {e}")
+                self._closed = True
+                return
+            if closing:
+                return
+
+    def _write_pending(self) -> None:
+        pending = self._pending
+        while pending:
+            block = bytearray()
+            count = 0
+            while pending and count < self._block_size:
+                direction, timestamp, message = pending.popleft()
+                data = message.encode("utf-8")
+                block += _RECORD.pack(direction.encode("ascii"), timestamp, len(data))
+                block += data
+                count += 1
+            compressed = self._compress(bytes(block))
+            self._file.write(_BLOCK_LENGTH.pack(len(compressed)))
+            self._file.write(compressed)
+            self.messages_recorded += count
+            self.bytes_written += _BLOCK_LENGTH.size + len(compressed)
+        self._file.flush()
+
+
+def read_recording(path: str) -> Iterator[RecordedMessage]:
+    """Yields the messages of a recording file in order.
+
+    A block cut short at the end of the file (e.g., by a crash) is skipped
+    with a warning.
+
+    Raises:
+        ValueError: If `path` is not a Sidekick recording.
+        ImportError: If the recording is zstd-compressed and `zstandard` is not installed.
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"'{path}' is not a Sidekick recording (file too short).")
+        magic, version, codec_id, _ = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            raise ValueError(f"'{path}' is not a Sidekick recording (version {_FORMAT_VERSION}).")
+        codec = next((name for name, value in _CODECS.items() if value == codec_id), None)
+        if codec is None:
+            raise ValueError(f"'{path}' uses an unknown codec ({codec_id}).")
+        decompress = _decompressor(codec)
+        while True:
+            length_bytes = f.read(_BLOCK_LENGTH.size)
+            if not length_bytes:
+                return
+            compressed = f.read(_BLOCK_LENGTH.unpack(length_bytes)[0]) if len(length_bytes) == _BLOCK_LENGTH.size else b""
+            try:
+                block = decompress(compressed)
+            except Exception:
+                logger.warning(f"Recording '{path}' ends with an incomplete block; stopping there.")
+                return
+            offset = 0
+            while offset < len(block):
+                direction, timestamp, length = _RECORD.unpack_from(block, offset)
+                offset += _RECORD.size
+                yield RecordedMessage(timestamp, direction.decode("ascii"), block[offset:offset + length].decode("utf-8"))
+                offset += length
+
+
+@contextmanager
+def record(path: str, codec: str = "deflate", **options: Any) -> Iterator[MessageRecorder]:
+    """Records all Sidekick messages sent and received while the `with` block runs.
+
+    Args:
+        path (str): The recording file to create.
+        codec (str): "deflate" (default) or "zstd" (requires `zstandard`).
+        **options (Any): Other `MessageRecorder` arguments, e.g., `flush_interval`.
+
+    Raises:
+        ValueError: If `codec` is unknown.
+        RuntimeError: If a recording is already attached to the connection.
+
+    Example:
+        >>> with sidekick.record("bug-report.log"):
+        ...     main()
+    """
+    from .connection import _get_service_instance, wait_for_pending_messages # Deferred: connection imports this module
+    service = _get_service_instance()
+    recorder = MessageRecorder(path, codec, **options)
+    try:
+        service.set_recorder(recorder)
+    except RuntimeError:
+        recorder.close()
+        raise
+    try:
+        yield recorder
+    finally:
+        wait_for_pending_messages() # Messages the block queued are recorded when sent
+        service.set_recorder(None)
+        recorder.close()
@@ -0,0 +1,345 @@
+"""A self-hosted Sidekick relay server, for local and LAN deployments.
+
+The relay connects Python scripts ("hero" peers) to Sidekick UIs
+("sidekick" peers) the same way as the cloud relay (`cloudflare/ws`): peers
+join a session with the `?session=` query parameter, announce themselves
+with `system/announce` messages, and every message from an announced peer is
+forwarded to all other announced peers in its session. Sessions are
+independent, so one relay can serve a whole classroom:
+
+    python -m sidekick.relay --host 0.0.0.0 --port 5163
+
+Scripts then connect with `sidekick.set_url("ws://<host>:5163/?session=<name>")`.
+The default port is the one Sidekick tries first, so scripts on the relay's
+own machine need no `set_url()` when they share the default session.
+
+Compared with the cloud relay:
+
+*   A connection without `?session=` joins a shared default session, unless
+    `--require-session` is given (then it is refused, as in the cloud).
+*   Each message is encoded once and written to all recipients
+    (`websockets.broadcast`); only messages that may be announcements are
+    parsed as JSON, others are forwarded unchanged.
+*   A peer that announces itself offline is announced to the others (the
+    cloud relay only does this when the connection closes).
+*   Backpressure is per session: when a recipient's send buffer is full, the
+    peer sending to it is not read from until the buffer drains, so a slow
+    browser slows its own session's script instead of filling memory. A
+    recipient that stays full for `--slow-peer-timeout` seconds is dropped.
+*   Limits on sessions, peers per session and message size are configurable.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import websockets # type: ignore[import-untyped]
+
+from . import logger
+
+DEFAULT_PORT = 5163
+_DEFAULT_SESSION = ""
+_MiB = 2**20
+
+
+@dataclass
+class RelayLimits:
+    """Limits enforced by `SidekickRelay`.
+
+    Attributes:
+        max_sessions (int): Sessions open at once; new sessions beyond it are refused.
+        max_peers_per_session (int): Connections per session; more are refused.
+        max_message_size (int): Largest message accepted, in bytes; a peer
+            sending a larger one is disconnected.
+        max_peer_buffer (int): Bytes waiting to be sent to one peer before
+            its session's senders are paused.
+        slow_peer_timeout (float): Seconds a peer may keep its buffer full
+            before it is disconnected.
+    """
+    max_sessions: int = 1000
+    max_peers_per_session: int = 64
+    max_message_size: int = 16 * _MiB
+    max_peer_buffer: int = 4 * _MiB
+    slow_peer_timeout: float = 10.0
+
+
+@dataclass
+class _Peer:
+    """An announced peer. (Internal)."""
+    websocket: Any
+    role: Optional[str]
+    version: Optional[str]
+    timestamp: Any
+
+
+@dataclass
+class _Session:
+    """The connections and announced peers of one session. (Internal)."""
+    session_id: str
+    connections: Set[Any] = field(default_factory=set)
+    peers: Dict[str, _Peer] = field(default_factory=dict)
+
+
+def _announce_message(peer_id: str, peer: _Peer, status: str, timestamp: Any) -> str:
+    return json.dumps({
+        "id": 0, "component": "system", "type": "announce",
+        "payload": {"peerId": peer_id, "role": peer.role, "status": status,
+                    "version": peer.version, "timestamp": timestamp},
+    })
+
+
+class SidekickRelay:
+    """Relays Sidekick messages between the peers of each session.
+
+    Args:
+        host (str): Interface to listen on ("0.0.0.0" for all).
+        port (int): Port to listen on (0 picks a free one).
+        limits (Optional[RelayLimits]): Limits to enforce (defaults if None).
+        require_session (bool): Refuse connections without `?session=`.
+        compression (bool): Negotiate per-message deflate. Off by default:
+            it compresses each message separately for every recipient.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        limits: Optional[RelayLimits] = None,
+        require_session: bool = False,
+        compression: bool = False,
+    ):
+        self.host = host
+        self.port = port
+        self.limits = limits or RelayLimits()
+        self._require_session = require_session
+        self._compression = compression
+        self._sessions: Dict[str, _Session] = {}
+        self._server: Any = None
+        self.messages_received = 0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.slow_peers_dropped = 0
+
+    # --- Lifecycle ---
+
+    async def start(self) -> str:
+        """Starts listening and returns the relay's ws:// URL."""
+        self._server = await websockets.serve(
+            self._handle_connection, self.host, self.port,
+            process_request=self._check_request,
+            max_size=self.limits.max_message_size,
+            compression="deflate" if self._compression else None,
+        )
+        self.port = next(iter(self._server.sockets)).getsockname()[1]
+        url = f"ws://{self.host}:{self.port}"
+        logger.info(f"Sidekick relay listening on {url}.")
+        return url
+
+    async def close(self) -> None:
+        """Stops listening and closes all connections."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        """Starts the relay (if needed) and runs until cancelled."""
+        if self._server is None:
+            await self.start()
+        try:
+            await asyncio.Future()
+        finally:
+            await self.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns counts of sessions, peers and relayed traffic."""
+        return {
+            "sessions": len(self._sessions),
+            "connections": sum(len(session.connections) for session in self._sessions.values()),
+            "messages_received": self.messages_received,
+            "messages_sent": self.messages_sent,
+            "bytes_sent": self.bytes_sent,
+            "slow_peers_dropped": self.slow_peers_dropped,
+        }
+
+    # --- Connections ---
+
+    def _session_id(self, path: str) -> Optional[str]:
+        """Returns the session requested by `path`, or None if it must be refused. (Internal)."""
+        session_ids = parse_qs(urlparse(path).query).get("session")
+        if session_ids and session_ids[0]:
+            return session_ids[0]
+        return None if self._require_session else _DEFAULT_SESSION
+
+    def _limit_reached(self, session_id: str) -> Optional[str]:
+        """Returns why one more connection to `session_id` would exceed the limits, or None. (Internal)."""
+        session = self._sessions.get(session_id)
+        if session is None and len(self._sessions) >= self.limits.max_sessions:
+            return "Too many sessions"
+        if session is not None and len(session.connections) >= self.limits.max_peers_per_session:
+            return "Too many peers in session"
+        return None
+
+    async def _check_request(self, path: str, request_headers: Any):
+        """Refuses connections that would break the session rules or limits. (Internal)."""
+        session_id = self._session_id(path)
+        if session_id is None:
+            return HTTPStatus.BAD_REQUEST, [], b"Missing session id\n"
+        reason = self._limit_reached(session_id)
+        if reason is not None:
+            return HTTPStatus.SERVICE_UNAVAILABLE, [], f"{reason}\n".encode()
+        return None
+
+    async def _handle_connection(self, websocket: Any) -> None:
+        session_id = self._session_id(websocket.path) or _DEFAULT_SESSION
+        # Checked again: handshakes accepted concurrently may have used up the limit since.
+        reason = self._limit_reached(session_id)
+        if reason is not None:
+            await websocket.close(1013, reason) # Try again later
+            return
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session(session_id)
+        session.connections.add(websocket)
+        peer_id: Optional[str] = None
+        try:
+            # Tell the newcomer who is already online.
+            for other_id, other in list(session.peers.items()):
+                await websocket.send(_announce_message(other_id, other, "online", other.timestamp))
+            async for raw in websocket:
+                if not isinstance(raw, str):
+                    continue
+                self.messages_received += 1
+                went_offline = False
+                if '"announce"' in raw: # Cheap pre-check; only possible announcements are parsed
+                    peer_id, went_offline = self._process_announce(session, websocket, raw, peer_id)
+                if peer_id is None or peer_id not in session.peers:
+                    continue # Messages from peers that haven't announced themselves are dropped
+                await self._broadcast(session, peer_id, raw)
+                if went_offline:
+                    # Removed only after relaying, so the others hear the announcement.
+                    session.peers.pop(peer_id, None)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            session.connections.discard(websocket)
+            peer = session.peers.get(peer_id) if peer_id is not None else None
+            if peer is not None and peer.websocket is websocket:
+                del session.peers[peer_id]
+                await self._broadcast(session, peer_id, _announce_message(peer_id, peer, "offline", int(time.time() * 1000)))
+            if not session.connections:
+                self._sessions.pop(session_id, None)
+
+    def _process_announce(
+        self, session: _Session, websocket: Any, raw: str, peer_id: Optional[str]
+    ) -> Tuple[Optional[str], bool]:
+        """Registers the sender of an online `system/announce`. (Internal).
+
+        Returns:
+            The sender's peer ID, and whether it announced itself offline.
+        """
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return peer_id, False
+        if not isinstance(message, dict) or message.get("component") != "system" or message.get("type") != "announce":
+            return peer_id, False
+        payload = message.get("payload") or {}
+        announced_id = payload.get("peerId")
+        if not isinstance(announced_id, str):
+            return peer_id, False
+        if payload.get("status") == "online":
+            session.peers[announced_id] = _Peer(
+                websocket, payload.get("role"), payload.get("version"),
+                payload.get("timestamp") or int(time.time() * 1000),
+            )
+        return announced_id, payload.get("status") == "offline"
+
+    async def _broadcast(self, session: _Session, sender_id: str, raw: str) -> None:
+        """Sends `raw` to every other announced peer, then waits for full buffers to drain. (Internal)."""
+        recipients: List[Any] = [
+            peer.websocket for other_id, peer in session.peers.items()
+            if other_id != sender_id and not peer.websocket.transport.is_closing()
+        ]
+        if not recipients:
+            return
+        websockets.broadcast(recipients, raw) # Encodes the frame once for all recipients
+        self.messages_sent += len(recipients)
+        self.bytes_sent += len(raw) * len(recipients)
+        for recipient in recipients:
+            transport = recipient.transport
+            if transport is not None and transport.get_write_buffer_size() > self.limits.max_peer_buffer:
+                await self._wait_for_slow_peer(session, recipient)
+
+    async def _wait_for_slow_peer(self, session: _Session, websocket: Any) -> None:
+        """Pauses the current sender until `websocket` drains, dropping it if it takes too long. (Internal)."""
+        try:
+            await asyncio.wait_for(websocket.drain(), self.limits.slow_peer_timeout)
+        except asyncio.TimeoutError:
+            self.slow_peers_dropped += 1
+            logger.warning(
+                f"Relay session '{session.session_id}': dropping a peer whose send buffer stayed full "
+                f"for {self.limits.slow_peer_timeout}s."
+            )
+            websocket.transport.abort() # Its buffer is full, so a closing handshake could not get through
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+
+async def _log_stats(relay: SidekickRelay, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        logger.info(f"Relay stats: {relay.stats()}")
+
+
+async def _run(relay: SidekickRelay, stats_interval: Optional[float]) -> None:
+    print(f"Sidekick relay listening on {await relay.start()} (Ctrl+C to stop).")
+    stats_task = asyncio.ensure_future(_log_stats(relay, stats_interval)) if stats_interval else None
+    try:
+        await relay.serve_forever()
+    finally:
+        if stats_task is not None:
+            stats_task.cancel()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    defaults = RelayLimits()
+    parser = argparse.ArgumentParser(prog="python -m sidekick.relay", description="Run a Sidekick relay server.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on; use 0.0.0.0 to serve the LAN.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default {DEFAULT_PORT}).")
+    parser.add_argument("--require-session", action="store_true", help="Refuse connections without ?session=.")
+    parser.add_argument("--compress", action="store_true", help="Enable per-message deflate (costs CPU per recipient).")
+    parser.add_argument("--max-sessions", type=int, default=defaults.max_sessions)
+    parser.add_argument("--max-peers", type=int, default=defaults.max_peers_per_session, help="Connections per session.")
+    parser.add_argument("--max-message-size", type=float, default=defaults.max_message_size / _MiB, help="In MiB.")
+    parser.add_argument("--max-peer-buffer", type=float, default=defaults.max_peer_buffer / _MiB, help="In MiB.")
+    parser.add_argument("--slow-peer-timeout", type=float, default=defaults.slow_peer_timeout, help="In seconds.")
+    parser.add_argument("--stats-interval", type=float, help="Log traffic counts every this many seconds.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log connection details.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(asctime)s %(message)s")
+    limits = RelayLimits(
+        max_sessions=args.max_sessions,
+        max_peers_per_session=args.max_peers,
+        max_message_size=int(args.max_message_size * _MiB),
+        max_peer_buffer=int(args.max_peer_buffer * _MiB),
+        slow_peer_timeout=args.slow_peer_timeout,
+    )
+    relay = SidekickRelay(args.host, args.port, limits, args.require_session, args.compress)
+    try:
+        asyncio.run(_run(relay, args.stats_interval))
+    except KeyboardInterrupt:
+        print("Sidekick relay stopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
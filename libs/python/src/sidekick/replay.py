@@ -0,0 +1,234 @@
+"""Replays a recorded Sidekick session against a relay or UI, for load testing.
+
+Reads a recording made with `sidekick.record()` and sends the messages the
+script sent, in order, as a new "hero" peer. No script code runs, so a
+replay can push a relay and the UI's rendering far harder than the
+original program:
+
+    python -m sidekick.replay session.log --url "ws://localhost:5163" --speed max
+    python -m sidekick.replay session.log --url "wss://relay/ws?session=load-{n}" --speed 10x -n 50
+
+`--speed` keeps the original timing (`1x`), compresses it (`10x`) or sends
+as fast as possible (`max`). `-n` runs several replays at once, each as its
+own peer; `{n}` in the URL is replaced with the replay number, e.g., to give
+each replay its own relay session. The recorded peer announcements are not
+replayed: each replay announces itself with a fresh peer ID.
+
+At the end, the achieved throughput is printed for each replay and in total,
+with how far sending fell behind the requested schedule.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import websockets # type: ignore[import-untyped]
+
+from . import _version
+from .recorder import SENT, read_recording
+from .testing import _FLUSH_COMPONENT
+
+_UI_WAIT_TIMEOUT_SECONDS = 30.0
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of one replay.
+
+    Attributes:
+        replay (int): The replay number (0-based).
+        messages (int): Messages sent, not counting the peer announcements.
+        bytes (int): Characters sent in those messages.
+        seconds (float): Time from the first to the last message.
+        max_lag (float): How far, in seconds, sending fell behind the schedule
+            at worst (0 with `--speed max`).
+    """
+    replay: int
+    messages: int
+    bytes: int
+    seconds: float
+    max_lag: float
+
+    @property
+    def messages_per_sec(self) -> float:
+        return self.messages / self.seconds if self.seconds > 0 else float("inf")
+
+
+def parse_speed(value: str) -> Optional[float]:
+    """Parses a `--speed` value ("max", "10x" or "2.5") into a factor (None for max).
+
+    Raises:
+        ValueError: If `value` is not "max" or a positive number with optional "x".
+    """
+    text = value.strip().lower()
+    if text == "max":
+        return None
+    factor = float(text[:-1] if text.endswith("x") else text)
+    if factor <= 0:
+        raise ValueError(f"speed must be positive, got {value!r}.")
+    return factor
+
+
+def load_outbound(path: str) -> List[Tuple[float, str]]:
+    """Returns `(timestamp, message)` for each message the script sent.
+
+    Peer announcements are left out, and so are the flush markers that
+    `HeadlessUI.flush` sends through the library when a test is recorded.
+    """
+    outbound = []
+    for recorded in read_recording(path):
+        if recorded.direction != SENT:
+            continue
+        message = json.loads(recorded.message)
+        if message.get("component") == "system" and message.get("type") == "announce":
+            continue
+        if message.get("component") == _FLUSH_COMPONENT:
+            continue
+        outbound.append((recorded.timestamp, recorded.message))
+    return outbound
+
+
+def _announce(peer_id: str, status: str) -> str:
+    return json.dumps({
+        "id": 0, "component": "system", "type": "announce",
+        "payload": {"peerId": peer_id, "role": "hero", "status": status,
+                    "version": _version.__version__, "timestamp": int(time.time() * 1000)},
+    })
+
+
+async def _wait_for_ui(websocket) -> None:
+    """Waits for a Sidekick UI peer to announce itself online. (Internal)."""
+    async for raw in websocket:
+        message = json.loads(raw)
+        payload = message.get("payload") or {}
+        if message.get("type") == "announce" and payload.get("role") == "sidekick" and payload.get("status") == "online":
+            return
+
+
+async def _drain(websocket) -> None:
+    """Reads and discards incoming messages, so the peer never blocks on a full receive queue. (Internal)."""
+    try:
+        async for _ in websocket:
+            pass
+    except websockets.exceptions.ConnectionClosed:
+        pass
+
+
+async def replay_async(
+    messages: Sequence[Tuple[float, str]],
+    url: str,
+    speed: Optional[float] = None,
+    replay: int = 0,
+    wait_for_ui: bool = False,
+) -> ReplayResult:
+    """Replays `messages` (from `load_outbound`) to `url` as a new hero peer.
+
+    Args:
+        messages (Sequence[Tuple[float, str]]): `(timestamp, message)` pairs.
+        url (str): The WebSocket URL of the relay or UI.
+        speed (Optional[float]): Timing factor (1.0 keeps the original
+            timing, 10.0 is ten times faster), or None to send as fast as possible.
+        replay (int): Replay number, for the result.
+        wait_for_ui (bool): If True, wait for a Sidekick UI to announce itself
+            before sending, as the library does.
+
+    Raises:
+        asyncio.TimeoutError: If `wait_for_ui` and no UI appears within 30 s.
+    """
+    peer_id = f"hero-replay-{uuid.uuid4().hex}"
+    async with websockets.connect(url, max_size=None) as websocket:
+        await websocket.send(_announce(peer_id, "online"))
+        if wait_for_ui:
+            await asyncio.wait_for(_wait_for_ui(websocket), _UI_WAIT_TIMEOUT_SECONDS)
+        drain_task = asyncio.ensure_future(_drain(websocket))
+        loop = asyncio.get_running_loop()
+        sent_bytes = 0
+        max_lag = 0.0
+        first_timestamp = messages[0][0] if messages else 0.0
+        started = loop.time()
+        try:
+            for timestamp, message in messages:
+                if speed is not None:
+                    delay = started + (timestamp - first_timestamp) / speed - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    elif -delay > max_lag:
+                        max_lag = -delay
+                await websocket.send(message)
+                sent_bytes += len(message)
+            finished = loop.time()
+            await websocket.send(_announce(peer_id, "offline"))
+        finally:
+            drain_task.cancel()
+    return ReplayResult(replay, len(messages), sent_bytes, finished - started, max_lag)
+
+
+async def run_replays(
+    messages: Sequence[Tuple[float, str]],
+    url: str,
+    speed: Optional[float],
+    concurrency: int,
+    wait_for_ui: bool = False,
+) -> List[ReplayResult]:
+    """Runs `concurrency` replays at once; `{n}` in `url` becomes each replay's number."""
+    return list(await asyncio.gather(*(
+        replay_async(messages, url.replace("{n}", str(n)), speed, n, wait_for_ui)
+        for n in range(concurrency)
+    )))
+
+
+def format_report(results: Sequence[ReplayResult], wall_seconds: float) -> str:
+    """Returns a throughput table for `results`, with a total line."""
+    lines = [f"{'replay':>6} {'messages':>10} {'MiB':>9} {'seconds':>9} {'msgs/sec':>11} {'max lag ms':>11}"]
+    for result in results:
+        lines.append(
+            f"{result.replay:>6} {result.messages:>10,} {result.bytes / 2**20:>9.2f} {result.seconds:>9.2f} "
+            f"{result.messages_per_sec:>11,.0f} {result.max_lag * 1000:>11.1f}"
+        )
+    messages = sum(result.messages for result in results)
+    sent_bytes = sum(result.bytes for result in results)
+    rate = messages / wall_seconds if wall_seconds > 0 else float("inf")
+    lines.append(
+        f"{'total':>6} {messages:>10,} {sent_bytes / 2**20:>9.2f} {wall_seconds:>9.2f} {rate:>11,.0f} "
+        f"{max((result.max_lag for result in results), default=0.0) * 1000:>11.1f}"
+    )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m sidekick.replay",
+        description="Replay a recorded Sidekick session (see sidekick.record()) as a hero peer.",
+    )
+    parser.add_argument("recording", help="Recording file made with sidekick.record().")
+    parser.add_argument("--url", required=True, help="WebSocket URL of the relay or UI; '{n}' becomes the replay number.")
+    parser.add_argument("--speed", default="1x", help="'1x' keeps the recorded timing, '10x' is ten times faster, 'max' sends without pauses.")
+    parser.add_argument("-n", "--concurrency", type=int, default=1, help="Number of replays to run at once.")
+    parser.add_argument("--wait-for-ui", action="store_true", help="Wait for a Sidekick UI to come online before sending.")
+    args = parser.parse_args(argv)
+
+    try:
+        speed = parse_speed(args.speed)
+    except ValueError:
+        parser.error(f"invalid --speed {args.speed!r}; use e.g. '1x', '10x' or 'max'.")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1.")
+
+    try:
+        messages = load_outbound(args.recording)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    print(f"Replaying {len(messages):,} messages x {args.concurrency} to {args.url} (speed: {args.speed}).")
+    started = time.perf_counter()
+    results = asyncio.run(run_replays(messages, args.url, speed, args.concurrency, args.wait_for_ui))
+    print(format_report(results, time.perf_counter() - started))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
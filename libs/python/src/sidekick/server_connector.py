@@ -4,6 +4,8 @@ This module defines the `ServerConnector` class, which is responsible for
 attempting to establish a communication channel with a Sidekick server.
 It implements a prioritized connection strategy:
 
+0. If an in-process CommunicationManager override is installed (used by
+   `sidekick.testing.HeadlessUI`), it connects through that, with no network.
 1. If in a Pyodide environment, it attempts to use the Pyodide-specific bridge.
 2. If a URL has been explicitly set by the user (via `sidekick.set_url()`),
    it attempts to connect directly to that URL.
@@ -39,6 +41,7 @@ from .core import (
 from .core.factories import (
     create_websocket_communication_manager,
     create_pyodide_communication_manager,
+    get_communication_manager_override,
 )
 from .exceptions import SidekickConnectionError, SidekickConnectionRefusedError
 
@@ -203,6 +206,15 @@ class ServerConnector:
         Raises:
             SidekickConnectionError: If all connection attempts fail.
         """
+        # --- Strategy 0: In-Process Override (e.g., sidekick.testing.HeadlessUI) ---
+        if (override_factory := get_communication_manager_override()) is not None:
+            logger.info("CommunicationManager override installed. Connecting in-process.")
+            cm_override = override_factory(self._task_manager)
+            await cm_override.connect_async(message_handler, status_change_handler, error_handler)
+            if not cm_override.is_connected(): # pragma: no cover
+                raise SidekickConnectionError("In-process communication manager did not connect.")
+            return ConnectionResult(communication_manager=cm_override, server_name="In-Process")
+
         # --- Strategy 1: Pyodide Environment ---
         if is_pyodide():
             logger.info("Pyodide environment detected. Initializing Pyodide communication.")
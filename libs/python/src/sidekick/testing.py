@@ -0,0 +1,566 @@
+"""A headless, in-process Sidekick UI for tests and benchmarks.
+
+`HeadlessUI` stands in for the Sidekick UI. It needs no browser and no
+network: it connects to the library as an in-process "sidekick" peer,
+answers the handshake, and applies every spawn, update and remove message
+to an in-memory model of the components, much as the web app would:
+
+*   Grid: `cells`, keyed by `(x, y)`, each a dict with "color" and/or "text".
+*   Console: `text`, everything printed since the last clear.
+*   Canvas: `ops`, the log of drawing and buffer operations received.
+*   Viz: `variables`, the representation tree of each shown variable
+    (`variable(name)` converts it back to plain Python values).
+*   Label, Button, Markdown, Textbox: `text` and `props` (e.g., "value",
+    "placeholder"), kept up to date by their set* updates.
+*   Row, Column and every other component: `parent` and `children`.
+
+It can also send UI events, such as clicks and submits, to the script:
+
+    >>> from sidekick.testing import HeadlessUI
+    >>> with HeadlessUI() as ui:
+    ...     button = sidekick.Button("Go", instance_id="go")
+    ...     label = sidekick.Label("Idle", instance_id="status")
+    ...     button.on_click(lambda event: setattr(label, "text", "Running"))
+    ...     ui.click("go")
+    ...     ui.flush()
+    ...     assert ui.component("status").text == "Running"
+
+Sidekick has one connection per process, so only one `HeadlessUI` can be
+active at a time. Stopping it shuts the connection down; components created
+during the session must not be used afterwards.
+"""
+
+import gc
+import inspect
+import itertools
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import _version
+from . import connection
+from . import logger
+from .core import CommunicationManager, CoreConnectionStatus, CoreDisconnectedError, TaskManager
+from .core.factories import get_communication_manager_override, set_communication_manager_override
+
+_ROOT_ID = "root"
+_HEADLESS_PEER_ID = "sidekick-headless"
+# Outgoing messages with this component are flush markers, never applied to the model.
+_FLUSH_COMPONENT = "headless"
+
+
+@dataclass
+class HeadlessComponent:
+    """The state of one component as the headless UI sees it.
+
+    Attributes:
+        instance_id (str): The component's instance ID.
+        component_type (str): E.g., "grid", "console", "canvas" or "viz".
+        props (Dict[str, Any]): The spawn payload, updated by set* actions.
+        parent (str): The parent container's ID, or "root".
+        children (List[str]): IDs of the child components, in order.
+        text (str): Console output, or the text of a Label, Button or Markdown.
+        cells (Dict[Tuple[int, int], Dict[str, Any]]): Grid cells that have
+            a color or text.
+        ops (List[Dict[str, Any]]): Canvas operations, each with "action" and "options".
+        variables (Dict[str, Any]): Viz representation trees by variable name.
+        updates (List[Dict[str, Any]]): Every update payload received, in order.
+    """
+    instance_id: str
+    component_type: str
+    props: Dict[str, Any] = field(default_factory=dict)
+    parent: str = _ROOT_ID
+    children: List[str] = field(default_factory=list)
+    text: str = ""
+    cells: Dict[Tuple[int, int], Dict[str, Any]] = field(default_factory=dict)
+    ops: List[Dict[str, Any]] = field(default_factory=list)
+    variables: Dict[str, Any] = field(default_factory=dict)
+    updates: List[Dict[str, Any]] = field(default_factory=list)
+
+    def cell(self, x: int, y: int) -> Dict[str, Any]:
+        """Returns the color and text of a grid cell (empty dict if cleared)."""
+        return self.cells.get((x, y), {})
+
+    def variable(self, name: str) -> Any:
+        """Returns a shown Viz variable converted back to plain Python values.
+
+        Lists, tuples and sets become lists, dicts become dicts, objects become
+        dicts of their attributes, and other values are returned as displayed.
+
+        Raises:
+            KeyError: If no variable `name` is shown.
+        """
+        return _plain_value(self.variables[name])
+
+
+class _InProcessCommunicationManager(CommunicationManager):
+    """Connects the library directly to a `HeadlessUI`. (Internal)."""
+
+    def __init__(self, ui: 'HeadlessUI', task_manager: TaskManager):
+        self._ui = ui
+        self._task_manager = task_manager
+        self._status = CoreConnectionStatus.DISCONNECTED
+        self._message_handler: Optional[Callable[[str], Any]] = None
+        self._status_change_handler: Optional[Callable[[CoreConnectionStatus], Any]] = None
+
+    async def connect_async(self, message_handler=None, status_change_handler=None, error_handler=None) -> None:
+        self._message_handler = message_handler
+        self._status_change_handler = status_change_handler
+        self._ui._attach(self)
+        await self._set_status(CoreConnectionStatus.CONNECTED)
+
+    async def close_async(self) -> None:
+        if self._status == CoreConnectionStatus.DISCONNECTED:
+            return
+        self._ui._detach(self)
+        await self._set_status(CoreConnectionStatus.DISCONNECTED)
+        self._message_handler = None
+
+    async def send_message_async(self, message_str: str) -> None:
+        if self._status != CoreConnectionStatus.CONNECTED:
+            raise CoreDisconnectedError("Headless UI is not connected.", reason=f"Current status: {self._status.name}")
+        self._ui._receive(message_str)
+
+    def is_connected(self) -> bool:
+        return self._status == CoreConnectionStatus.CONNECTED
+
+    def get_current_status(self) -> CoreConnectionStatus:
+        return self._status
+
+    def deliver(self, message_str: str) -> None:
+        """Hands a message from the UI to the library, on its event loop. Thread-safe."""
+        handler = self._message_handler
+        if handler is None:
+            raise CoreDisconnectedError("Headless UI is not connected.")
+        self._task_manager.get_loop().call_soon_threadsafe(handler, message_str)
+
+    async def _set_status(self, status: CoreConnectionStatus) -> None:
+        self._status = status
+        if self._status_change_handler:
+            result = self._status_change_handler(status)
+            if inspect.isawaitable(result):
+                await result
+
+
+class HeadlessUI:
+    """An in-process Sidekick UI that keeps its components in memory.
+
+    Use it as a context manager (or call `start()` and `stop()`). While it is
+    active, the library connects to it instead of any Sidekick server.
+
+    Messages from the script are applied on Sidekick's event loop thread. Call
+    `flush()` before inspecting the model to wait until everything sent so
+    far has been applied, or `wait_for()` to wait for a condition.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._cm: Optional[_InProcessCommunicationManager] = None
+        self._flush_tokens = itertools.count(1)
+        self._flushed = 0
+        self.components: Dict[str, HeadlessComponent] = {}
+        self.root: List[str] = []
+        self.messages: List[Dict[str, Any]] = []
+        self.hero_online = False
+
+    # --- Lifecycle ---
+
+    def start(self) -> 'HeadlessUI':
+        """Makes the library connect to this UI from now on.
+
+        Raises:
+            RuntimeError: If another in-process UI is already active.
+        """
+        if get_communication_manager_override() is not None:
+            raise RuntimeError("Another HeadlessUI (or in-process transport) is already active.")
+        connection._discard_service_instance() # Start from a fresh, unconnected service
+        set_communication_manager_override(lambda task_manager: _InProcessCommunicationManager(self, task_manager))
+        return self
+
+    def stop(self) -> None:
+        """Shuts the Sidekick connection down and stops intercepting it."""
+        try:
+            connection._discard_service_instance()
+            # Collect this session's components now: a later `__del__` would
+            # unregister a handler of the next session's component with the same ID.
+            gc.collect()
+        finally:
+            set_communication_manager_override(None)
+
+    def __enter__(self) -> 'HeadlessUI':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # --- Reading the model ---
+
+    def component(self, instance_id: str) -> HeadlessComponent:
+        """Returns the component with `instance_id`.
+
+        Raises:
+            KeyError: If no such component exists in the UI.
+        """
+        with self._condition:
+            return self.components[instance_id]
+
+    def find(self, component_type: str) -> List[HeadlessComponent]:
+        """Returns all components of `component_type` (e.g., "button"), in creation order."""
+        with self._condition:
+            return [c for c in self.components.values() if c.component_type == component_type]
+
+    def wait_for(self, predicate: Callable[['HeadlessUI'], bool], timeout: float = 5.0) -> None:
+        """Blocks until `predicate(ui)` is true.
+
+        Raises:
+            TimeoutError: If it is still false after `timeout` seconds.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: predicate(self), timeout):
+                raise TimeoutError(f"Headless UI condition not met within {timeout}s.")
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Blocks until every message the script has sent so far has been applied.
+
+        Callbacks run inline on the event loop (the default) are covered too,
+        if their event was injected before this call. Callbacks running in
+        worker threads or as async tasks may still be sending afterwards.
+
+        Raises:
+            TimeoutError: If the messages are not applied within `timeout` seconds.
+        """
+        token = next(self._flush_tokens)
+        connection.send_message({"id": 0, "component": _FLUSH_COMPONENT, "type": "flush", "payload": {"token": token}})
+        self.wait_for(lambda ui: ui._flushed >= token, timeout)
+
+    # --- Sending UI events ---
+
+    def click(self, instance_id: str, x: Optional[int] = None, y: Optional[int] = None) -> None:
+        """Clicks a Button, or a Grid cell / Canvas position at (`x`, `y`)."""
+        payload: Dict[str, Any] = {} if x is None and y is None else {"x": x, "y": y}
+        self.send_event(instance_id, "click", **payload)
+
+    def submit(self, instance_id: str, value: str) -> None:
+        """Submits `value` from a Textbox or a Console input."""
+        self.send_event(instance_id, "submit", value=value)
+
+    def send_event(self, instance_id: str, event: str, **payload: Any) -> None:
+        """Sends any UI event (e.g., "pointerMove" with `points`) from a component.
+
+        Raises:
+            KeyError: If no such component exists in the UI.
+            CoreDisconnectedError: If the library is not connected.
+        """
+        with self._condition:
+            component_type = self.components[instance_id].component_type
+            cm = self._cm
+        if cm is None:
+            raise CoreDisconnectedError("Headless UI is not connected.")
+        cm.deliver(json.dumps({
+            "id": 0, "component": component_type, "type": "event", "src": instance_id,
+            "payload": {"event": event, **payload},
+        }))
+
+    # --- Transport callbacks (event loop thread) ---
+
+    def _attach(self, cm: _InProcessCommunicationManager) -> None:
+        with self._condition:
+            self._cm = cm
+
+    def _detach(self, cm: _InProcessCommunicationManager) -> None:
+        with self._condition:
+            if self._cm is cm:
+                self._cm = None
+            self.hero_online = False
+            self._condition.notify_all()
+
+    def _receive(self, message_str: str) -> None:
+        message = json.loads(message_str)
+        with self._condition:
+            if message.get("component") == _FLUSH_COMPONENT:
+                self._flushed = max(self._flushed, message["payload"]["token"])
+            else:
+                self.messages.append(message)
+                self._apply(message)
+            self._condition.notify_all()
+
+    # --- Model ---
+
+    def _apply(self, message: Dict[str, Any]) -> None:
+        """Applies one message from the script to the model. (Internal)."""
+        component_type, msg_type = message.get("component"), message.get("type")
+        payload = message.get("payload") or {}
+        if component_type == "system" and msg_type == "announce":
+            if payload.get("role") == "hero":
+                self.hero_online = payload.get("status") == "online"
+                if self.hero_online:
+                    self._announce_online()
+        elif component_type == "global" and msg_type == "clearAll":
+            self.components.clear()
+            self.root.clear()
+        elif msg_type == "spawn":
+            self._spawn(message.get("target"), component_type, payload)
+        elif msg_type == "remove":
+            self._remove(message.get("target"))
+        elif msg_type == "update":
+            component = self.components.get(message.get("target"))
+            if component is None:
+                logger.warning(f"HeadlessUI: Update for unknown component '{message.get('target')}' ignored.")
+                return
+            component.updates.append(payload)
+            self._update(component, payload)
+
+    def _announce_online(self) -> None:
+        if self._cm is not None:
+            self._cm.deliver(json.dumps({
+                "id": 0, "component": "system", "type": "announce",
+                "payload": {"peerId": _HEADLESS_PEER_ID, "role": "sidekick", "status": "online",
+                            "version": _version.__version__, "timestamp": 0},
+            }))
+
+    def _children_of(self, parent_id: str) -> Optional[List[str]]:
+        if parent_id == _ROOT_ID:
+            return self.root
+        parent = self.components.get(parent_id)
+        return parent.children if parent is not None else None
+
+    def _spawn(self, instance_id: str, component_type: str, payload: Dict[str, Any]) -> None:
+        if instance_id in self.components:
+            logger.warning(f"HeadlessUI: Component '{instance_id}' spawned twice; keeping the first.")
+            return
+        props = dict(payload)
+        parent_id = props.pop("parent", None) or _ROOT_ID
+        siblings = self._children_of(parent_id)
+        if siblings is None:
+            logger.warning(f"HeadlessUI: Parent '{parent_id}' of '{instance_id}' not found; adding it to the root.")
+            parent_id, siblings = _ROOT_ID, self.root
+        component = HeadlessComponent(instance_id, component_type, props, parent_id)
+        if isinstance(props.get("text"), str):
+            component.text = props["text"]
+        self.components[instance_id] = component
+        siblings.append(instance_id)
+
+    def _remove(self, instance_id: str) -> None:
+        component = self.components.pop(instance_id, None)
+        if component is None:
+            return
+        siblings = self._children_of(component.parent)
+        if siblings is not None and instance_id in siblings:
+            siblings.remove(instance_id)
+        for child_id in list(component.children):
+            self._remove(child_id)
+
+    def _update(self, component: HeadlessComponent, payload: Dict[str, Any]) -> None:
+        action = payload.get("action")
+        options = payload.get("options") or {}
+        if action == "changeParent":
+            self._change_parent(component, options.get("parent") or _ROOT_ID)
+        elif component.component_type == "grid":
+            _apply_grid_update(component, action, options)
+        elif component.component_type == "console":
+            if action == "append":
+                component.text += options.get("text", "")
+            elif action == "clear":
+                component.text = ""
+        elif component.component_type == "canvas":
+            component.ops.append({"action": action, "options": options})
+        elif component.component_type == "viz":
+            _apply_viz_update(component, action, payload.get("variableName"), options)
+        elif isinstance(action, str) and action.startswith("set"):
+            component.props.update(options)
+            if isinstance(options.get("text"), str):
+                component.text = options["text"]
+
+    def _change_parent(self, component: HeadlessComponent, parent_id: str) -> None:
+        new_siblings = self._children_of(parent_id)
+        if new_siblings is None or parent_id == component.parent:
+            return
+        old_siblings = self._children_of(component.parent)
+        if old_siblings is not None and component.instance_id in old_siblings:
+            old_siblings.remove(component.instance_id)
+        new_siblings.append(component.instance_id)
+        component.parent = parent_id
+
+
+def _apply_grid_update(component: HeadlessComponent, action: Any, options: Dict[str, Any]) -> None:
+    """Applies a Grid update to its cells. (Internal)."""
+    if action == "clear":
+        component.cells.clear()
+        return
+    key = (options.get("x"), options.get("y"))
+    if action == "clearCell":
+        component.cells.pop(key, None)
+        return
+    field_name = {"setColor": "color", "setText": "text"}.get(action)
+    if field_name is None:
+        return
+    cell = component.cells.setdefault(key, {})
+    value = options.get(field_name)
+    if value is None:
+        cell.pop(field_name, None)
+    else:
+        cell[field_name] = value
+    if not cell:
+        del component.cells[key]
+
+
+# --- Viz representation trees (mirrors webapp/src/components/viz/vizLogic.ts) ---
+
+def _node_kind(node: Dict[str, Any]) -> str:
+    node_type = node.get("type", "")
+    if node_type.startswith("object"):
+        return "object"
+    if node_type.startswith("repr"):
+        return "repr"
+    return node_type
+
+
+def _key_matches(pair: Dict[str, Any], segment: Any) -> bool:
+    key = pair.get("key") or {}
+    return key.get("value") == segment or key.get("id") == str(segment)
+
+
+def _find_node(root: Any, path: List[Any]) -> Any:
+    """Returns the node at `path` under `root`, or None. (Internal)."""
+    node = root
+    for segment in path:
+        if not isinstance(node, dict) or "type" not in node:
+            return None
+        kind = _node_kind(node)
+        if kind in ("list", "set"):
+            index = segment - node.get("pageOffset", 0) if isinstance(segment, int) else None
+            if index is None or not 0 <= index < len(node["value"]):
+                return None
+            node = node["value"][index]
+        elif kind == "dict":
+            node = next((pair.get("value") for pair in node["value"] if _key_matches(pair, segment)), None)
+        elif kind in ("object", "repr") and isinstance(node.get("value"), dict):
+            node = node["value"].get(segment)
+        else:
+            return None
+    return node
+
+
+def _apply_viz_update(component: HeadlessComponent, action: Any, name: Any, options: Dict[str, Any]) -> None:
+    """Applies a Viz update to its variables, like the web app does. (Internal)."""
+    variables = component.variables
+    path = options.get("path") or []
+    if action == "removeVariable":
+        variables.pop(name, None)
+    elif name not in variables:
+        if action == "set" and not path and options.get("valueRepresentation"):
+            variables[name] = options["valueRepresentation"]
+        else:
+            logger.warning(f"HeadlessUI: Viz action '{action}' for unknown variable '{name}' ignored.")
+    elif action == "setPage":
+        node, page = _find_node(variables[name], path), options.get("valueRepresentation")
+        if isinstance(node, dict) and page:
+            node["value"] = page.get("value")
+            node["length"] = options.get("length", page.get("length"))
+            node["pageOffset"] = page.get("pageOffset")
+            node["pageLimit"] = page.get("pageLimit")
+    elif action == "batch":
+        for operation in options.get("operations") or []:
+            operation_options = operation.get("options") or {}
+            _modify_viz_variable(variables, name, operation.get("action"), operation_options.get("path") or [], operation_options)
+    else:
+        _modify_viz_variable(variables, name, action, path, options)
+
+
+def _modify_viz_variable(variables: Dict[str, Any], name: str, action: Any, path: List[Any], options: Dict[str, Any]) -> None:
+    """Applies one granular change to a Viz variable; failures are logged and skipped. (Internal)."""
+    value = options.get("valueRepresentation")
+    key = options.get("keyRepresentation")
+    length = options.get("length")
+    if not path:
+        parent, segment = variables[name], None
+    else:
+        parent, segment = _find_node(variables[name], path[:-1]), path[-1]
+    if not isinstance(parent, dict):
+        logger.warning(f"HeadlessUI: Viz path {path} not found in variable '{name}'.")
+        return
+    kind = _node_kind(parent)
+    items = parent.get("value")
+    if kind == "list" and isinstance(segment, int):
+        segment -= parent.get("pageOffset", 0)
+
+    def resize(default_delta: int) -> None:
+        parent["length"] = length if length is not None else (parent.get("length") or 0) + default_delta
+
+    try:
+        if action == "set" and not path:
+            variables[name] = value
+        elif action in ("set", "setitem"):
+            if kind == "list":
+                if segment == len(items):
+                    items.append(value)
+                else:
+                    items[segment] = value
+            elif kind == "dict":
+                pair = next((pair for pair in items if _key_matches(pair, segment)), None)
+                if pair is not None:
+                    pair["value"] = value
+                else:
+                    items.append({"key": key, "value": value})
+                    resize(1)
+                    return
+            elif kind == "object":
+                items[segment] = value
+            else:
+                raise ValueError(f"cannot set an item of a '{parent.get('type')}'")
+            if length is not None:
+                parent["length"] = length
+        elif action == "append" and kind == "list":
+            items.append(value)
+            resize(1)
+        elif action == "insert" and kind == "list":
+            items.insert(segment, value)
+            resize(1)
+        elif action in ("pop", "remove", "delitem"):
+            if kind == "list":
+                del items[segment]
+                resize(-1)
+            elif kind == "dict":
+                remaining = [pair for pair in items if not _key_matches(pair, segment)]
+                if len(remaining) < len(items):
+                    parent["value"] = remaining
+                    resize(-1)
+            elif kind == "object":
+                items.pop(segment, None)
+            else:
+                raise ValueError(f"cannot remove an item from a '{parent.get('type')}'")
+        elif action == "add_set" and kind == "set":
+            if not any(item.get("id") == value.get("id") for item in items):
+                items.append(value)
+                resize(1)
+        elif action == "discard_set" and kind == "set":
+            remaining = [item for item in items if item.get("id") != value.get("id")]
+            if len(remaining) < len(items):
+                parent["value"] = remaining
+                resize(-1)
+        elif action == "clear":
+            parent["value"] = {} if kind == "object" else []
+            parent["length"] = 0
+        else:
+            raise ValueError(f"unsupported for a '{parent.get('type')}'")
+    except (IndexError, KeyError, TypeError, ValueError, AttributeError) as e:
+        logger.warning(f"HeadlessUI: Viz action '{action}' at {path} in variable '{name}' failed: {e}")
+
+
+def _plain_value(node: Any) -> Any:
+    """Converts a Viz representation back to plain Python values. (Internal)."""
+    if not isinstance(node, dict) or "type" not in node:
+        return node
+    kind = _node_kind(node)
+    if kind in ("list", "set"):
+        return [_plain_value(item) for item in node["value"]]
+    if kind == "dict":
+        result = {}
+        for pair in node["value"]:
+            key = _plain_value(pair.get("key"))
+            result[key if isinstance(key, (str, int, float, bool, type(None))) else repr(key)] = _plain_value(pair.get("value"))
+        return result
+    if kind == "object" and isinstance(node.get("value"), dict):
+        return {attribute: _plain_value(value) for attribute, value in node["value"].items()}
+    return node.get("value")
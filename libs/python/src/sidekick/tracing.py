@@ -0,0 +1,138 @@
+"""Optional tracing of Sidekick's work, for correlating events end to end.
+
+When a tracer is installed, Sidekick opens a span around each piece of work
+along the path of an interaction:
+
+*   `sidekick.inbound_dispatch`: parsing and routing a message from the UI.
+*   `sidekick.callback`: running a user callback (e.g., `on_click`).
+*   `sidekick.send_command`: a component scheduling a command for the UI.
+*   `sidekick.send`: the master loop putting that command on the wire. Its
+    parent is the `sidekick.send_command` span, even though it runs later
+    and in another task.
+
+So a slow button click shows up as one trace containing the handler and
+the updates it caused. Tracing is off by default and then costs one function
+call per span site.
+
+To export spans with OpenTelemetry (requires `pip install opentelemetry-api`
+and a configured SDK):
+
+    >>> from sidekick.tracing import OpenTelemetryTracer
+    >>> sidekick.set_tracer(OpenTelemetryTracer())
+
+Other tracing systems can be plugged in by subclassing `Tracer`.
+"""
+
+from typing import Any, ContextManager, Dict, Optional
+
+from . import _version
+from . import logger
+
+
+class _NoSpan:
+    """A reusable context manager that does nothing. (Internal)."""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """Interface for receiving Sidekick's spans.
+
+    Subclass this and pass an instance to `sidekick.set_tracer()`. Methods
+    may be called from the event loop thread and from user threads.
+    """
+
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Any = None,
+    ) -> ContextManager[Any]:
+        """Returns a context manager that opens a span named `name` and closes it on exit.
+
+        Args:
+            name (str): The span name, e.g., "sidekick.callback".
+            attributes (Optional[Dict[str, Any]]): Attributes with str, int,
+                float or bool values.
+            parent (Any): A context returned by `capture_context()` to use as
+                the span's parent, or None for the current context.
+        """
+        return _NO_SPAN
+
+    def capture_context(self) -> Any:
+        """Returns the current trace context, to parent spans started elsewhere later."""
+        return None
+
+
+class OpenTelemetryTracer(Tracer):
+    """Reports Sidekick's spans through the OpenTelemetry API.
+
+    Args:
+        tracer_provider (Any): An OpenTelemetry `TracerProvider`. Defaults to
+            the globally configured one.
+
+    Raises:
+        ImportError: If the `opentelemetry-api` package is not installed.
+    """
+
+    def __init__(self, tracer_provider: Any = None):
+        try:
+            from opentelemetry import context, trace # type: ignore[import-not-found]
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryTracer requires the 'opentelemetry-api' package. "
+                "Install it with: pip install opentelemetry-api"
+            ) from e
+        self._context = context
+        self._tracer = trace.get_tracer("sidekick", _version.__version__, tracer_provider=tracer_provider)
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None, parent: Any = None) -> ContextManager[Any]:
+        return self._tracer.start_as_current_span(name, context=parent, attributes=attributes)
+
+    def capture_context(self) -> Any:
+        return self._context.get_current()
+
+
+_tracer: Optional[Tracer] = None
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Installs a tracer for Sidekick's spans, or removes it with None.
+
+    Args:
+        tracer (Optional[Tracer]): The tracer, e.g., `OpenTelemetryTracer()`.
+
+    Raises:
+        TypeError: If `tracer` is not a `Tracer` or None.
+    """
+    global _tracer
+    if tracer is not None and not isinstance(tracer, Tracer):
+        raise TypeError("tracer must be a sidekick.Tracer instance or None.")
+    _tracer = tracer
+    logger.info(f"Sidekick tracing {'enabled with ' + type(tracer).__name__ if tracer else 'disabled'}.")
+
+
+def is_enabled() -> bool:
+    """Returns True if a tracer is installed. (Internal)."""
+    return _tracer is not None
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None, parent: Any = None) -> ContextManager[Any]:
+    """Opens a span with the installed tracer, or does nothing without one. (Internal)."""
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.start_span(name, attributes, parent)
+
+
+def capture_context() -> Any:
+    """Returns the installed tracer's current context, or None. (Internal)."""
+    tracer = _tracer
+    return tracer.capture_context() if tracer is not None else None
@@ -24,6 +24,15 @@ Key Features:
 *   **Clear Display:** Handle large collections and deep nesting by truncating the
     display automatically. Detect and visualize recursive references to prevent
     infinite loops.
+*   **Array and DataFrame Summaries:** NumPy arrays and pandas DataFrames are
+    shown as compact summaries (shape, dtype/schema, statistics and a preview)
+    instead of their raw attributes. NumPy and pandas are never imported by
+    Sidekick itself.
+*   **Custom Display:** Register how your own types are shown with
+    `sidekick.viz.register_repr(MyType, func)`.
+*   **Paging:** Lists, dicts and sets longer than one page can be browsed page by
+    page in the UI. Only the requested window is serialized and sent, so even
+    very large collections stay responsive.
 *   **Variable Removal:** Remove variables from the display when they are no longer
     needed using `remove_variable()`.
 
@@ -44,23 +53,214 @@ Reactive Usage with a Parent Container:
 """
 
 import functools
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
 from typing import Any, Dict, Optional, List, Union, Callable, Set, Tuple, Coroutine
 from . import logger
+from . import profiler
 from .component import Component
 from .events import ErrorEvent
-from .observable_value import ObservableValue, UnsubscribeFunction
+from .observable_value import DeliveryPolicy, ObservableValue, UnsubscribeFunction
 
 # Constants for controlling the depth and item count in the representation.
 # These help prevent excessively large messages and UI overload.
 _MAX_DEPTH = 5    # Maximum recursion depth when visualizing nested structures.
 _MAX_ITEMS = 50   # Maximum number of items (list elements, dict entries, set items, object attributes)
                   # to show before truncating.
+_MAX_PAGE_ITEMS = 500 # Upper bound for the 'limit' of a page requested by the UI.
+_MAX_DIFF_PATCHES = 50 # Above this many granular patches, re-sending the whole variable is cheaper.
+_DIFFABLE_KEY_TYPES = ('str', 'int', 'float', 'bool') # Dict keys the UI can address by value in a path.
+_CACHE_MIN_ITEMS = 8          # Smaller tuples are cheaper to rebuild than to look up and store.
+_CACHE_MAX_NODES = 200_000    # Memory budget of the representation cache, in nodes and retained objects.
+_CACHE_MAX_REJECTED = 4096    # Tuples remembered as not cacheable, so they aren't re-checked on every call.
+
+_IMMUTABLE_SCALARS = (str, int, float, bool, bytes, type(None))
+
+
+def _immutable_size(data: Any) -> Optional[int]:
+    """Counts the objects in a value that can never change, or returns None if it could. (Internal).
+
+    Only scalars and tuples made of them qualify; a tuple holding a list or a
+    custom object could still change its representation later.
+    """
+    if isinstance(data, _IMMUTABLE_SCALARS):
+        return 1
+    if type(data) is not tuple:
+        return None
+    total = 1
+    for item in data:
+        size = _immutable_size(item)
+        if size is None:
+            return None
+        total += size
+    return total
+
+
+def _count_nodes(rep: Dict[str, Any]) -> int:
+    """Counts the nodes of a representation, as a cheap estimate of its memory size. (Internal)."""
+    value = rep.get('value')
+    if isinstance(value, list):
+        return 1 + sum(
+            _count_nodes(item['key']) + _count_nodes(item['value']) if 'key' in item else _count_nodes(item)
+            for item in value
+        )
+    if isinstance(value, dict):
+        return 1 + sum(_count_nodes(attr_rep) for attr_rep in value.values())
+    return 1
+
+
+class _RepresentationCache:
+    """LRU cache of representations of deeply immutable tuples. (Internal).
+
+    Entries are keyed on `(id(obj), depth)` because node IDs and depth
+    truncation both depend on the depth. Tuples cannot be weakly referenced,
+    so each entry keeps a strong reference to its object; this keeps the
+    `id()` from being reused by another object while the entry exists, and
+    together with deep immutability means a cached representation never goes
+    stale. An entry's size counts both its representation nodes and the
+    objects it keeps alive, and entries are evicted least recently used first
+    once the total size exceeds `max_nodes`.
+
+    Tuples that turned out not to be cacheable (holding a mutable object, or
+    too large) are remembered by `id()` in a bounded LRU set, so they are not
+    walked again on every call. A reused `id()` can only cause a missed
+    cache opportunity, never a stale result.
+
+    Cached representations are shared, so callers must not mutate them.
+    """
+    def __init__(self, max_nodes: int = _CACHE_MAX_NODES, max_rejected: int = _CACHE_MAX_REJECTED):
+        self._max_nodes = max_nodes
+        self._max_rejected = max_rejected
+        self._entries: 'OrderedDict[Tuple[int, int], Tuple[Any, Dict[str, Any], int]]' = OrderedDict()
+        self._rejected: 'OrderedDict[int, None]' = OrderedDict()
+        self._total_nodes = 0
+        self._lock = threading.Lock()
+
+    def is_rejected(self, data: Any) -> bool:
+        return id(data) in self._rejected
+
+    def get(self, data: Any, depth: int) -> Optional[Dict[str, Any]]:
+        key = (id(data), depth)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not data:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, data: Any, depth: int, rep: Dict[str, Any]):
+        """Caches `rep` if `data` is deeply immutable and fits, or remembers that it can't be cached."""
+        retained = _immutable_size(data)
+        size = _count_nodes(rep) + retained if retained is not None else None
+        if size is None or size > self._max_nodes:
+            with self._lock:
+                self._rejected[id(data)] = None
+                self._rejected.move_to_end(id(data))
+                if len(self._rejected) > self._max_rejected:
+                    self._rejected.popitem(last=False)
+            return
+        key = (id(data), depth)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_nodes -= previous[2]
+            self._entries[key] = (data, rep, size)
+            self._total_nodes += size
+            while self._total_nodes > self._max_nodes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._total_nodes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._rejected.clear()
+            self._total_nodes = 0
+
+
+_representation_cache = _RepresentationCache()
+
+
+def _ordered_mapping_items(data: Dict[Any, Any]) -> List[Tuple[Any, Any]]:
+    """Returns the (key, value) pairs of a mapping in display order. (Internal).
+
+    Small mappings (that fit in a single page) are sorted by `repr(key)` for a
+    consistent display. Larger mappings keep their native iteration order so
+    that every page window is cut from the same, cheaply reproducible sequence.
+    """
+    if len(data) > _MAX_ITEMS:
+        return list(data.items())
+    try:
+        # Create (repr(key), key, value) tuples for sorting
+        items_to_sort = [(repr(k), k, v) for k, v in data.items()]
+        sorted_items = sorted(items_to_sort) # Sort by repr(key)
+        return [(k, v) for _, k, v in sorted_items] # Extract (key, value)
+    except Exception as sort_err:
+        # If sorting fails (e.g., uncomparable key reprs), fall back to original order.
+        logger.debug(
+            f"Could not sort dict keys for {type(data).__name__} (id: {id(data)}): {sort_err}. "
+            f"Using original item order."
+        )
+        return list(data.items())
+
+
+def _ordered_set_items(data: Set[Any]) -> List[Any]:
+    """Returns the items of a set in display order. (Internal).
+
+    Follows the same rule as `_ordered_mapping_items`: sorted by `repr(item)`
+    when the set fits in a single page, native iteration order otherwise.
+    """
+    if len(data) > _MAX_ITEMS:
+        return list(data)
+    try:
+        items_to_sort = [(repr(item), item) for item in data]
+        sorted_items = sorted(items_to_sort)
+        return [item for _, item in sorted_items]
+    except Exception as sort_err:
+        # If sorting fails, fall back to an arbitrary (but still iterated) order.
+        logger.debug(
+            f"Could not sort set items for {type(data).__name__} (id: {id(data)}): {sort_err}. "
+            f"Using original iteration order."
+        )
+        return list(data) # Convert set to list for iteration
+
+
+def _window(data: Any, offset: int, limit: int) -> List[Any]:
+    """Slices the items in `[offset, offset + limit)` out of a container. (Internal).
+
+    Lists and tuples are sliced directly. Dicts (as `(key, value)` pairs) and
+    sets are windowed over their display order. Only the items inside the
+    window are materialized for large containers. A page of a list or tuple
+    costs O(limit); a page of a large dict or set costs O(offset + limit),
+    since reaching the offset means iterating past the items before it.
+    """
+    if isinstance(data, (list, tuple)):
+        return list(data[offset:offset + limit])
+    if isinstance(data, dict):
+        if len(data) > _MAX_ITEMS:
+            return list(itertools.islice(data.items(), offset, offset + limit))
+        return _ordered_mapping_items(data)[offset:offset + limit]
+    if isinstance(data, set):
+        if len(data) > _MAX_ITEMS:
+            return list(itertools.islice(data, offset, offset + limit))
+        return _ordered_set_items(data)[offset:offset + limit]
+    return []
+
+
+def _truncation_message(total: int, offset: int, shown: int) -> str:
+    """Builds the text of the placeholder node added to a truncated window. (Internal)."""
+    if offset == 0:
+        return f'... ({total} items total, showing first {shown})'
+    return f'... ({total} items total, showing {offset}-{offset + shown - 1})'
 
 
 def _get_representation(
     data: Any,
     depth: int = 0,
-    visited_ids: Optional[Set[int]] = None # Set of id(obj) to detect recursion
+    visited_ids: Optional[Set[int]] = None, # Set of id(obj) to detect recursion
+    offset: int = 0,
+    limit: int = _MAX_ITEMS
 ) -> Dict[str, Any]:
     """Converts Python data into a structured dictionary for the Viz UI. (Internal).
 
@@ -69,13 +269,21 @@ def _get_representation(
     serialized to JSON and then interpreted by the Sidekick Viz frontend component
     to render the interactive tree view.
 
-    It handles:
+    The node for `data` itself is built by the handler registered for the most
+    specific class in its MRO (see `_TYPE_HANDLERS` and `register_repr`). The
+    built-in handlers cover:
     - Basic types (int, str, float, bool, None).
-    - Collections (list, tuple, dict, set), including truncation (`_MAX_ITEMS`).
+    - Collections (list, tuple, dict, set), including truncation (`_MAX_ITEMS`)
+      and paged windows (`offset`/`limit`).
     - `ObservableValue` instances by unwrapping them and marking them.
+    - NumPy arrays and pandas DataFrames, as compact summaries.
     - Custom objects by inspecting their non-callable, non-private attributes.
+
+    This function itself takes care of:
     - Recursion detection to prevent infinite loops (`visited_ids`).
     - Depth limiting to prevent overly deep traversals (`_MAX_DEPTH`).
+    - Reuse of cached representations for large, deeply immutable tuples
+      (`_representation_cache`). Cached results are shared; do not mutate them.
 
     Args:
         data (Any): The Python data to represent.
@@ -83,6 +291,10 @@ def _get_representation(
         visited_ids (Optional[Set[int]]): A set containing the `id()` of objects
             already visited in the current branch of the traversal. This is crucial
             for detecting and correctly representing circular references.
+        offset (int): Index of the first item to include if `data` is a list,
+            tuple, dict or set. Only applies to `data` itself; nested
+            containers always start at their first item.
+        limit (int): Maximum number of items to include from `offset` onwards.
 
     Returns:
         Dict[str, Any]: A dictionary representing the data's structure and value,
@@ -90,12 +302,24 @@ def _get_representation(
             'type' (e.g., "list", "dict", "object (ClassName)", "truncated"),
             'value' (the actual data or a representation of it),
             'id' (a unique string for this node in the tree, for UI state),
-            'length' (for collections), and 'observableTracked' (boolean).
+            'length' (for collections), 'observableTracked' (boolean), and
+            'pageOffset'/'pageLimit' (for collections that do not fit in one page).
     """
     # Initialize visited_ids for the top-level call.
     if visited_ids is None:
         visited_ids = set()
 
+    # Large immutable tuples (e.g., shared constant tables) are only walked once.
+    cacheable = (
+        type(data) is tuple and len(data) >= _CACHE_MIN_ITEMS
+        and offset == 0 and limit == _MAX_ITEMS and depth <= _MAX_DEPTH
+        and not _representation_cache.is_rejected(data)
+    )
+    if cacheable:
+        cached_rep = _representation_cache.get(data, depth)
+        if cached_rep is not None:
+            return cached_rep
+
     current_id = id(data) # Get memory address for recursion detection and unique ID generation.
 
     # --- Termination Conditions for Recursion ---
@@ -112,188 +336,27 @@ def _get_representation(
             'id': f'rec_{current_id}_{depth}' # Unique ID for this recursive reference node
         }
 
-    # --- Basic Setup for Representation Dictionary ---
-    rep: Dict[str, Any] = {}
-    data_type_name = type(data).__name__
-    # Generate a unique ID for this node in the Viz tree.
-    # Combines type, memory ID, and depth to help ensure uniqueness.
-    rep['id'] = f"{data_type_name}_{current_id}_{depth}"
-    rep['type'] = data_type_name # Store the Python type name
-    rep['observableTracked'] = False # Default, can be overridden for ObservableValues
-
     try:
         # Add current object's ID to visited set before recursing into its children/attributes.
         visited_ids.add(current_id)
-
-        # --- Type-Specific Representation Logic ---
-
-        if isinstance(data, ObservableValue):
-            # If data is an ObservableValue, get its underlying value and represent that.
-            # Mark it as 'observableTracked' so the UI can treat it specially.
-            internal_value = data.get()
-            # Recursively get representation of the internal value.
-            # Pass a *copy* of visited_ids to ensure siblings don't interfere with recursion detection.
-            nested_rep = _get_representation(internal_value, depth, visited_ids.copy())
-            nested_rep['observableTracked'] = True
-            # Use the ObservableValue's own stable ID if available, for better UI state persistence.
-            obs_id = getattr(data, '_obs_value_id', None)
-            nested_rep['id'] = obs_id if obs_id else nested_rep.get('id', f"obs_{current_id}_{depth}")
-            return nested_rep # Return the representation of the *wrapped* value.
-
-        elif data is None:
-            rep['value'] = 'None' # Special string for None
-            rep['type'] = 'NoneType' # Consistent type name for None
-        elif isinstance(data, (str, int, float, bool)):
-            # For basic immutable types, the value is itself.
-            rep['value'] = data
-        elif isinstance(data, (list, tuple)):
-            rep['type'] = 'list' # Treat tuples as lists for display consistency
-            list_value_rep = []
-            rep['length'] = len(data) # Store original length
-            count = 0
-            for item in data:
-                if count >= _MAX_ITEMS: # Truncate if too many items
-                    list_value_rep.append({
-                        'type': 'truncated',
-                        'value': f'... ({len(data)} items total, showing first {_MAX_ITEMS})',
-                        'id': f'{rep["id"]}_trunc_{count}'
-                    })
-                    break
-                list_value_rep.append(_get_representation(item, depth + 1, visited_ids.copy()))
-                count += 1
-            rep['value'] = list_value_rep
-        elif isinstance(data, dict):
-            rep['type'] = 'dict'
-            dict_value_rep = []
-            rep['length'] = len(data) # Store original length
-            count = 0
-            # Attempt to sort dictionary items by a string representation of their keys
-            # for a more consistent display order in the UI.
-            try:
-                # Create (repr(key), key, value) tuples for sorting
-                items_to_sort = [(repr(k), k, v) for k, v in data.items()]
-                sorted_items = sorted(items_to_sort) # Sort by repr(key)
-                processed_items = [(k, v) for _, k, v in sorted_items] # Extract (key, value)
-            except Exception as sort_err:
-                # If sorting fails (e.g., uncomparable key reprs), fall back to original order.
-                logger.debug(
-                    f"Could not sort dict keys for {data_type_name} (id: {current_id}): {sort_err}. "
-                    f"Using original item order."
-                )
-                processed_items = list(data.items())
-
-            for k, v in processed_items:
-                if count >= _MAX_ITEMS: # Truncate if too many items
-                     dict_value_rep.append({
-                        'key': {'type': 'truncated_key', 'value': '...', 'id': f'{rep["id"]}_keytrunc_{count}'},
-                        'value': {'type': 'truncated_val', 'value': f'... ({len(data)} items total, showing first {_MAX_ITEMS})', 'id': f'{rep["id"]}_valtrunc_{count}'}
-                     })
-                     break
-                key_rep = _get_representation(k, depth + 1, visited_ids.copy())
-                value_rep = _get_representation(v, depth + 1, visited_ids.copy())
-                dict_value_rep.append({'key': key_rep, 'value': value_rep})
-                count += 1
-            rep['value'] = dict_value_rep
-        elif isinstance(data, set):
-            rep['type'] = 'set'
-            set_value_rep = []
-            rep['length'] = len(data) # Store original length
-            count = 0
-            # Attempt to sort set items by their string representation for consistent display.
-            try:
-                items_to_sort = [(repr(item), item) for item in data]
-                sorted_items = sorted(items_to_sort)
-                processed_items = [item for _, item in sorted_items]
-            except Exception as sort_err:
-                # If sorting fails, fall back to an arbitrary (but still iterated) order.
-                logger.debug(
-                    f"Could not sort set items for {data_type_name} (id: {current_id}): {sort_err}. "
-                    f"Using original iteration order."
-                )
-                processed_items = list(data) # Convert set to list for iteration
-
-            for item in processed_items:
-                if count >= _MAX_ITEMS: # Truncate if too many items
-                    set_value_rep.append({
-                        'type': 'truncated',
-                        'value': f'... ({len(data)} items total, showing first {_MAX_ITEMS})',
-                        'id': f'{rep["id"]}_trunc_{count}'
-                    })
-                    break
-                set_value_rep.append(_get_representation(item, depth + 1, visited_ids.copy()))
-                count += 1
-            rep['value'] = set_value_rep
-        else: # Generic object inspection (custom classes, etc.)
-            rep['type'] = f"object ({data_type_name})" # Include class name in type
-            object_value_rep: Dict[str, Any] = {} # Stores attribute_name: representation
-            attribute_count = 0
-            skipped_attrs_due_to_error = 0
-            attrs_to_process: Dict[str, Any] = {}
-
-            # Try to get attributes using dir()
-            try:
-                attribute_names = dir(data)
-            except Exception:
-                attribute_names = [] # Fallback if dir() fails
-
-            # Filter and collect attributes: non-private, non-callable.
-            for attr_name in attribute_names:
-                 if attr_name.startswith('_'): # Skip private/protected attributes
-                     continue
-                 try:
-                     attr_value = getattr(data, attr_name)
-                     if callable(attr_value): # Skip methods/callable attributes
-                         continue
-                     attrs_to_process[attr_name] = attr_value
-                 except Exception:
-                     # If getattr fails for some reason, skip this attribute.
-                     skipped_attrs_due_to_error += 1
-
-            rep['length'] = len(attrs_to_process) # Number of representable attributes
-            # Attempt to sort attributes by name for consistent display.
-            try:
-                sorted_attr_items = sorted(attrs_to_process.items())
-            except TypeError: # Fallback if attribute names are uncomparable
-                sorted_attr_items = list(attrs_to_process.items())
-
-            for attr_name, attr_value in sorted_attr_items:
-                if attribute_count >= _MAX_ITEMS: # Truncate if too many attributes
-                    object_value_rep['...'] = { # Use '...' as a special key for truncation display
-                        'type': 'truncated',
-                        'value': f'... ({len(attrs_to_process)} attributes total, showing first {_MAX_ITEMS})',
-                        'id': f'{rep["id"]}_attrtrunc_{attribute_count}'
-                    }
-                    break
-                object_value_rep[attr_name] = _get_representation(attr_value, depth + 1, visited_ids.copy())
-                attribute_count += 1
-            rep['value'] = object_value_rep
-
-            # If object has no displayable attributes, or if dir() failed and getattr also failed,
-            # fall back to using its string representation (repr).
-            if attribute_count == 0 and skipped_attrs_due_to_error == 0 and not object_value_rep and not attribute_names:
-                 logger.debug(
-                    f"Object {data_type_name} (id: {current_id}) has no representable attributes "
-                    f"or dir() failed. Falling back to repr()."
-                )
-                 try:
-                     rep['value'] = repr(data)
-                     rep['type'] = f"repr ({data_type_name})" # Indicate it's a repr fallback
-                 except Exception as e_repr:
-                    # If repr() itself fails, show an error message.
-                    logger.warning(f"Failed to get repr() for object {data_type_name} (id: {current_id}): {e_repr}")
-                    rep['value'] = f"<Object of type {data_type_name}, repr() failed: {e_repr}>"
-                    rep['type'] = 'error' # Mark as an error representation
-
+        # Fast path: registered types (all built-ins) are a single plain dictionary lookup.
+        data_type = type(data)
+        handler = _TYPE_HANDLERS.get(data_type) or _find_type_handler(data_type)
+        rep = handler(data, depth, visited_ids, offset, limit)
     except Exception as e_main:
         # Catch-all for any unexpected error during representation generation.
+        data_type_name = type(data).__name__
         logger.exception(
             f"Error generating representation for data of type {data_type_name} "
             f"(id: {current_id}) at depth {depth}. Original error: {e_main}"
         )
-        rep['type'] = 'error' # Mark as an error representation
-        rep['value'] = f"<Error representing object: {e_main}>"
-        # Ensure 'id' is present even in error cases for UI stability.
-        rep['id'] = rep.get('id', f"error_{current_id}_{depth}")
+        rep = {
+            # Keep the regular node ID even in error cases for UI stability.
+            'id': f"{data_type_name}_{current_id}_{depth}",
+            'type': 'error', # Mark as an error representation
+            'observableTracked': False,
+            'value': f"<Error representing object: {e_main}>"
+        }
     finally:
         # CRITICAL: Remove current object's ID from visited set *after* processing
         # its children/attributes. This allows the same object to be correctly
@@ -301,9 +364,539 @@ def _get_representation(
         # branches of the data structure (but not in a direct cycle).
         if current_id in visited_ids:
             visited_ids.remove(current_id)
+    if cacheable and rep['type'] != 'error':
+        _representation_cache.put(data, depth, rep)
+    return rep
+
+
+# --- Representation handlers ---
+# A handler builds the node for one value; it is called with the arguments of
+# `_get_representation` and recurses through `_get_representation` for children.
+
+TypeHandler = Callable[[Any, int, Set[int], int, int], Dict[str, Any]]
+
+
+def _new_node(data: Any, depth: int) -> Dict[str, Any]:
+    """Creates the fields shared by all representation nodes. (Internal)."""
+    data_type_name = type(data).__name__
+    return {
+        # Combines type, memory ID, and depth to help ensure uniqueness in the Viz tree.
+        'id': f"{data_type_name}_{id(data)}_{depth}",
+        'type': data_type_name, # Store the Python type name
+        'observableTracked': False # Default, overridden for ObservableValues
+    }
+
+
+def _observable_representation(data: ObservableValue, depth: int, visited_ids: Set[int], offset: int, limit: int) -> Dict[str, Any]:
+    """Represents the value wrapped by an ObservableValue, marked as tracked. (Internal)."""
+    # Represent the underlying value, and mark it as 'observableTracked' so the UI can treat it specially.
+    # Pass a *copy* of visited_ids to ensure siblings don't interfere with recursion detection,
+    # and copy the result, since the nested representation may be shared through the cache.
+    nested_rep = dict(_get_representation(data.get(), depth, visited_ids.copy(), offset, limit))
+    nested_rep['observableTracked'] = True
+    # Use the ObservableValue's own stable ID if available, for better UI state persistence.
+    obs_id = getattr(data, '_obs_value_id', None)
+    nested_rep['id'] = obs_id if obs_id else nested_rep.get('id', f"obs_{id(data)}_{depth}")
+    return nested_rep
+
+
+def _scalar_representation(data: Any, depth: int, visited_ids: Set[int], offset: int, limit: int) -> Dict[str, Any]:
+    """Represents None and basic immutable types (int, str, float, bool). (Internal)."""
+    # Built inline rather than through `_new_node`, as this is by far the most common node.
+    data_type_name = type(data).__name__
+    return {
+        'id': f"{data_type_name}_{id(data)}_{depth}",
+        'type': data_type_name,
+        'observableTracked': False,
+        'value': 'None' if data is None else data # Special string for None, the value itself otherwise
+    }
+
+
+def _container_representation(data: Any, depth: int, visited_ids: Set[int], offset: int, limit: int) -> Dict[str, Any]:
+    """Represents a list, tuple, dict or set as a (possibly paged) window of its items. (Internal)."""
+    rep = _new_node(data, depth)
+    total = len(data)
+    rep['length'] = total # Store original length
+    window = _window(data, offset, limit)
+    # Only windows that do not cover the whole container carry paging info,
+    # so small containers keep exactly the same shape as before.
+    is_paged = offset > 0 or offset + len(window) < total
+    if is_paged:
+        rep['pageOffset'] = offset
+        rep['pageLimit'] = limit
+    has_more = offset + len(window) < total
+
+    if isinstance(data, dict):
+        rep['type'] = 'dict'
+        dict_value_rep = []
+        for k, v in window:
+            key_rep = _get_representation(k, depth + 1, visited_ids.copy())
+            value_rep = _get_representation(v, depth + 1, visited_ids.copy())
+            dict_value_rep.append({'key': key_rep, 'value': value_rep})
+        if has_more: # Truncate if too many items
+            dict_value_rep.append({
+                'key': {'type': 'truncated_key', 'value': '...', 'id': f'{rep["id"]}_keytrunc_{offset + len(window)}'},
+                'value': {'type': 'truncated_val', 'value': _truncation_message(total, offset, len(window)), 'id': f'{rep["id"]}_valtrunc_{offset + len(window)}'}
+            })
+        rep['value'] = dict_value_rep
+    else:
+        # Treat tuples as lists for display consistency
+        rep['type'] = 'set' if isinstance(data, set) else 'list'
+        items_rep = [_get_representation(item, depth + 1, visited_ids.copy()) for item in window]
+        if has_more: # Truncate if too many items
+            items_rep.append({
+                'type': 'truncated',
+                'value': _truncation_message(total, offset, len(window)),
+                'id': f'{rep["id"]}_trunc_{offset + len(window)}'
+            })
+        rep['value'] = items_rep
+    return rep
+
+
+def _object_representation(data: Any, depth: int, visited_ids: Set[int], offset: int, limit: int) -> Dict[str, Any]:
+    """Represents any other object by its non-callable, non-private attributes. (Internal)."""
+    rep = _new_node(data, depth)
+    data_type_name = type(data).__name__
+    current_id = id(data)
+    rep['type'] = f"object ({data_type_name})" # Include class name in type
+    object_value_rep: Dict[str, Any] = {} # Stores attribute_name: representation
+    attribute_count = 0
+    skipped_attrs_due_to_error = 0
+    attrs_to_process: Dict[str, Any] = {}
+
+    # Try to get attributes using dir()
+    try:
+        attribute_names = dir(data)
+    except Exception:
+        attribute_names = [] # Fallback if dir() fails
+
+    # Filter and collect attributes: non-private, non-callable.
+    for attr_name in attribute_names:
+         if attr_name.startswith('_'): # Skip private/protected attributes
+             continue
+         try:
+             attr_value = getattr(data, attr_name)
+             if callable(attr_value): # Skip methods/callable attributes
+                 continue
+             attrs_to_process[attr_name] = attr_value
+         except Exception:
+             # If getattr fails for some reason, skip this attribute.
+             skipped_attrs_due_to_error += 1
+
+    rep['length'] = len(attrs_to_process) # Number of representable attributes
+    # Attempt to sort attributes by name for consistent display.
+    try:
+        sorted_attr_items = sorted(attrs_to_process.items())
+    except TypeError: # Fallback if attribute names are uncomparable
+        sorted_attr_items = list(attrs_to_process.items())
+
+    for attr_name, attr_value in sorted_attr_items:
+        if attribute_count >= _MAX_ITEMS: # Truncate if too many attributes
+            object_value_rep['...'] = { # Use '...' as a special key for truncation display
+                'type': 'truncated',
+                'value': f'... ({len(attrs_to_process)} attributes total, showing first {_MAX_ITEMS})',
+                'id': f'{rep["id"]}_attrtrunc_{attribute_count}'
+            }
+            break
+        object_value_rep[attr_name] = _get_representation(attr_value, depth + 1, visited_ids.copy())
+        attribute_count += 1
+    rep['value'] = object_value_rep
+
+    # If object has no displayable attributes, or if dir() failed and getattr also failed,
+    # fall back to using its string representation (repr).
+    if attribute_count == 0 and skipped_attrs_due_to_error == 0 and not object_value_rep and not attribute_names:
+         logger.debug(
+            f"Object {data_type_name} (id: {current_id}) has no representable attributes "
+            f"or dir() failed. Falling back to repr()."
+        )
+         try:
+             rep['value'] = repr(data)
+             rep['type'] = f"repr ({data_type_name})" # Indicate it's a repr fallback
+         except Exception as e_repr:
+            # If repr() itself fails, show an error message.
+            logger.warning(f"Failed to get repr() for object {data_type_name} (id: {current_id}): {e_repr}")
+            rep['value'] = f"<Object of type {data_type_name}, repr() failed: {e_repr}>"
+            rep['type'] = 'error' # Mark as an error representation
     return rep
 
 
+# --- Summaries for third-party types ---
+# Walking the attributes of a NumPy array or a pandas DataFrame produces a huge
+# and useless tree, so these types get a compact summary instead. Handlers are
+# looked up by the fully qualified name of a class in the value's MRO, which
+# means sidekick never has to import NumPy or pandas itself.
+
+_PREVIEW_SIZE = 8 # Rows/columns sampled in array previews, rows in DataFrame head/tail pages.
+
+
+def _summary_representation(
+    data: Any,
+    depth: int,
+    visited_ids: Set[int],
+    fields: List[Tuple[str, Any]]
+) -> Dict[str, Any]:
+    """Builds an object-style node whose attributes are the given fields, in order. (Internal)."""
+    rep = _new_node(data, depth)
+    rep['type'] = f"object ({rep['type']})"
+    rep['length'] = len(fields)
+    rep['value'] = {name: _get_representation(value, depth + 1, visited_ids.copy()) for name, value in fields}
+    return rep
+
+
+def _sample_indices(count: int, samples: int) -> List[int]:
+    """Returns up to `samples` evenly spaced indices in `range(count)`, ends included. (Internal)."""
+    if count <= samples:
+        return list(range(count))
+    return sorted({round(i * (count - 1) / (samples - 1)) for i in range(samples)})
+
+
+def _plain_scalar(value: Any) -> Any:
+    """Converts a NumPy/pandas scalar to the equivalent built-in value when possible. (Internal)."""
+    if isinstance(value, _IMMUTABLE_SCALARS):
+        return value
+    item = getattr(value, 'item', None)
+    if callable(item):
+        try:
+            plain = item()
+            if isinstance(plain, _IMMUTABLE_SCALARS):
+                return plain
+        except Exception:
+            pass
+    return str(value)
+
+
+def _ndarray_representation(data: Any, depth: int, visited_ids: Set[int], offset: int, limit: int) -> Dict[str, Any]:
+    """Summarizes a NumPy array: shape, dtype, basic statistics and a sampled preview grid. (Internal)."""
+    fields: List[Tuple[str, Any]] = [
+        ('shape', tuple(data.shape)),
+        ('dtype', str(data.dtype)),
+        ('size', int(data.size)),
+    ]
+    if data.size and data.dtype.kind in 'biuf':
+        try:
+            fields += [('min', data.min().item()), ('max', data.max().item()), ('mean', float(data.mean()))]
+        except Exception as e:
+            logger.debug(f"Could not compute statistics for array (id: {id(data)}): {e}")
+
+    if data.ndim == 0:
+        preview = data.item()
+    elif data.size == 0:
+        preview = []
+    else:
+        grid = data.reshape(data.shape[0], -1) if data.ndim > 2 else data # Flatten trailing dimensions
+        rows = _sample_indices(grid.shape[0], _PREVIEW_SIZE)
+        if grid.ndim == 1:
+            preview = grid[rows].tolist()
+        else:
+            columns = _sample_indices(grid.shape[1], _PREVIEW_SIZE)
+            preview = grid[rows][:, columns].tolist()
+    fields.append(('preview', preview))
+    return _summary_representation(data, depth, visited_ids, fields)
+
+
+def _numpy_scalar_representation(data: Any, depth: int, visited_ids: Set[int], offset: int, limit: int) -> Dict[str, Any]:
+    """Represents a NumPy scalar (e.g., `numpy.int64`) like the equivalent built-in value. (Internal)."""
+    return _get_representation(_plain_scalar(data), depth, visited_ids)
+
+
+def _dataframe_rows(frame: Any) -> List[List[Any]]:
+    """Converts DataFrame rows to `[index, cell, ...]` lists of built-in values. (Internal)."""
+    return [
+        [_plain_scalar(cell) for cell in row]
+        for row in frame.iloc[:, :_MAX_ITEMS].itertuples(name=None)
+    ]
+
+
+def _dataframe_representation(data: Any, depth: int, visited_ids: Set[int], offset: int, limit: int) -> Dict[str, Any]:
+    """Summarizes a pandas DataFrame: shape, column schema and its first and last rows. (Internal)."""
+    row_count, column_count = data.shape
+    fields: List[Tuple[str, Any]] = [
+        ('shape', (row_count, column_count)),
+        ('columns', [f"{name}: {dtype}" for name, dtype in itertools.islice(data.dtypes.items(), _MAX_ITEMS)]),
+    ]
+    if row_count <= 2 * _PREVIEW_SIZE:
+        fields.append(('rows', _dataframe_rows(data)))
+    else:
+        fields.append(('head', _dataframe_rows(data.head(_PREVIEW_SIZE))))
+        fields.append(('tail', _dataframe_rows(data.tail(_PREVIEW_SIZE))))
+    return _summary_representation(data, depth, visited_ids, fields)
+
+
+# --- Type dispatch registry ---
+
+# Handlers keyed by class, or by "<module>.<qualname>" for classes of optional
+# third-party packages, so that those packages never need to be imported here.
+_TYPE_HANDLERS: Dict[Union[type, str], TypeHandler] = {
+    ObservableValue: _observable_representation,
+    type(None): _scalar_representation,
+    str: _scalar_representation,
+    int: _scalar_representation,
+    float: _scalar_representation,
+    bool: _scalar_representation,
+    list: _container_representation,
+    tuple: _container_representation,
+    dict: _container_representation,
+    set: _container_representation,
+    object: _object_representation, # Fallback, as every class has `object` in its MRO
+    'numpy.ndarray': _ndarray_representation,
+    'numpy.generic': _numpy_scalar_representation,
+    'pandas.DataFrame': _dataframe_representation,            # pandas >= 3
+    'pandas.core.frame.DataFrame': _dataframe_representation, # Older pandas versions
+}
+# Result of the MRO lookup for every type seen so far. Cleared whenever a handler is registered.
+# Weak keys, so that showing instances of dynamically created classes doesn't keep them alive.
+_type_handler_cache: 'weakref.WeakKeyDictionary[type, TypeHandler]' = weakref.WeakKeyDictionary()
+
+
+def _find_type_handler(data_type: type) -> TypeHandler:
+    """Returns the handler for the most specific registered class in a type's MRO. (Internal).
+
+    Like `functools.singledispatch`, the MRO is only walked the first time a
+    type is seen; afterwards the lookup is a single (weak) dictionary access.
+    """
+    handler = _type_handler_cache.get(data_type)
+    if handler is None:
+        for klass in data_type.__mro__:
+            handler = _TYPE_HANDLERS.get(klass) or _TYPE_HANDLERS.get(f"{klass.__module__}.{klass.__qualname__}")
+            if handler is not None:
+                break
+        _type_handler_cache[data_type] = handler
+    return handler
+
+
+def _custom_handler(func: Callable[[Any], Any]) -> TypeHandler:
+    """Wraps a user display function from `register_repr` into a handler. (Internal)."""
+    def handler(data: Any, depth: int, visited_ids: Set[int], offset: int, limit: int) -> Dict[str, Any]:
+        display_value = func(data)
+        if isinstance(display_value, dict):
+            # Show the fields in the given order, under the original type name.
+            return _summary_representation(data, depth, visited_ids, [(str(k), v) for k, v in display_value.items()])
+        return _get_representation(display_value, depth, visited_ids)
+    return handler
+
+
+def register_repr(cls: Union[type, str], func: Optional[Callable[[Any], Any]] = None):
+    """Registers how Viz panels display values of a given type.
+
+    `func` receives the value and returns what to show instead: a `dict` is
+    shown as the fields of an object of the original type (in the given
+    order), anything else is shown as if it had been passed to `viz.show()`.
+    The function is used for `cls` and its subclasses, unless a subclass has
+    its own registration, and replaces Sidekick's default display (including
+    the one for built-in types).
+
+    This also makes displaying large structures of your own types faster,
+    because Viz no longer has to inspect all of their attributes.
+
+    Can be used as a decorator:
+
+        >>> import sidekick
+        >>> class Point:
+        ...     def __init__(self, x, y):
+        ...         self.x, self.y = x, y
+        >>> @sidekick.viz.register_repr(Point)
+        ... def show_point(p):
+        ...     return {"x": p.x, "y": p.y}
+
+    Args:
+        cls (Union[type, str]): The class to register, or its fully qualified
+            name (e.g., "decimal.Decimal") to avoid importing its module.
+        func (Optional[Callable[[Any], Any]]): The display function. If omitted,
+            `register_repr` returns a decorator.
+
+    Returns:
+        The display function (or a decorator registering it).
+
+    Raises:
+        TypeError: If `cls` is not a class or a string, or `func` is not callable.
+    """
+    if func is None:
+        return lambda decorated: register_repr(cls, decorated)
+    if not isinstance(cls, (type, str)):
+        raise TypeError(f"register_repr() expects a class or a qualified class name, got {type(cls).__name__}.")
+    if not callable(func):
+        raise TypeError("The display function passed to register_repr() must be callable.")
+    _TYPE_HANDLERS[cls] = _custom_handler(func)
+    _type_handler_cache.clear()
+    _representation_cache.clear() # Cached tuples may contain values of this type
+    logger.debug(f"Registered Viz display function for {cls!r}.")
+    return func
+
+
+def _resolve_path(data: Any, path: List[Union[str, int]]) -> Any:
+    """Follows a UI path from a shown variable down to one of its nested values. (Internal).
+
+    Path segments are list indices, dict keys (as displayed by the UI) or
+    attribute names, mirroring the paths used in Viz update messages.
+    `ObservableValue` wrappers met along the way are unwrapped.
+
+    Args:
+        data (Any): The root value (or `ObservableValue`) of a shown variable.
+        path (List[Union[str, int]]): The path segments to follow.
+
+    Returns:
+        Any: The value found at the end of the path.
+
+    Raises:
+        LookupError: If a segment cannot be resolved.
+    """
+    current = data
+    for segment in path:
+        if isinstance(current, ObservableValue):
+            current = current.get()
+        if isinstance(current, (list, tuple)):
+            if not isinstance(segment, int) or not (0 <= segment < len(current)):
+                raise LookupError(f"Invalid index {segment!r} for sequence of length {len(current)}")
+            current = current[segment]
+        elif isinstance(current, dict):
+            try:
+                current = current[segment]
+            except (KeyError, TypeError):
+                # The UI identifies keys by their displayed value, which may differ
+                # from the original key (e.g., None is displayed as 'None').
+                for key, value in current.items():
+                    if str(key) == str(segment):
+                        current = value
+                        break
+                else:
+                    raise LookupError(f"Key {segment!r} not found")
+        elif isinstance(segment, str) and not segment.startswith('_') and hasattr(current, segment):
+            current = getattr(current, segment)
+        else:
+            raise LookupError(f"Cannot resolve segment {segment!r} on {type(current).__name__}")
+    if isinstance(current, ObservableValue):
+        current = current.get()
+    return current
+
+
+def _same_representation(old: Any, new: Any) -> bool:
+    """Compares two representations structurally, ignoring their node IDs. (Internal).
+
+    Node IDs embed memory addresses, so two representations of equal data
+    built from different objects only differ in their IDs.
+    """
+    if old is new: # Shared through the representation cache
+        return True
+    if isinstance(old, dict) and isinstance(new, dict):
+        if old.keys() - {'id'} != new.keys() - {'id'}:
+            return False
+        return all(_same_representation(old[k], new[k]) for k in old if k != 'id')
+    if isinstance(old, list) and isinstance(new, list):
+        return len(old) == len(new) and all(map(_same_representation, old, new))
+    # Compare types too, so that e.g. `1` and `True` are not considered equal.
+    return type(old) is type(new) and old == new
+
+
+def _is_diffable(rep: Dict[str, Any]) -> bool:
+    """Checks if the UI can patch the children of a representation in place. (Internal).
+
+    Paged or truncated containers only hold part of their items, and set
+    elements cannot be addressed by a path, so these nodes are always
+    replaced as a whole.
+    """
+    kind = rep.get('type', '')
+    value = rep.get('value')
+    if 'pageOffset' in rep:
+        return False
+    if kind == 'list':
+        return not (value and value[-1].get('type') == 'truncated')
+    if kind == 'dict':
+        return all(pair['key'].get('type') in _DIFFABLE_KEY_TYPES for pair in value)
+    if kind.startswith('object ('):
+        return isinstance(value, dict) and '...' not in value
+    return False
+
+
+def _diff_node(
+    old: Dict[str, Any],
+    new: Dict[str, Any],
+    path: List[Union[str, int]],
+    patches: List[Tuple[str, Dict[str, Any]]]
+) -> bool:
+    """Appends the Viz update actions turning `old` into `new` to `patches`. (Internal).
+
+    Returns:
+        bool: False if the change cannot be expressed as granular patches within
+            `_MAX_DIFF_PATCHES`, in which case the whole variable must be re-sent.
+    """
+    if _same_representation(old, new):
+        return True
+    if len(patches) >= _MAX_DIFF_PATCHES:
+        return False
+
+    kind = new.get('type', '')
+    if kind != old.get('type') or not (_is_diffable(old) and _is_diffable(new)):
+        if not path:
+            return False # The root itself changed; the caller sends a full 'set'.
+        patches.append(('setitem', {'path': path, 'valueRepresentation': new}))
+        return True
+
+    old_value, new_value = old['value'], new['value']
+    if kind == 'list':
+        common = min(len(old_value), len(new_value))
+        for index in range(common):
+            if not _diff_node(old_value[index], new_value[index], path + [index], patches):
+                return False
+        for index in range(common, len(new_value)):
+            patches.append(('append', {'path': path + [index], 'valueRepresentation': new_value[index], 'length': index + 1}))
+        # Delete surplus items from the end so the remaining indices stay valid.
+        for index in range(len(old_value) - 1, common - 1, -1):
+            patches.append(('delitem', {'path': path + [index], 'length': index}))
+    elif kind == 'dict':
+        old_pairs = {(p['key']['type'], p['key']['value']): p for p in old_value}
+        new_pairs = {(p['key']['type'], p['key']['value']): p for p in new_value}
+        length = len(old_pairs)
+        for key, pair in old_pairs.items():
+            if key not in new_pairs:
+                length -= 1
+                patches.append(('delitem', {'path': path + [key[1]], 'length': length}))
+        for key, pair in new_pairs.items():
+            if key in old_pairs:
+                if not _diff_node(old_pairs[key]['value'], pair['value'], path + [key[1]], patches):
+                    return False
+            else:
+                length += 1
+                patches.append(('setitem', {
+                    'path': path + [key[1]],
+                    'keyRepresentation': pair['key'],
+                    'valueRepresentation': pair['value'],
+                    'length': length
+                }))
+    else: # Object attributes
+        for attr_name in old_value.keys() - new_value.keys():
+            patches.append(('delitem', {'path': path + [attr_name], 'length': new.get('length')}))
+        for attr_name, attr_rep in new_value.items():
+            if attr_name in old_value:
+                if not _diff_node(old_value[attr_name], attr_rep, path + [attr_name], patches):
+                    return False
+            else:
+                patches.append(('setitem', {'path': path + [attr_name], 'valueRepresentation': attr_rep, 'length': new.get('length')}))
+    return len(patches) <= _MAX_DIFF_PATCHES
+
+
+def _diff_representation(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[List[Tuple[str, Dict[str, Any]]]]:
+    """Computes the granular updates that turn one shown representation into another. (Internal).
+
+    Used by `Viz.show()` when a plain (non-observable) variable is shown again,
+    so that only the parts that changed are sent to the UI. The patches use
+    the same actions as `ObservableValue` updates (`setitem`, `append`,
+    `delitem`).
+
+    Args:
+        old (Dict[str, Any]): The representation previously sent for the variable.
+        new (Dict[str, Any]): The freshly generated representation.
+
+    Returns:
+        Optional[List[Tuple[str, Dict[str, Any]]]]: A list of `(action, options)`
+            pairs (empty if nothing changed), or `None` if the variable should be
+            re-sent as a whole.
+    """
+    patches: List[Tuple[str, Dict[str, Any]]] = []
+    if not _diff_node(old, new, [], patches):
+        return None
+    return patches
+
+
 class Viz(Component):
     """Represents the Variable Visualizer (Viz) component instance in the Sidekick UI.
 
@@ -320,6 +913,9 @@ class Viz(Component):
     Attributes:
         instance_id (str): The unique identifier for this Viz panel instance.
     """
+    # A Viz raises no events, so a discarded one (and what it shows) can be collected.
+    _weak_message_handler = True
+
     def __init__(
         self,
         instance_id: Optional[str] = None,
@@ -369,6 +965,7 @@ class Viz(Component):
         self._shown_variables: Dict[str, Dict[str, Any]] = {}
         logger.info(f"Viz panel '{self.instance_id}' initialized.") # Use self.instance_id
 
+    @profiler.times_payload_build("observable")
     def _handle_observable_update(self, variable_name: str, change_details: Dict[str, Any]):
         """Internal callback triggered by an ObservableValue when its wrapped data changes. (Internal).
 
@@ -384,6 +981,11 @@ class Viz(Component):
             details (action type, path to the change, new value representation, etc.),
             allowing the UI to perform a granular update of the displayed tree.
 
+        A "batch" change (from `ObservableValue.batch()`) is sent as a single
+        'batch' update carrying one operation per change. If the batch replaces
+        the root value or holds more than `_MAX_DIFF_PATCHES` changes, the full
+        new state is sent with a single 'set' instead.
+
         Args:
             variable_name (str): The name under which the `ObservableValue` was
                 originally shown in this Viz panel.
@@ -395,58 +997,31 @@ class Viz(Component):
             f"variable '{variable_name}'. Change details: {change_details}"
         )
         try:
-            action_type: str = change_details.get("type", "unknown_update")
-            # Path from the root of the variable to the element that changed.
-            # e.g., ['my_list', 0] or ['my_dict', 'key1', 'inner_list', 2]
-            path: List[Union[str, int]] = change_details.get("path", [])
-            options: Dict[str, Any] = {"path": path} # Start building options for the update message
-
-            # If the change details include a 'value', get its representation.
-            if "value" in change_details:
-                options["valueRepresentation"] = _get_representation(change_details["value"])
-            # If a 'key' was involved (e.g., for dict item changes), represent it.
-            if "key" in change_details and change_details["key"] is not None:
-                options["keyRepresentation"] = _get_representation(change_details["key"])
-            # If a new 'length' for a container is provided, include it.
-            if "length" in change_details and change_details["length"] is not None:
-                options["length"] = change_details["length"]
-
-            # Special handling for root-level 'set' or 'clear' operations on an ObservableValue.
-            # In these cases, the entire underlying value of the observable has been replaced or cleared.
-            # We need to send a full representation of the new state.
-            if action_type in ["set", "clear"] and not path: # 'path' is empty for root changes
-                observable_instance = self._shown_variables.get(variable_name, {}).get('value_or_observable')
-                if isinstance(observable_instance, ObservableValue):
-                    logger.debug(
-                        f"Viz '{self.instance_id}': Handling root '{action_type}' for observable '{variable_name}'. "
-                        f"Regenerating full representation of its new state."
-                    )
-                    # Get the new full representation of the observable's content.
-                    full_representation = _get_representation(observable_instance)
-                    options["valueRepresentation"] = full_representation
-                    # Also update the length if the new content is a container.
-                    actual_data = observable_instance.get()
-                    try:
-                        options["length"] = len(actual_data) if hasattr(actual_data, '__len__') else None
-                    except TypeError: # Handle cases where len() is not applicable
-                        options["length"] = None
-                    # Ensure the action type for the UI is 'set' to indicate a full replacement.
-                    action_type = "set"
-                else:
-                    # This shouldn't happen if our internal state is consistent.
-                    logger.warning(
-                        f"Viz '{self.instance_id}': ObservableValue instance for '{variable_name}' "
-                        f"not found during root update processing. Skipping update."
-                    )
-                    return # Cannot proceed without the observable instance.
-
-            # Construct the final update payload to send to the UI.
-            update_payload = {
-                "action": action_type,      # e.g., "setitem", "append", "set" (for root)
-                "variableName": variable_name, # The top-level name of the variable in Viz
-                "options": options          # Contains path, new value representation, etc.
-            }
-            self._send_update(update_payload) # Send the granular update to the UI
+            if change_details.get("type") == "batch":
+                changes: List[Dict[str, Any]] = change_details.get("changes", [])
+                replaces_root = any(c.get("type") in ("set", "clear") and not c.get("path") for c in changes)
+                if replaces_root or len(changes) > _MAX_DIFF_PATCHES:
+                    # Cheaper (and simpler for the UI) to resend the final state.
+                    update = self._build_observable_update(variable_name, {"type": "set", "path": []})
+                    if update is not None:
+                        self._send_update(update)
+                    return
+                operations = []
+                for change in changes:
+                    update = self._build_observable_update(variable_name, change)
+                    if update is not None:
+                        operations.append({"action": update["action"], "options": update["options"]})
+                if operations:
+                    self._send_update({
+                        "action": "batch",
+                        "variableName": variable_name,
+                        "options": {"path": [], "operations": operations}
+                    })
+                return
+
+            update = self._build_observable_update(variable_name, change_details)
+            if update is not None:
+                self._send_update(update) # Send the granular update to the UI
         except Exception as e:
             # Log any errors during the processing of an observable update.
             logger.exception(
@@ -454,7 +1029,66 @@ class Viz(Component):
                 f"'{variable_name}'. Change details were: {change_details}. Error: {e}"
             )
 
-    def show(self, name: str, value: Any):
+    def _build_observable_update(self, variable_name: str, change_details: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Builds the 'update' payload for a single ObservableValue change. (Internal).
+
+        Returns:
+            Optional[Dict[str, Any]]: The payload, or None if the update cannot be built.
+        """
+        action_type: str = change_details.get("type", "unknown_update")
+        # Path from the root of the variable to the element that changed.
+        # e.g., ['my_list', 0] or ['my_dict', 'key1', 'inner_list', 2]
+        path: List[Union[str, int]] = change_details.get("path", [])
+        options: Dict[str, Any] = {"path": path} # Start building options for the update message
+
+        # If the change details include a 'value', get its representation.
+        if "value" in change_details:
+            options["valueRepresentation"] = _get_representation(change_details["value"])
+        # If a 'key' was involved (e.g., for dict item changes), represent it.
+        if "key" in change_details and change_details["key"] is not None:
+            options["keyRepresentation"] = _get_representation(change_details["key"])
+        # If a new 'length' for a container is provided, include it.
+        if "length" in change_details and change_details["length"] is not None:
+            options["length"] = change_details["length"]
+
+        # Special handling for root-level 'set' or 'clear' operations on an ObservableValue.
+        # In these cases, the entire underlying value of the observable has been replaced or cleared.
+        # We need to send a full representation of the new state.
+        if action_type in ["set", "clear"] and not path: # 'path' is empty for root changes
+            observable_instance = self._shown_variables.get(variable_name, {}).get('value_or_observable')
+            if isinstance(observable_instance, ObservableValue):
+                logger.debug(
+                    f"Viz '{self.instance_id}': Handling root '{action_type}' for observable '{variable_name}'. "
+                    f"Regenerating full representation of its new state."
+                )
+                # Get the new full representation of the observable's content.
+                full_representation = _get_representation(observable_instance)
+                options["valueRepresentation"] = full_representation
+                # Also update the length if the new content is a container.
+                actual_data = observable_instance.get()
+                try:
+                    options["length"] = len(actual_data) if hasattr(actual_data, '__len__') else None
+                except TypeError: # Handle cases where len() is not applicable
+                    options["length"] = None
+                # Ensure the action type for the UI is 'set' to indicate a full replacement.
+                action_type = "set"
+            else:
+                # This shouldn't happen if our internal state is consistent.
+                logger.warning(
+                    f"Viz '{self.instance_id}': ObservableValue instance for '{variable_name}' "
+                    f"not found during root update processing. Skipping update."
+                )
+                return None # Cannot proceed without the observable instance.
+
+        # Construct the final update payload to send to the UI.
+        return {
+            "action": action_type,      # e.g., "setitem", "append", "set" (for root)
+            "variableName": variable_name, # The top-level name of the variable in Viz
+            "options": options          # Contains path, new value representation, etc.
+        }
+
+    @profiler.times_payload_build("show")
+    def show(self, name: str, value: Any, delivery: Optional[DeliveryPolicy] = None):
         """Displays or updates a Python variable in this Sidekick Viz panel.
 
         Call this method to make a Python variable visible in the Viz panel.
@@ -469,7 +1103,8 @@ class Viz(Component):
 
         For non-observable values, you must call `viz.show()` again with the
         same `name` if the `value` changes and you want the Viz panel to reflect
-        that change.
+        that change. Only the parts that changed since the previous `show()` are
+        sent, so re-showing a large structure after a small change is cheap.
 
         Args:
             name (str): The name to display for this variable in the Viz panel.
@@ -478,6 +1113,11 @@ class Viz(Component):
             value (Any): The Python variable or value you want to visualize.
                 This can be any Python object (numbers, strings, lists, dicts,
                 sets, custom objects, or `ObservableValue` instances).
+            delivery (Optional[DeliveryPolicy]): For `ObservableValue` instances,
+                how often changes are sent to the UI. By default every change
+                is sent immediately; `DeliveryPolicy.rate_limited(30)`, for
+                example, merges changes made in a fast loop into at most 30
+                updates per second. Ignored for other values.
 
         Raises:
             ValueError: If the provided `name` is empty or not a string.
@@ -489,6 +1129,8 @@ class Viz(Component):
             raise ValueError(msg)
 
         unsubscribe_func: Optional[UnsubscribeFunction] = None # To store unsubscribe for new observable
+        # Representation last sent for a plain value under this name, used to send only the differences.
+        previous_representation = self._shown_variables.get(name, {}).get('representation')
 
         # If this variable name was previously shown, we might need to unsubscribe
         # from an old ObservableValue associated with it.
@@ -517,7 +1159,8 @@ class Viz(Component):
             # This way, _handle_observable_update knows which top-level variable changed.
             update_callback_with_name = functools.partial(self._handle_observable_update, name)
             try:
-                unsubscribe_func = value.subscribe(update_callback_with_name)
+                # Subscribe weakly, so the observable does not keep this Viz alive.
+                unsubscribe_func = value.subscribe(update_callback_with_name, policy=delivery, weak=True)
                 logger.info(
                     f"Viz '{self.instance_id}': Successfully subscribed to ObservableValue " # Use self.instance_id
                     f"for variable '{name}'."
@@ -534,7 +1177,8 @@ class Viz(Component):
         # Store (or update) the variable and its potential unsubscribe function.
         self._shown_variables[name] = {
             'value_or_observable': value, # Store the actual value or ObservableValue instance
-            'unsubscribe': unsubscribe_func # Store the function to call to stop listening
+            'unsubscribe': unsubscribe_func, # Store the function to call to stop listening
+            'representation': None # Last representation sent (plain values only)
         }
 
         # Generate the initial representation of the value to send to the UI.
@@ -553,6 +1197,18 @@ class Viz(Component):
                 "observableTracked": False
             }
 
+        # Observable values are kept up to date through granular updates, so only
+        # plain values need their last representation for diffing on the next show().
+        if not isinstance(value, ObservableValue):
+            self._shown_variables[name]['representation'] = representation
+            if previous_representation is not None:
+                patches = _diff_representation(previous_representation, representation)
+                if patches is not None:
+                    for action, patch_options in patches:
+                        self._send_update({"action": action, "variableName": name, "options": patch_options})
+                    logger.debug(f"Viz '{self.instance_id}': Sent {len(patches)} incremental update(s) for variable '{name}'.")
+                    return
+
         # Determine the length of the actual data (if applicable) for the payload.
         actual_data_for_len = value.get() if isinstance(value, ObservableValue) else value
         data_length = None
@@ -682,9 +1338,82 @@ class Viz(Component):
             logger.debug(f"Viz '{self.instance_id}': _shown_variables already clear in _reset_specific_callbacks.") # Use self.instance_id
 
 
-    # Viz component primarily sends data to the UI. It doesn't typically receive
-    # interactive events (like clicks on variable nodes) back from the UI that would
-    # trigger Python callbacks, other than generic 'error' messages handled by Component.
-    # Thus, no specific _internal_message_handler override is usually needed beyond base.
+    def _internal_message_handler(self, message: Dict[str, Any]):
+        """Handles incoming 'event' or 'error' messages for this Viz panel. (Internal).
+
+        The only Viz-specific event is "requestPage", sent by the UI when the user
+        pages through a collection that is too large to display at once. Other
+        messages (like 'error') are passed on to the base `Component` handler.
+        """
+        msg_type = message.get("type")
+        payload = message.get("payload")
+
+        if msg_type == "event" and payload and payload.get("event") == "requestPage":
+            self._handle_page_request(payload)
+            return
+
+        # Call the base handler for potential 'error' messages or other base handling.
+        super()._internal_message_handler(message)
+
+    @profiler.times_payload_build("setPage")
+    def _handle_page_request(self, payload: Dict[str, Any]):
+        """Serializes and sends one page window of a large collection. (Internal).
+
+        Resolves the collection at `payload['path']` inside the shown variable
+        `payload['variableName']`, slices items `[offset, offset + limit)` and
+        sends them back as a "setPage" update. Only the requested window is
+        represented, so browsing huge containers keeps each message small.
+
+        Args:
+            payload (Dict[str, Any]): The event payload from the UI, containing
+                'variableName', 'path', 'offset' and 'limit'.
+        """
+        variable_name = payload.get("variableName")
+        path = payload.get("path") or []
+        offset = payload.get("offset")
+        limit = payload.get("limit")
+
+        if not isinstance(offset, int) or offset < 0 or not isinstance(limit, int) or limit <= 0 or not isinstance(path, list):
+            logger.warning(f"Viz '{self.instance_id}': Ignoring malformed 'requestPage' event: {payload}")
+            return
+        limit = min(limit, _MAX_PAGE_ITEMS)
+
+        entry = self._shown_variables.get(variable_name) if isinstance(variable_name, str) else None
+        if entry is None:
+            logger.warning(
+                f"Viz '{self.instance_id}': Received 'requestPage' for unknown variable '{variable_name}'. Ignoring."
+            )
+            return
+
+        try:
+            target = _resolve_path(entry['value_or_observable'], path)
+        except LookupError as e:
+            logger.warning(
+                f"Viz '{self.instance_id}': Cannot resolve path {path} in variable '{variable_name}' "
+                f"for 'requestPage': {e}"
+            )
+            return
+        if not isinstance(target, (list, tuple, dict, set)):
+            logger.warning(
+                f"Viz '{self.instance_id}': Value at path {path} in variable '{variable_name}' "
+                f"is not a pageable collection ({type(target).__name__})."
+            )
+            return
+
+        # Use the path length as depth so nested depth limits match the full view.
+        page_representation = _get_representation(target, len(path), None, offset, limit)
+        self._send_update({
+            "action": "setPage",
+            "variableName": variable_name,
+            "options": {
+                "path": path,
+                "offset": offset,
+                "valueRepresentation": page_representation,
+                "length": len(target)
+            }
+        })
+        logger.debug(
+            f"Viz '{self.instance_id}': Sent page [{offset}, {offset + limit}) of '{variable_name}' at path {path}."
+        )
 
     # __del__ is inherited from Component for fallback handler unregistration.
@@ -1,5 +1,6 @@
 import unittest
 import asyncio
+import os
 import time
 from concurrent.futures import Future
 from typing import List, Any
@@ -234,5 +235,18 @@ class TestCPythonTaskManager(unittest.TestCase):
         # Check the final order of operations
         self.assertEqual(self.results, ["coro1_start", "coro2_start", "coro2_work_done", "coro1_end"])
 
+    def test_run_in_process_returns_result_and_pool_is_shut_down(self):
+        """Test that run_in_process runs work in another process and stopping the loop releases the pool."""
+        task = self.task_manager.submit_task(self.task_manager.run_in_process(os.getpid))
+        worker_pid = self._wait_for_task(task, timeout=30)
+        self.assertNotEqual(worker_pid, os.getpid())
+        self.assertIsNotNone(self.task_manager._process_pool)
+        # Workers must not be forked from the multi-threaded Sidekick process.
+        self.assertIn(self.task_manager._process_pool._mp_context.get_start_method(), ('forkserver', 'spawn'))
+
+        self.task_manager.stop_loop()
+        self.task_manager.wait_for_stop()
+        self.assertIsNone(self.task_manager._process_pool)
+
 if __name__ == '__main__':
     unittest.main()
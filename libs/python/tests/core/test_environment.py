@@ -0,0 +1,36 @@
+import dataclasses
+import sys
+import unittest
+from unittest.mock import patch
+
+from sidekick.core import environment, is_pyodide, runtime
+
+
+class TestRuntimeProfile(unittest.TestCase):
+    """Unit tests for the runtime profile detected at import time."""
+
+    def test_profile_describes_cpython_and_is_immutable(self):
+        self.assertFalse(runtime.is_pyodide)
+        self.assertFalse(is_pyodide())
+        self.assertTrue(runtime.threads_available)
+        self.assertEqual(runtime.python_version, tuple(sys.version_info[:3]))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            runtime.is_pyodide = True
+
+    def test_emscripten_disables_threads_and_processes(self):
+        with patch.object(environment.sys, 'platform', 'emscripten'):
+            profile = environment.detect_runtime()
+        self.assertTrue(profile.is_pyodide)
+        self.assertFalse(profile.threads_available)
+        self.assertFalse(profile.processes_available)
+
+    def test_optional_modules_are_detected_without_importing(self):
+        with patch.dict(sys.modules):
+            sys.modules.pop('numpy', None)
+            profile = environment.detect_runtime()
+            self.assertNotIn('numpy', sys.modules)
+        self.assertIn(profile.fast_json, (None,) + environment._FAST_JSON_MODULES)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,16 @@
+"""Shared helpers for the unit tests."""
+
+from sidekick.connection_service import ConnectionService
+
+
+def detached_connection_service() -> ConnectionService:
+    """Returns a ConnectionService with its routing state but no master loop.
+
+    `ConnectionService.__init__` would start the master coroutine on a real
+    event loop; tests of the send and receive paths call the methods directly.
+    """
+    service = ConnectionService.__new__(ConnectionService)
+    service._component_handlers = {}
+    service._global_handler = None
+    service._inbound_routes = service._build_inbound_routes()
+    return service
@@ -0,0 +1,75 @@
+import threading
+import time
+import unittest
+
+from sidekick import callbacks
+from sidekick.callbacks import _CallbackDispatcher
+
+
+class TestCallbackDispatcher(unittest.TestCase):
+    """Unit tests for running sync callbacks inline or on the thread pool."""
+
+    def setUp(self):
+        self.dispatcher = _CallbackDispatcher()
+        self.addCleanup(self.dispatcher.shutdown, True)
+
+    def test_inline_runs_on_calling_thread(self):
+        threads = []
+        self.dispatcher.dispatch('button-1', lambda: threads.append(threading.current_thread()))
+        self.assertEqual(threads, [threading.current_thread()])
+        self.assertEqual(self.dispatcher.metrics.invoked, 1)
+
+    def test_thread_mode_preserves_order_per_component(self):
+        results = {'a': [], 'b': []}
+        done = threading.Event()
+        for i in range(50):
+            for key in results:
+                # Sleep a little so later callbacks queue up behind earlier ones.
+                self.dispatcher.dispatch(key, lambda k=key, i=i: (time.sleep(0.001), results[k].append(i)), 'thread')
+        self.dispatcher.dispatch('a', done.set, 'thread')
+        self.assertTrue(done.wait(5))
+        self.dispatcher.shutdown(wait=True)
+        self.assertEqual(results['a'], list(range(50)))
+        self.assertEqual(results['b'], list(range(50)))
+
+    def test_restart_after_shutdown_while_draining(self):
+        started, release, ran = threading.Event(), threading.Event(), threading.Event()
+        self.addCleanup(release.set)
+        self.dispatcher.dispatch('button-1', lambda: (started.set(), release.wait(5)), 'thread')
+        self.assertTrue(started.wait(5))
+        self.dispatcher.shutdown(wait=False) # 'button-1' is still draining on the old pool
+
+        # New work runs on the new pool instead of waiting behind the old one.
+        self.dispatcher.dispatch('button-1', ran.set, 'thread')
+        self.assertTrue(ran.wait(2))
+
+    def test_failures_are_logged_and_counted(self):
+        def boom():
+            raise ValueError('boom')
+        with self.assertLogs('sidekick', level='ERROR'):
+            self.dispatcher.dispatch('button-1', boom)
+        self.assertEqual(self.dispatcher.metrics.failed, 1)
+
+
+class TestCallbackMode(unittest.TestCase):
+
+    def tearDown(self):
+        callbacks.set_callback_mode('inline', max_workers=4)
+
+    def test_invalid_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            callbacks.set_callback_mode('process')
+        with self.assertRaises(ValueError):
+            callbacks.set_callback_mode('thread', max_workers=0)
+
+    def test_stats_report_mode_and_reset(self):
+        callbacks.set_callback_mode('thread', max_workers=2)
+        callbacks._dispatcher.dispatch('label-1', lambda: None, 'inline')
+        stats = callbacks.callback_stats(reset=True)
+        self.assertEqual(stats['mode'], 'thread')
+        self.assertGreaterEqual(stats['invoked'], 1)
+        self.assertEqual(callbacks.callback_stats()['invoked'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+import sidekick
+from sidekick.testing import HeadlessUI
+
+
+class TestCanvasPointerEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.ui = HeadlessUI().start()
+        self.addCleanup(self.ui.stop)
+        self.canvas = sidekick.Canvas(100, 100, instance_id='canvas')
+        self.ui.flush()
+        self.events = []
+
+    def _send(self, event, **payload):
+        self.ui.send_event('canvas', event, **payload)
+        self.ui.flush()
+
+    def test_pointer_move_and_drag_events_are_parsed(self):
+        self.canvas.on_pointer_move(self.events.append, max_rate=10)
+        self.canvas.on_drag(self.events.append)
+        self._send('pointerMove', points=[{'x': 1, 'y': 2}, {'x': 3, 'y': 4}])
+        self._send('drag', points=[{'x': 5, 'y': 6}], phase='start')
+        self._send('drag', points=[{'x': 7, 'y': 8}, {'x': 'bad'}, {'x': 9, 'y': 10}])
+
+        move, start, drag = self.events
+        self.assertEqual((move.type, move.points, move.phase), ('pointer_move', [(1, 2), (3, 4)], None))
+        self.assertEqual((move.x, move.y), (3, 4))
+        self.assertEqual((start.type, start.points, start.phase), ('drag', [(5, 6)], 'start'))
+        self.assertEqual((drag.points, drag.phase, drag.x, drag.y), ([(7, 8), (9, 10)], 'move', 9, 10))
+
+        # An event without any valid point is dropped with a warning.
+        with self.assertLogs('sidekick', level='WARNING'):
+            self._send('pointerMove', points=[{'x': None, 'y': 1}])
+        self.assertEqual(len(self.events), 3)
+
+    def test_remove_resets_pointer_callbacks(self):
+        self.canvas.on_pointer_move(self.events.append)
+        self.canvas.on_drag(self.events.append)
+        self.canvas.remove()
+        self.assertIsNone(self.canvas._pointer_move_callback)
+        self.assertIsNone(self.canvas._drag_callback)
+        self.assertEqual(self.canvas._pointer_event_rates, {'move': None, 'drag': None})
+
+
+if __name__ == '__main__':
+    unittest.main()
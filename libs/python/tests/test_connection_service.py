@@ -0,0 +1,51 @@
+import json
+import unittest
+from unittest import mock
+
+from sidekick.connection_service import _Command
+
+from helpers import detached_connection_service
+
+
+class TestInboundDispatch(unittest.TestCase):
+    """Unit tests for the direct dispatch of incoming messages."""
+
+    def setUp(self):
+        self.service = detached_connection_service()
+        self.service._submit_command = mock.Mock()
+
+    def _receive(self, **message):
+        self.service._dispatch_inbound_message(json.dumps(message))
+
+    def test_events_go_directly_to_component_handlers(self):
+        handler = mock.Mock()
+        global_handler = mock.Mock()
+        self.service.register_component_message_handler('canvas-1', handler)
+        self.service.register_user_global_message_handler(global_handler)
+
+        self._receive(component='canvas', type='event', src='canvas-1', payload={'event': 'click'})
+        self._receive(component='canvas', type='event', src='unknown', payload={})
+        handler.assert_called_once()
+        self.assertEqual(global_handler.call_count, 2)
+        self.service._submit_command.assert_not_called()
+
+        self.service.unregister_component_message_handler('canvas-1')
+        self._receive(component='canvas', type='error', src='canvas-1', payload={})
+        handler.assert_called_once()
+
+    def test_system_messages_go_to_master_loop(self):
+        self._receive(component='system', type='announce', payload={'role': 'sidekick', 'status': 'online'})
+        command, message = self.service._submit_command.call_args[0][0]
+        self.assertEqual(command, _Command._PROCESS_SYSTEM_MESSAGE)
+        self.assertEqual(message['type'], 'announce')
+
+    def test_handler_errors_and_invalid_json_are_contained(self):
+        self.service.register_component_message_handler('button-1', mock.Mock(side_effect=ValueError('boom')))
+        with self.assertLogs('sidekick', level='ERROR'):
+            self._receive(component='button', type='event', src='button-1', payload={})
+        with self.assertLogs('sidekick', level='ERROR'):
+            self.service._dispatch_inbound_message('{not json')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+import unittest
+
+
+class TestLazyImports(unittest.TestCase):
+    """`import sidekick` must not load the WebSocket transport or component modules."""
+
+    def _run(self, code):
+        return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.split()
+
+    def test_import_defers_transport_and_components(self):
+        loaded = self._run(
+            "import sys, sidekick; "
+            "print(' '.join(m for m in sys.modules if m == 'websockets' or m in "
+            "('sidekick.core.websocket_communication_manager', 'sidekick.grid', 'sidekick.viz', 'sidekick.button')))"
+        )
+        self.assertEqual(loaded, [])
+
+    def test_components_load_on_first_access(self):
+        output = self._run(
+            "import sidekick; from sidekick import Button; "
+            "print(sidekick.Grid.__module__, Button.__module__, 'Viz' in dir(sidekick), hasattr(sidekick, 'Nope'))"
+        )
+        self.assertEqual(output, ['sidekick.grid', 'sidekick.button', 'True', 'False'])
+
+    def test_component_modules_load_on_first_access(self):
+        output = self._run(
+            "import sidekick; "
+            "print(sidekick.viz.__name__, callable(sidekick.viz.register_repr), sidekick.canvas.Canvas is sidekick.Canvas)"
+        )
+        self.assertEqual(output, ['sidekick.viz', 'True', 'True'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import sidekick
+from sidekick import metrics
+from sidekick.connection_service import ConnectionService
+from sidekick.metrics import MetricsRegistry, _Histogram
+from sidekick.testing import HeadlessUI
+
+from helpers import detached_connection_service
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_percentiles_are_within_bucket_precision(self):
+        histogram = _Histogram()
+        for micros in range(1, 10001):
+            histogram.record(micros / 1_000_000)
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 10000)
+        for percent, expected in ((50, 0.005), (90, 0.009), (99, 0.0099)):
+            self.assertAlmostEqual(summary[f'p{percent}'], expected, delta=expected / 16)
+        self.assertEqual(summary['max'], 0.01)
+
+
+class TestMetricsPipeline(unittest.TestCase):
+    """Metrics recorded by the ConnectionService send and receive paths."""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        patcher = mock.patch.object(metrics, 'registry', self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = detached_connection_service()
+        self.cm = mock.Mock(send_message_async=mock.AsyncMock())
+
+    def _send(self, message):
+        asyncio.run(self.service._send_to_wire(self.cm, message, enqueued_at=0.0))
+
+    def test_disabled_registry_records_nothing(self):
+        self._send({'component': 'grid', 'type': 'update'})
+        self.service._dispatch_inbound_message(json.dumps({'component': 'grid', 'type': 'event', 'src': 'grid-1'}))
+        self.cm.send_message_async.assert_awaited_once()
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot['counters'], {})
+        self.assertEqual(snapshot['histograms'], {})
+
+    def test_enabled_registry_records_send_and_receive(self):
+        self.registry.enabled = True
+        message = {'component': 'grid', 'type': 'update', 'payload': {'x': 1}}
+        self._send(message)
+        self._send(dict(message, component='console'))
+        inbound = json.dumps({'component': 'textbox', 'type': 'event', 'src': 'textbox-1', 'payload': {'value': 'héllo'}}, ensure_ascii=False)
+        self.service._dispatch_inbound_message(inbound)
+
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot['counters']['messages_sent'], 2)
+        self.assertEqual(snapshot['counters']['bytes_sent'], len(json.dumps(message)) + len(json.dumps(dict(message, component='console'))))
+        self.assertEqual(snapshot['counters']['bytes_received'], len(inbound) + 1) # 'é' takes two bytes
+        self.assertEqual(snapshot['component_messages'], {'grid': 1, 'console': 1})
+        for name in ('serialize', 'send', 'enqueue_to_wire'):
+            self.assertEqual(snapshot['histograms'][name]['count'], 2)
+        self.assertEqual(snapshot['histograms']['inbound_dispatch']['count'], 1)
+
+        self.assertEqual(metrics.stats(reset=True)['counters']['messages_sent'], 2)
+        self.assertEqual(metrics.stats()['counters'], {})
+
+    def test_messages_queued_during_activation_keep_their_enqueue_time(self):
+        self.registry.enabled = True
+        send_raw = ConnectionService._send_raw
+
+        async def slow_send_raw(service, cm, msg_str):
+            await asyncio.sleep(0.01) # Keeps activation busy with its handshake
+            await send_raw(service, cm, msg_str)
+
+        with HeadlessUI() as ui, mock.patch.object(ConnectionService, '_send_raw', slow_send_raw):
+            sidekick.Label('Starting', instance_id='label') # Queued until the UI is connected
+            ui.flush()
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot['histograms']['enqueue_to_wire']['count'], snapshot['counters']['messages_sent'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,310 @@
+import asyncio
+import functools
+import gc
+import unittest
+import warnings
+import weakref
+from unittest import mock
+
+import sidekick
+from sidekick.observable_value import DeliveryPolicy, ObservableValue
+from sidekick.testing import HeadlessUI
+
+
+class TestObservableValueBatch(unittest.TestCase):
+    """Unit tests for batched notifications of ObservableValue."""
+
+    def setUp(self):
+        self.notifications = []
+
+    def _observe(self, value):
+        observable = ObservableValue(value)
+        observable.subscribe(self.notifications.append)
+        return observable
+
+    def test_batch_sends_single_notification(self):
+        scores = self._observe({})
+        with scores.batch():
+            for i in range(100):
+                scores[i] = i
+            self.assertEqual(self.notifications, []) # Nothing is delivered inside the block
+        self.assertEqual(len(self.notifications), 1)
+        batch = self.notifications[0]
+        self.assertEqual(batch['type'], 'batch')
+        self.assertEqual(batch['length'], 100)
+        self.assertEqual([change['path'] for change in batch['changes']], [[i] for i in range(100)])
+
+    def test_nested_batches_and_merged_assignments(self):
+        items = self._observe([0, 0])
+        with items.batch():
+            items[0] = 1
+            items[0] = 2
+            with items.batch():
+                items.append(3)
+        self.assertEqual(len(self.notifications), 1)
+        changes = self.notifications[0]['changes']
+        self.assertEqual([(c['type'], c['path'], c['value']) for c in changes],
+                         [('setitem', [0], 2), ('append', [2], 3)])
+        self.assertEqual(changes[0]['old_value'], 0)
+
+    def test_update_is_batched(self):
+        settings = self._observe({'a': 1})
+        settings.update({'a': 2, 'b': 3})
+        self.assertEqual(len(self.notifications), 1)
+        self.assertEqual(len(self.notifications[0]['changes']), 2)
+
+    def test_changes_are_delivered_when_block_raises(self):
+        items = self._observe([])
+        with self.assertRaises(RuntimeError):
+            with items.batch():
+                items.append(1)
+                raise RuntimeError("boom")
+        self.assertEqual(items.get(), [1])
+        self.assertEqual(len(self.notifications), 1)
+
+
+class TestObservableValueFastPath(unittest.TestCase):
+    """Unit tests for the cached container kind and subscriber-less fast path."""
+
+    def test_container_kind_follows_set(self):
+        value = ObservableValue([1])
+        self.assertFalse(hasattr(value, '__dict__'))
+        with self.assertRaises(TypeError):
+            value.add(2)
+        value.set({1})
+        value.add(2)
+        self.assertEqual(value.get(), {1, 2})
+        with self.assertRaises(TypeError):
+            value.append(3)
+
+    def test_change_records_have_all_keys(self):
+        notifications = []
+        value = ObservableValue([])
+        value.append(1) # No subscribers yet: nothing to build or deliver
+        value.subscribe(notifications.append)
+        value.append(2)
+        self.assertEqual(notifications, [{'type': 'append', 'path': [1], 'value': 2, 'key': None,
+                                          'old_value': None, 'length': 2}])
+
+    def test_kind_cache_does_not_keep_types_alive(self):
+        dynamic_type = type('DynamicList', (list,), {})
+        ObservableValue(dynamic_type([1]))
+        type_ref = weakref.ref(dynamic_type)
+        del dynamic_type
+        gc.collect()
+        self.assertIsNone(type_ref())
+
+
+class TestObservableValueDelivery(unittest.TestCase):
+    """Unit tests for debounced and rate-limited delivery policies."""
+
+    def setUp(self):
+        self.notifications = []
+        self.scheduled = [] # Flush coroutines submitted to the (fake) task manager
+        task_manager = mock.Mock()
+        task_manager.submit_task.side_effect = self.scheduled.append
+        patcher = mock.patch('sidekick.core.factories.get_task_manager', return_value=task_manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run_scheduled(self):
+        while self.scheduled:
+            asyncio.run(self.scheduled.pop(0))
+
+    def test_changes_are_coalesced_until_flushed(self):
+        items = ObservableValue([])
+        items.subscribe(self.notifications.append, policy=DeliveryPolicy.debounced(0.01))
+        for i in range(1000):
+            items.append(i)
+        items[0] = 'a'
+        items[0] = 'b'
+        self.assertEqual(self.notifications, [])
+        self.assertEqual(len(self.scheduled), 1) # A single flush is scheduled for all changes
+
+        self._run_scheduled()
+        self.assertEqual(len(self.notifications), 1)
+        batch = self.notifications[0]
+        self.assertEqual(batch['type'], 'batch')
+        self.assertEqual(batch['length'], 1000)
+        self.assertEqual(len(batch['changes']), 1001)
+        self.assertEqual(batch['changes'][-1]['value'], 'b')
+
+    def test_rate_limit_and_unsubscribe(self):
+        value = ObservableValue({})
+        unsubscribe = value.subscribe(self.notifications.append, policy=DeliveryPolicy.rate_limited(1000))
+        value['a'] = 1
+        self._run_scheduled()
+        self.assertEqual([n['type'] for n in self.notifications], ['setitem'])
+
+        value['b'] = 2
+        unsubscribe()
+        self._run_scheduled()
+        self.assertEqual(len(self.notifications), 1) # Pending changes are dropped on unsubscribe
+
+    def test_merging_does_not_change_what_immediate_subscribers_received(self):
+        immediate = []
+        items = ObservableValue([0])
+        items.subscribe(immediate.append)
+        items.subscribe(self.notifications.append, policy=DeliveryPolicy.debounced(0.01))
+        items[0] = 10
+        items[0] = 20
+        self.assertEqual([n['old_value'] for n in immediate], [0, 10])
+
+        self._run_scheduled()
+        self.assertEqual(self.notifications[0]['old_value'], 0) # Merged: 0 -> 20
+
+    def test_failed_scheduling_delivers_immediately(self):
+        items = ObservableValue([])
+        items.subscribe(self.notifications.append, policy=DeliveryPolicy.debounced(0.01))
+        task_manager = mock.Mock()
+        def submit_task(coro):
+            raise RuntimeError("no loop")
+        task_manager.submit_task.side_effect = submit_task
+        with mock.patch('sidekick.core.factories.get_task_manager', return_value=task_manager), \
+                warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            items.append(1)
+            task_manager.reset_mock() # Drops the mock's reference to the coroutine
+            gc.collect()
+        self.assertEqual([n['type'] for n in self.notifications], ['append'])
+        self.assertEqual([w for w in caught if issubclass(w.category, RuntimeWarning)], []) # Coroutine was closed
+
+    def test_invalid_policies(self):
+        with self.assertRaises(ValueError):
+            DeliveryPolicy.debounced(0)
+        with self.assertRaises(ValueError):
+            DeliveryPolicy.rate_limited(-5)
+
+
+class TestObservableValueWeakSubscriptions(unittest.TestCase):
+    """Unit tests for weak subscriptions, which must not keep subscribers alive."""
+
+    class Listener:
+        def __init__(self):
+            self.changes = []
+
+        def on_change(self, name, change_details):
+            self.changes.append((name, change_details['type']))
+
+    def test_weak_subscription_delivers_and_unsubscribes(self):
+        value = ObservableValue([])
+        listener = self.Listener()
+        callback = functools.partial(listener.on_change, 'items')
+        value.subscribe(callback, weak=True)
+        value.append(1)
+        self.assertEqual(listener.changes, [('items', 'append')])
+
+        value.unsubscribe(callback)
+        value.append(2)
+        self.assertEqual(len(listener.changes), 1)
+        with self.assertRaises(TypeError):
+            value.subscribe(lambda change: None, weak=True)
+
+    def test_discarded_viz_is_not_kept_alive(self):
+        value = ObservableValue([1, 2, 3])
+        with HeadlessUI() as ui:
+            viz = sidekick.Viz(instance_id='viz-leak-check')
+            viz.show('numbers', value)
+            ui.flush()
+            self.assertEqual(len(value._subscribers), 1)
+
+            viz_ref = weakref.ref(viz)
+            del viz
+            gc.collect()
+            self.assertIsNone(viz_ref())
+            self.assertEqual(len(value._subscribers), 0) # The dead subscription was removed
+            value.append(4) # Notifying after the Viz is gone is harmless
+            ui.flush()
+
+
+class TestObservableValueHistory(unittest.TestCase):
+    """Unit tests for recording history and reconstructing past versions."""
+
+    def test_value_at_and_restore(self):
+        items = ObservableValue([1, 2], history=10)
+        items.append(3)
+        with items.batch():
+            items[0] = 'a'
+            items.pop(1)
+        self.assertEqual(items.versions(), range(0, 3))
+        self.assertEqual([items.value_at(v) for v in items.versions()], [[1, 2], [1, 2, 3], ['a', 3]])
+
+        items.value_at(1).append('not recorded') # Returned values are copies
+        self.assertEqual(items.value_at(1), [1, 2, 3])
+
+        items.restore(0)
+        self.assertEqual(items.get(), [1, 2])
+        self.assertEqual(items.versions(), range(0, 4))
+
+    def test_recorded_values_are_copied(self):
+        grid = ObservableValue({}, deep=True, history=10)
+        row = [0, 0]
+        grid['row'] = row
+        row.append('changed outside') # Not intercepted, and not part of the history
+        grid['row'][0] = 5
+        self.assertEqual(grid.value_at(1), {'row': [0, 0]})
+        self.assertEqual(grid.value_at(2), {'row': [5, 0]})
+
+    def test_old_versions_are_dropped(self):
+        counter = ObservableValue({'n': 0}, history=150)
+        for i in range(1, 1001):
+            counter['n'] = i
+        versions = counter.versions()
+        self.assertEqual(versions[-1], 1000)
+        self.assertLessEqual(versions[0], 1000 - 150)
+        self.assertEqual(counter.value_at(versions[0]), {'n': versions[0]})
+        with self.assertRaises(IndexError):
+            counter.value_at(0)
+
+    def test_history_is_opt_in(self):
+        with self.assertRaises(RuntimeError):
+            ObservableValue([]).versions()
+        with self.assertRaises(ValueError):
+            ObservableValue([], history=0)
+
+
+class TestObservableValueDeep(unittest.TestCase):
+    """Unit tests for deep observation of nested values."""
+
+    class Player:
+        def __init__(self):
+            self.score = 0
+            self.items = []
+
+    def setUp(self):
+        self.notifications = []
+
+    def test_nested_changes_report_full_paths(self):
+        data = ObservableValue({'rows': [[1], [2]], 'player': self.Player()}, deep=True)
+        data.subscribe(self.notifications.append)
+        data['rows'][0].append(5)
+        data['rows'][-1][0] = 9
+        data['player'].score = 3
+        data['player'].items.append('sword')
+        self.assertEqual([(n['type'], n['path']) for n in self.notifications], [
+            ('append', ['rows', 0, 1]),
+            ('setitem', ['rows', 1, 0]),
+            ('setitem', ['player', 'score']),
+            ('append', ['player', 'items', 0]),
+        ])
+        self.assertEqual(data.get()['rows'], [[1, 5], [9]])
+
+    def test_nested_clear_is_reported_as_replacement(self):
+        data = ObservableValue([[1, 2]], deep=True)
+        data.subscribe(self.notifications.append)
+        data[0].clear()
+        self.assertEqual(self.notifications[0]['type'], 'setitem')
+        self.assertEqual(self.notifications[0]['path'], [0])
+
+    def test_proxies_are_not_stored(self):
+        data = ObservableValue([[1], [2]], deep=True)
+        data[0] = data[1]
+        self.assertIs(type(data.get()[0]), list)
+
+    def test_shallow_by_default(self):
+        data = ObservableValue([[1]])
+        self.assertIs(type(data[0]), list)
+
+
+if __name__ == '__main__':
+    unittest.main()
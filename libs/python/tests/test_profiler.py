@@ -0,0 +1,99 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import sidekick
+from sidekick.component import Component
+from sidekick.connection_service import ConnectionService
+from sidekick.testing import HeadlessUI
+
+from helpers import detached_connection_service
+
+
+class TestTrafficProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.service = detached_connection_service()
+        self.cm = mock.Mock(send_message_async=mock.AsyncMock())
+
+    def _send(self, target, msg_type, payload=None):
+        message = {'id': 0, 'component': 'console', 'type': msg_type, 'target': target, 'payload': payload}
+        asyncio.run(self.service._send_to_wire(self.cm, message))
+        return len(json.dumps(message))
+
+    def test_report_groups_traffic_and_callbacks(self):
+        component = Component.__new__(Component)
+        component.instance_id = 'button-1'
+        output = io.StringIO()
+        with redirect_stdout(output), sidekick.profile() as traffic:
+            size = sum(self._send('console-1', 'update', {'action': 'append', 'options': {'text': 'x' * 50}}) for _ in range(3))
+            self._send('button-1', 'spawn', {'text': 'Go'})
+            component._call_instrumented_callback(mock.Mock(), mock.Mock(type='click'))
+
+        rows = traffic.rows()
+        self.assertEqual((rows[0]['instance_id'], rows[0]['action'], rows[0]['messages'], rows[0]['bytes']),
+                         ('console-1', 'append', 3, size))
+        by_key = {(row['instance_id'], row['action']): row for row in rows}
+        self.assertEqual(by_key[('button-1', 'spawn')]['messages'], 1)
+        self.assertEqual(by_key[('button-1', 'click')]['callbacks'], 1)
+        self.assertIn('console-1', output.getvalue().splitlines()[2])
+
+        # Nothing is recorded once the block has ended.
+        self._send('console-1', 'update', {'action': 'clear'})
+        self.assertEqual(len(traffic.rows()), 3)
+
+    def test_json_output_and_invalid_arguments(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.json')
+            with sidekick.profile(output=path, sort_by='messages'):
+                self._send('grid-1', 'update', {'action': 'setColor'})
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        self.assertEqual(data['messages'], 1)
+        self.assertEqual(data['rows'][0]['instance_id'], 'grid-1')
+
+        with self.assertRaises(ValueError):
+            with sidekick.profile(sort_by='size'):
+                pass
+        with sidekick.profile(output=os.devnull):
+            with self.assertRaises(RuntimeError):
+                with sidekick.profile():
+                    pass
+
+    def test_counts_messages_still_queued_when_the_block_ends(self):
+        send_raw = ConnectionService._send_raw
+
+        async def slow_send_raw(service, cm, msg_str):
+            await asyncio.sleep(0.01) # A slow wire keeps messages queued past the block
+            await send_raw(service, cm, msg_str)
+
+        with HeadlessUI(), mock.patch.object(ConnectionService, '_send_raw', slow_send_raw):
+            with redirect_stdout(io.StringIO()), sidekick.profile() as traffic:
+                console = sidekick.Console(instance_id='console')
+                for i in range(20):
+                    console.print(i)
+        by_action = {row['action']: row['messages'] for row in traffic.rows()}
+        self.assertEqual(by_action, {'spawn': 1, 'append': 20})
+
+    def test_payload_build_time_is_attributed_to_the_component(self):
+        with HeadlessUI(), redirect_stdout(io.StringIO()), sidekick.profile() as traffic:
+            viz = sidekick.Viz(instance_id='viz')
+            items = sidekick.ObservableValue([])
+            viz.show('table', [{'row': i, 'cells': list(range(20))} for i in range(50)])
+            viz.show('items', items)
+            items.append(1)
+        by_key = {(row['instance_id'], row['action']): row for row in traffic.rows()}
+        self.assertGreater(by_key[('viz', 'show')]['build_time'], 0)
+        self.assertEqual(by_key[('viz', 'show')]['messages'], 0) # Its messages are counted by action
+        self.assertEqual(by_key[('viz', 'set')]['messages'], 2)
+        self.assertGreater(by_key[('viz', 'observable')]['build_time'], 0)
+        self.assertEqual(by_key[('viz', 'append')]['messages'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import sidekick
+from sidekick.connection_service import ConnectionService
+from sidekick.recorder import RECEIVED, SENT, MessageRecorder, read_recording
+from sidekick.testing import HeadlessUI
+
+
+class TestMessageRecorder(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'session.log')
+
+    def test_round_trip_across_blocks(self):
+        with MessageRecorder(self.path, block_size=3) as recorder:
+            for i in range(10):
+                recorder.record(SENT if i % 2 else RECEIVED, json.dumps({'i': i, 'text': 'é' * i}))
+        messages = list(read_recording(self.path))
+
+        self.assertEqual(recorder.messages_recorded, 10)
+        self.assertEqual(recorder.bytes_written, os.path.getsize(self.path))
+        self.assertEqual([json.loads(m.message)['i'] for m in messages], list(range(10)))
+        self.assertEqual(messages[3].direction, SENT)
+        self.assertEqual(json.loads(messages[4].message)['text'], 'éééé')
+        self.assertEqual(sorted(m.timestamp for m in messages), [m.timestamp for m in messages])
+
+    def test_truncated_file_is_read_up_to_last_full_block(self):
+        with MessageRecorder(self.path, block_size=2) as recorder:
+            for i in range(4):
+                recorder.record(SENT, str(i))
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+        with self.assertLogs('sidekick', level='WARNING'):
+            self.assertEqual([m.message for m in read_recording(self.path)], ['0', '1'])
+
+        with open(self.path, 'wb') as f:
+            f.write(b'not a recording at all')
+        with self.assertRaises(ValueError):
+            list(read_recording(self.path))
+        with self.assertRaises(ValueError):
+            MessageRecorder(self.path, codec='lz4')
+
+    def test_records_a_session(self):
+        with HeadlessUI() as ui:
+            with sidekick.record(self.path):
+                button = sidekick.Button('Go', instance_id='button')
+                button.on_click(lambda event: None)
+                ui.flush()
+                ui.click('button')
+                ui.flush()
+
+        messages = [(m.direction, json.loads(m.message)) for m in read_recording(self.path)]
+        sent_types = [message['type'] for direction, message in messages if direction == SENT]
+        self.assertEqual(sent_types[:3], ['announce', 'clearAll', 'spawn'])
+        self.assertIn((RECEIVED, 'click'), [(d, m.get('payload', {}).get('event')) for d, m in messages])
+
+    def test_records_messages_still_queued_when_the_block_ends(self):
+        send_raw = ConnectionService._send_raw
+
+        async def slow_send_raw(service, cm, msg_str):
+            await asyncio.sleep(0.01) # A slow wire keeps messages queued past the block
+            await send_raw(service, cm, msg_str)
+
+        with HeadlessUI(), mock.patch.object(ConnectionService, '_send_raw', slow_send_raw):
+            with sidekick.record(self.path):
+                console = sidekick.Console(instance_id='console')
+                for i in range(20):
+                    console.print(i)
+
+        updates = [json.loads(m.message) for m in read_recording(self.path) if m.direction == SENT]
+        self.assertEqual(sum(1 for message in updates if message['type'] == 'update'), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
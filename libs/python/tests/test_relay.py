@@ -0,0 +1,142 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import websockets
+
+from sidekick.relay import RelayLimits, SidekickRelay
+
+
+def _announce(peer_id, role, status):
+    return json.dumps({'id': 0, 'component': 'system', 'type': 'announce',
+                       'payload': {'peerId': peer_id, 'role': role, 'status': status, 'version': '1', 'timestamp': 1}})
+
+
+async def _receive(websocket):
+    return json.loads(await asyncio.wait_for(websocket.recv(), 5))
+
+
+class TestSidekickRelay(unittest.TestCase):
+
+    def test_routes_within_sessions(self):
+        async def scenario():
+            relay = SidekickRelay(port=0)
+            url = await relay.start()
+            try:
+                async with websockets.connect(f'{url}/?session=a') as hero, \
+                        websockets.connect(f'{url}/?session=a') as ui, \
+                        websockets.connect(f'{url}/?session=b') as other:
+                    await hero.send(_announce('hero-1', 'hero', 'online'))
+                    await hero.send(json.dumps({'component': 'grid', 'type': 'update', 'payload': {'lost': True}}))
+                    await other.send(_announce('hero-2', 'hero', 'online'))
+                    await asyncio.sleep(0.1)
+
+                    # A newcomer learns who is online, but nothing sent before it announced itself.
+                    async with websockets.connect(f'{url}/?session=a') as late:
+                        self.assertEqual((await _receive(late))['payload']['peerId'], 'hero-1')
+                    await ui.send(_announce('sidekick-1', 'sidekick', 'online'))
+                    self.assertEqual((await _receive(hero))['payload']['peerId'], 'sidekick-1')
+
+                    update = json.dumps({'component': 'grid', 'type': 'update', 'payload': {'i': 1}})
+                    await hero.send(update)
+                    self.assertEqual(await asyncio.wait_for(ui.recv(), 5), update)
+
+                    self.assertEqual(relay.stats()['sessions'], 2)
+                    await hero.close()
+                    offline = await _receive(ui)
+                    self.assertEqual((offline['payload']['peerId'], offline['payload']['status']), ('hero-1', 'offline'))
+                    with self.assertRaises(asyncio.TimeoutError):
+                        await asyncio.wait_for(other.recv(), 0.2)
+            finally:
+                await relay.close()
+
+        asyncio.run(scenario())
+
+    def test_enforces_session_rules_and_limits(self):
+        async def scenario():
+            relay = SidekickRelay(port=0, limits=RelayLimits(max_peers_per_session=1), require_session=True)
+            url = await relay.start()
+            try:
+                with self.assertRaises(websockets.exceptions.InvalidStatusCode) as missing:
+                    await websockets.connect(url)
+                self.assertEqual(missing.exception.status_code, 400)
+                async with websockets.connect(f'{url}/?session=a'):
+                    with self.assertRaises(websockets.exceptions.InvalidStatusCode) as full:
+                        await websockets.connect(f'{url}/?session=a')
+                    self.assertEqual(full.exception.status_code, 503)
+            finally:
+                await relay.close()
+
+        asyncio.run(scenario())
+
+    def test_limit_is_rechecked_after_concurrent_handshakes(self):
+        async def scenario():
+            relay = SidekickRelay(port=0, limits=RelayLimits(max_peers_per_session=1))
+            relay._check_request = mock.AsyncMock(return_value=None) # As if both handshakes were checked at once
+            url = await relay.start()
+            try:
+                async with websockets.connect(f'{url}/?session=a'), websockets.connect(f'{url}/?session=a') as extra:
+                    with self.assertRaises(websockets.exceptions.ConnectionClosed) as closed:
+                        await asyncio.wait_for(extra.recv(), 5)
+                    self.assertEqual(closed.exception.rcvd.code, 1013)
+                    self.assertEqual(relay.stats()['connections'], 1)
+            finally:
+                await relay.close()
+
+        asyncio.run(scenario())
+
+    def test_slow_peer_pauses_sender_then_is_dropped(self):
+        async def scenario():
+            limits = RelayLimits(max_peer_buffer=64 * 1024, slow_peer_timeout=0.5)
+            relay = SidekickRelay(port=0, limits=limits)
+            url = await relay.start()
+            # The UI never reads: its client stops reading once one message is queued.
+            ui = await websockets.connect(f'{url}/?session=a', max_queue=1, max_size=None)
+            try:
+                async with websockets.connect(f'{url}/?session=a') as hero:
+                    await hero.send(_announce('hero-1', 'hero', 'online'))
+                    await asyncio.sleep(0.1)
+                    await ui.send(_announce('sidekick-1', 'sidekick', 'online'))
+                    await _receive(hero) # The UI's announcement
+                    payload = 'x' * (512 * 1024)
+                    count = 64 # Far more than the socket buffers between relay and UI hold
+                    total = count + 2 # With both announcements
+                    sending = asyncio.ensure_future(asyncio.gather(*(hero.send(payload) for _ in range(count))))
+
+                    await asyncio.sleep(0.3) # Less than slow_peer_timeout
+                    self.assertEqual(relay.slow_peers_dropped, 0)
+                    self.assertLess(relay.messages_received, total) # Paused: the relay stopped reading the hero
+
+                    deadline = asyncio.get_running_loop().time() + 10
+                    while relay.messages_received < total and asyncio.get_running_loop().time() < deadline:
+                        await asyncio.sleep(0.05)
+                    self.assertEqual(relay.slow_peers_dropped, 1)
+                    self.assertEqual(relay.messages_received, total) # Resumed once the UI was dropped
+                    await asyncio.wait_for(sending, 5)
+            finally:
+                ui.transport.abort() # A closing handshake would wait for the unread messages
+                await ui.wait_closed()
+                await relay.close()
+
+        asyncio.run(scenario())
+
+    def test_oversized_message_disconnects_sender(self):
+        async def scenario():
+            relay = SidekickRelay(port=0, limits=RelayLimits(max_message_size=1024))
+            url = await relay.start()
+            try:
+                async with websockets.connect(f'{url}/?session=a') as hero:
+                    await hero.send(_announce('hero-1', 'hero', 'online'))
+                    await hero.send('x' * 2048)
+                    with self.assertRaises(websockets.exceptions.ConnectionClosed) as closed:
+                        await asyncio.wait_for(hero.recv(), 5)
+                    self.assertEqual(closed.exception.rcvd.code, 1009) # Message too big
+            finally:
+                await relay.close()
+
+        asyncio.run(scenario())
+
+
+if __name__ == '__main__':
+    unittest.main()
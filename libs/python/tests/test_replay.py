@@ -0,0 +1,72 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+import websockets
+
+import sidekick
+from sidekick.recorder import RECEIVED, SENT, MessageRecorder
+from sidekick.replay import load_outbound, parse_speed, run_replays
+from sidekick.testing import HeadlessUI
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'session.log')
+        with MessageRecorder(self.path) as recorder:
+            recorder.record(SENT, json.dumps({'component': 'system', 'type': 'announce', 'payload': {'role': 'hero'}}))
+            for i in range(5):
+                recorder.record(SENT, json.dumps({'component': 'console', 'type': 'update', 'target': 'c', 'payload': {'i': i}}))
+            recorder.record(SENT, json.dumps({'component': 'headless', 'type': 'flush', 'payload': {'token': 1}}))
+            recorder.record(RECEIVED, json.dumps({'component': 'button', 'type': 'event'}))
+
+    def test_parse_speed(self):
+        self.assertIsNone(parse_speed('max'))
+        self.assertEqual(parse_speed('10x'), 10.0)
+        self.assertEqual(parse_speed('2.5'), 2.5)
+        for invalid in ('0x', 'fast'):
+            with self.assertRaises(ValueError):
+                parse_speed(invalid)
+
+    def test_headless_flush_markers_are_not_replayed(self):
+        with HeadlessUI() as ui, sidekick.record(self.path):
+            sidekick.Label('hello')
+            ui.flush()
+        sent = [json.loads(message) for _, message in load_outbound(self.path)]
+        components = [m['component'] for m in sent]
+        self.assertIn('label', components)
+        self.assertNotIn('headless', components)
+
+    def test_concurrent_replays_send_the_outbound_stream(self):
+        messages = load_outbound(self.path)
+        self.assertEqual(len(messages), 5)
+        received = {}
+
+        async def handle(websocket):
+            session = websocket.path
+            async for raw in websocket:
+                received.setdefault(session, []).append(json.loads(raw))
+
+        async def scenario():
+            async with websockets.serve(handle, '127.0.0.1', 0) as server:
+                port = next(iter(server.sockets)).getsockname()[1]
+                results = await run_replays(messages, f'ws://127.0.0.1:{port}/?session={{n}}', 50.0, 2)
+                await asyncio.sleep(0.1)
+            return results
+
+        results = asyncio.run(scenario())
+        self.assertEqual([(r.replay, r.messages) for r in results], [(0, 5), (1, 5)])
+        self.assertEqual(sorted(received), ['/?session=0', '/?session=1'])
+        for stream in received.values():
+            statuses = [m['payload']['status'] for m in stream if m['type'] == 'announce']
+            self.assertEqual(statuses, ['online', 'offline'])
+            self.assertEqual([m['payload']['i'] for m in stream if m['type'] == 'update'], list(range(5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
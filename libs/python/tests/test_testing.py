@@ -0,0 +1,86 @@
+import unittest
+
+import sidekick
+from sidekick.testing import HeadlessUI
+
+
+class TestHeadlessUI(unittest.TestCase):
+
+    def setUp(self):
+        self.ui = HeadlessUI().start()
+        self.addCleanup(self.ui.stop)
+
+    def test_components_are_modelled(self):
+        row = sidekick.Row(instance_id='row')
+        grid = sidekick.Grid(3, 2, instance_id='grid', parent=row)
+        console = sidekick.Console(instance_id='console')
+        canvas = sidekick.Canvas(50, 50, instance_id='canvas')
+        label = sidekick.Label('Idle', instance_id='label')
+        grid.set_color(1, 0, 'red')
+        grid.set_text(1, 0, 'A')
+        grid.set_color(2, 1, 'blue')
+        grid.clear_cell(2, 1)
+        console.print('hello')
+        console.print('world')
+        canvas.draw_circle(10, 10, 5)
+        label.text = 'Done'
+        self.ui.flush()
+
+        self.assertTrue(self.ui.hero_online)
+        self.assertEqual(self.ui.root, ['row', 'console', 'canvas', 'label'])
+        self.assertEqual(self.ui.component('row').children, ['grid'])
+        self.assertEqual(self.ui.component('grid').cells, {(1, 0): {'color': 'red', 'text': 'A'}})
+        self.assertEqual(self.ui.component('console').text, 'hello\nworld\n')
+        self.assertEqual([op['action'] for op in self.ui.component('canvas').ops], ['drawCircle'])
+        self.assertEqual(self.ui.component('label').text, 'Done')
+
+        row.remove()
+        self.ui.flush()
+        self.assertNotIn('grid', self.ui.components)
+
+    def test_viz_variables_follow_observable_changes(self):
+        viz = sidekick.Viz(instance_id='viz')
+        items = sidekick.ObservableValue([1, 2])
+        viz.show('items', items)
+        viz.show('config', {'size': 3, 'tags': ['a']})
+        items.append(3)
+        items[0] = 10
+        del items[1]
+        with items.batch():
+            items.append(4)
+            items.insert(0, 0)
+        self.ui.flush()
+
+        model = self.ui.component('viz')
+        self.assertEqual(model.variable('items'), [0, 10, 3, 4])
+        self.assertEqual(model.variable('config'), {'size': 3, 'tags': ['a']})
+
+        viz.remove_variable('config')
+        self.ui.flush()
+        self.assertNotIn('config', model.variables)
+
+    def test_injected_events_reach_callbacks(self):
+        clicks = []
+        submitted = []
+        button = sidekick.Button('Go', instance_id='button')
+        grid = sidekick.Grid(2, 2, instance_id='grid')
+        textbox = sidekick.Textbox(instance_id='textbox')
+        button.on_click(lambda event: clicks.append(event.instance_id))
+        grid.on_click(lambda event: grid.set_color(event.x, event.y, 'green'))
+        textbox.on_submit(lambda event: submitted.append(event.value))
+        self.ui.flush()
+
+        self.ui.click('button')
+        self.ui.click('grid', 1, 0)
+        self.ui.submit('textbox', 'typed')
+        self.ui.flush()
+
+        self.assertEqual(clicks, ['button'])
+        self.assertEqual(submitted, ['typed'])
+        self.assertEqual(self.ui.component('grid').cell(1, 0), {'color': 'green'})
+        with self.assertRaises(KeyError):
+            self.ui.click('missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
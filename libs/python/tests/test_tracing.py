@@ -0,0 +1,127 @@
+import asyncio
+import contextlib
+import json
+import sys
+import threading
+import types
+import unittest
+from unittest import mock
+
+from sidekick import _version, callbacks, tracing
+from sidekick.component import Component
+
+from helpers import detached_connection_service
+
+
+class RecordingTracer(tracing.Tracer):
+    """Records (name, attributes, parent) of every span, and the nesting depth."""
+
+    def __init__(self):
+        self.spans = []
+        self.depth = 0
+
+    @contextlib.contextmanager
+    def start_span(self, name, attributes=None, parent=None):
+        self.spans.append((name, attributes, parent, self.depth))
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+
+    def capture_context(self):
+        return f'context-{len(self.spans)}'
+
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        self.tracer = RecordingTracer()
+        tracing.set_tracer(self.tracer)
+        self.addCleanup(tracing.set_tracer, None)
+        self.service = detached_connection_service()
+
+    def test_callback_span_nests_inside_inbound_dispatch(self):
+        component = Component.__new__(Component)
+        component.component_type, component.instance_id, component._callback_mode = 'button', 'button-1', None
+        callback = mock.Mock()
+        self.service.register_component_message_handler(
+            'button-1', lambda msg: component._invoke_callback(callback, mock.Mock(type='click'))
+        )
+        self.service._dispatch_inbound_message(json.dumps({'component': 'button', 'type': 'event', 'src': 'button-1'}))
+
+        callback.assert_called_once()
+        names = [(name, depth) for name, _, _, depth in self.tracer.spans]
+        self.assertEqual(names, [('sidekick.inbound_dispatch', 0), ('sidekick.callback', 1)])
+        self.assertEqual(self.tracer.spans[1][1]['sidekick.instance_id'], 'button-1')
+
+    def test_thread_mode_callback_span_keeps_the_dispatch_context(self):
+        component = Component.__new__(Component)
+        component.component_type, component.instance_id, component._callback_mode = 'button', 'button-1', 'thread'
+        self.addCleanup(callbacks._dispatcher.shutdown, True)
+        ran = threading.Event()
+        self.service.register_component_message_handler(
+            'button-1', lambda msg: component._invoke_callback(lambda event: ran.set(), mock.Mock(type='click'))
+        )
+        self.service._dispatch_inbound_message(json.dumps({'component': 'button', 'type': 'event', 'src': 'button-1'}))
+
+        self.assertTrue(ran.wait(5))
+        callbacks._dispatcher.shutdown(wait=True)
+        name, _, parent, _ = self.tracer.spans[1]
+        self.assertEqual(name, 'sidekick.callback')
+        self.assertEqual(parent, 'context-1') # Captured inside the inbound_dispatch span
+
+    def test_wire_send_span_uses_captured_parent(self):
+        cm = mock.Mock(send_message_async=mock.AsyncMock())
+        message = {'component': 'grid', 'type': 'update', 'target': 'grid-1'}
+        asyncio.run(self.service._send_to_wire(cm, message, trace_context='context-from-send-command'))
+
+        name, attributes, parent, _ = self.tracer.spans[0]
+        self.assertEqual(name, 'sidekick.send')
+        self.assertEqual(parent, 'context-from-send-command')
+        self.assertEqual(attributes['sidekick.instance_id'], 'grid-1')
+
+    def test_no_tracer_is_a_no_op(self):
+        tracing.set_tracer(None)
+        self.assertIsNone(tracing.capture_context())
+        with tracing.span('sidekick.send'):
+            pass
+        with self.assertRaises(TypeError):
+            tracing.set_tracer(object())
+
+    def test_untraced_inbound_dispatch_skips_the_span(self):
+        tracing.set_tracer(None)
+        handler = mock.Mock()
+        self.service.register_component_message_handler('button-1', handler)
+        with mock.patch.object(tracing, 'span') as span:
+            self.service._dispatch_inbound_message(json.dumps({'component': 'button', 'type': 'event', 'src': 'button-1'}))
+        handler.assert_called_once()
+        span.assert_not_called()
+
+
+class TestOpenTelemetryTracer(unittest.TestCase):
+
+    def test_delegates_to_the_opentelemetry_api(self):
+        opentelemetry = types.ModuleType('opentelemetry')
+        opentelemetry.context = mock.Mock(get_current=mock.Mock(return_value='current-context'))
+        opentelemetry.trace = mock.Mock()
+        otel_tracer = opentelemetry.trace.get_tracer.return_value
+        with mock.patch.dict(sys.modules, {'opentelemetry': opentelemetry}):
+            tracer = tracing.OpenTelemetryTracer(tracer_provider='provider')
+
+        opentelemetry.trace.get_tracer.assert_called_once_with('sidekick', _version.__version__, tracer_provider='provider')
+        self.assertEqual(tracer.capture_context(), 'current-context')
+        span = tracer.start_span('sidekick.send', {'sidekick.component': 'grid'}, parent='parent-context')
+        otel_tracer.start_as_current_span.assert_called_once_with(
+            'sidekick.send', context='parent-context', attributes={'sidekick.component': 'grid'}
+        )
+        self.assertIs(span, otel_tracer.start_as_current_span.return_value)
+
+    def test_missing_package_raises_import_error_with_hint(self):
+        with mock.patch.dict(sys.modules, {'opentelemetry': None}):
+            with self.assertRaisesRegex(ImportError, 'pip install opentelemetry-api'):
+                tracing.OpenTelemetryTracer()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import gc
+import importlib.util
+import subprocess
+import sys
+import unittest
+import weakref
+from unittest import mock
+
+from sidekick.viz import (
+    _CACHE_MAX_NODES,
+    _MAX_ITEMS,
+    _TYPE_HANDLERS,
+    _type_handler_cache,
+    _diff_representation,
+    _get_representation,
+    _representation_cache,
+    _resolve_path,
+    register_repr,
+)
+
+
+class TestVizRepresentation(unittest.TestCase):
+    """Unit tests for the Viz representation helpers."""
+
+    def test_small_list_is_not_paged(self):
+        rep = _get_representation([1, 2, 3])
+        self.assertEqual(rep['length'], 3)
+        self.assertNotIn('pageOffset', rep)
+        self.assertEqual([item['value'] for item in rep['value']], [1, 2, 3])
+
+    def test_large_list_is_windowed(self):
+        data = list(range(_MAX_ITEMS * 2 + 20))
+        first = _get_representation(data)
+        self.assertEqual(first['pageOffset'], 0)
+        self.assertEqual(first['value'][-1]['type'], 'truncated')
+        self.assertEqual(first['value'][0]['value'], 0)
+
+        last = _get_representation(data, offset=_MAX_ITEMS * 2)
+        self.assertEqual(last['pageOffset'], _MAX_ITEMS * 2)
+        self.assertEqual([item['value'] for item in last['value']], data[_MAX_ITEMS * 2:])
+
+    def test_large_dict_and_set_are_windowed_in_iteration_order(self):
+        data = {f'k{i}': i for i in range(_MAX_ITEMS + 10)}
+        page = _get_representation(data, offset=_MAX_ITEMS)
+        self.assertEqual(page['pageOffset'], _MAX_ITEMS)
+        self.assertEqual([item['key']['value'] for item in page['value']], list(data)[_MAX_ITEMS:])
+
+        items = set(range(_MAX_ITEMS + 10))
+        page = _get_representation(items, offset=_MAX_ITEMS)
+        self.assertEqual([item['value'] for item in page['value']], list(items)[_MAX_ITEMS:])
+
+    def test_resolve_path(self):
+        data = {'a': [10, {'b': 'x'}]}
+        self.assertEqual(_resolve_path(data, ['a', 1, 'b']), 'x')
+        with self.assertRaises(LookupError):
+            _resolve_path(data, ['a', 5])
+
+    def test_immutable_tuples_are_cached(self):
+        _representation_cache.clear()
+        table = tuple(('row', i) for i in range(20))
+        self.assertIs(_get_representation(table), _get_representation(table))
+
+        mutable_inside = tuple([i] for i in range(20))
+        self.assertIsNot(_get_representation(mutable_inside), _get_representation(mutable_inside))
+
+    def test_uncacheable_tuples_are_checked_once(self):
+        _representation_cache.clear()
+        mutable_inside = tuple([i] for i in range(20))
+        huge = tuple(range(_CACHE_MAX_NODES)) # Shows 50 items, but would keep all of them alive
+        with mock.patch.object(_representation_cache, 'put', wraps=_representation_cache.put) as put:
+            for _ in range(3):
+                _get_representation(mutable_inside)
+                _get_representation(huge)
+        self.assertEqual(put.call_count, 2) # Each was walked once, then remembered as not cacheable
+        self.assertIsNot(_get_representation(huge), _get_representation(huge))
+
+
+class TestRegisterRepr(unittest.TestCase):
+    """Unit tests for custom display functions registered with `register_repr`."""
+
+    class Point:
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    class Point3D(Point):
+        pass
+
+    def tearDown(self):
+        _TYPE_HANDLERS.pop(self.Point, None)
+        _type_handler_cache.clear()
+
+    def test_dict_result_is_shown_as_fields_in_order(self):
+        @register_repr(self.Point)
+        def show_point(p):
+            return {'y': p.y, 'x': p.x}
+
+        rep = _get_representation(self.Point(1, 2))
+        self.assertEqual(rep['type'], 'object (Point)')
+        self.assertEqual(list(rep['value']), ['y', 'x'])
+
+    def test_subclasses_use_the_registered_function(self):
+        register_repr(self.Point, lambda p: f'({p.x}, {p.y})')
+        rep = _get_representation([self.Point3D(1, 2)])
+        self.assertEqual(rep['value'][0]['value'], '(1, 2)')
+
+    def test_invalid_registration(self):
+        with self.assertRaises(TypeError):
+            register_repr(42, lambda value: value)
+        with self.assertRaises(TypeError):
+            register_repr(self.Point, 'not callable')
+
+    def test_dispatch_cache_does_not_keep_types_alive(self):
+        dynamic_type = type('Dynamic', (), {})
+        _get_representation(dynamic_type())
+        self.assertIn(dynamic_type, _type_handler_cache)
+        type_ref = weakref.ref(dynamic_type)
+        del dynamic_type
+        gc.collect()
+        self.assertIsNone(type_ref())
+
+
+class TestVizSummaries(unittest.TestCase):
+    """Unit tests for the NumPy/pandas summary handlers."""
+
+    def test_import_does_not_load_numpy_or_pandas(self):
+        code = "import sys, sidekick; print('numpy' in sys.modules or 'pandas' in sys.modules)"
+        output = subprocess.check_output([sys.executable, '-c', code], text=True)
+        self.assertEqual(output.strip(), 'False')
+
+    @unittest.skipUnless(importlib.util.find_spec('numpy'), 'NumPy is not installed')
+    def test_ndarray_summary(self):
+        import numpy
+        rep = _get_representation(numpy.arange(1000).reshape(100, 10))
+        self.assertEqual(rep['type'], 'object (ndarray)')
+        fields = rep['value']
+        self.assertEqual([item['value'] for item in fields['shape']['value']], [100, 10])
+        self.assertEqual(fields['max']['value'], 999)
+        self.assertEqual(len(fields['preview']['value']), 8)
+
+    @unittest.skipUnless(importlib.util.find_spec('pandas'), 'pandas is not installed')
+    def test_dataframe_summary(self):
+        import pandas
+        rep = _get_representation(pandas.DataFrame({'a': range(30), 'b': ['x'] * 30}))
+        self.assertEqual(rep['type'], 'object (DataFrame)')
+        fields = rep['value']
+        self.assertEqual([item['value'] for item in fields['columns']['value']], ['a: int64', 'b: ' + str(pandas.Series(['x']).dtype)])
+        self.assertEqual(fields['tail']['value'][-1]['value'][0]['value'], 29)
+
+
+class TestVizDiff(unittest.TestCase):
+    """Unit tests for the incremental updates sent when re-showing plain values."""
+
+    def _diff(self, old, new):
+        return _diff_representation(_get_representation(old), _get_representation(new))
+
+    def test_unchanged_value_sends_nothing(self):
+        self.assertEqual(self._diff([1, [2, 3]], [1, [2, 3]]), [])
+
+    def test_list_changes(self):
+        patches = self._diff([1, 2, 3], [1, 5, 3, 4])
+        self.assertEqual([(action, options['path']) for action, options in patches],
+                         [('setitem', [1]), ('append', [3])])
+
+        patches = self._diff([1, 2, 3], [1])
+        self.assertEqual([(action, options['path'], options['length']) for action, options in patches],
+                         [('delitem', [2], 2), ('delitem', [1], 1)])
+
+    def test_nested_dict_changes(self):
+        patches = self._diff({'a': 1, 'b': [1, 2]}, {'b': [1, 3], 'c': 2})
+        self.assertEqual([(action, options['path']) for action, options in patches],
+                         [('delitem', ['a']), ('setitem', ['b', 1]), ('setitem', ['c'])])
+        self.assertIn('keyRepresentation', patches[-1][1])
+
+    def test_root_replacement_falls_back(self):
+        self.assertIsNone(self._diff([1, 2], {'a': 1}))
+        self.assertIsNone(self._diff(1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,6 +10,9 @@ import {
     CanvasState,
     CanvasUpdatePayload,
     CanvasClickEventMessage,
+    CanvasPointerEventMessage,
+    CanvasPointerPayload,
+    SetPointerEventsOptions,
     // Import specific options types for type safety
     ClearOptions,
     DrawLineOptions,
@@ -40,6 +43,20 @@ interface CanvasComponentProps {
 // Type alias for possible rendering contexts
 type RenderingContext = CanvasRenderingContext2D | OffscreenCanvasRenderingContext2D;
 
+// Pending samples of one pointer stream, sent at most `maxRate` times per second.
+interface PointerStream {
+    points: Array<{ x: number; y: number }>;
+    lastSent: number;             // performance.now() of the last message sent
+    timer: number | null;         // Pending flush timeout, if any
+    phase?: CanvasPointerPayload['phase'];
+}
+
+// Returns the pointer position relative to the canvas's top-left corner.
+function pointerPosition(event: React.PointerEvent<HTMLCanvasElement>): { x: number; y: number } {
+    const rect = event.currentTarget.getBoundingClientRect();
+    return { x: Math.round(event.clientX - rect.left), y: Math.round(event.clientY - rect.top) };
+}
+
 // --- Main Component (Wrapped with forwardRef) ---
 const CanvasComponent = forwardRef<ComponentHandle, CanvasComponentProps>(
     ({ id, state, onInteraction, onReady }, ref) => {
@@ -50,6 +67,12 @@ const CanvasComponent = forwardRef<ComponentHandle, CanvasComponentProps>(
         const offscreenContexts = useRef<Map<number, RenderingContext>>(new Map()); // Stores offscreen rendering contexts (ID -> Context)
         const onscreenCtxRef = useRef<CanvasRenderingContext2D | null>(null); // Ref for the visible canvas's context
         const isReadySignaled = useRef(false); // Track if onReady has been called (handles StrictMode)
+        const pointerConfig = useRef<SetPointerEventsOptions>({}); // Enabled pointer streams and their rates
+        const pointerStreams = useRef<Record<CanvasPointerPayload['event'], PointerStream>>({
+            pointerMove: { points: [], lastSent: 0, timer: null },
+            drag: { points: [], lastSent: 0, timer: null },
+        });
+        const isDragging = useRef(false);
 
         // --- State ---
         const [initError, setInitError] = useState<string | null>(null); // Stores any initialization error message
@@ -178,6 +201,12 @@ const CanvasComponent = forwardRef<ComponentHandle, CanvasComponentProps>(
 
             const { action, options } = payload;
 
+            // Pointer stream configuration doesn't draw anything.
+            if (action === 'setPointerEvents') {
+                pointerConfig.current = { ...(options as SetPointerEventsOptions) };
+                return;
+            }
+
             // Determine the target rendering context and buffer ID
             let targetCtx: RenderingContext | null = null;
             let targetBufferId: number = ONSCREEN_BUFFER_ID; // Default to onscreen (0)
@@ -465,6 +494,77 @@ const CanvasComponent = forwardRef<ComponentHandle, CanvasComponentProps>(
         }, [id, onInteraction]);
 
 
+        // --- Pointer Streams ---
+        // Pointer positions are collected and sent as one event with all samples,
+        // at most `maxRate` times per second, so fast mouse movement doesn't
+        // flood the Python side. The start and end of a drag are sent immediately.
+        const flushPointerStream = useCallback((event: CanvasPointerPayload['event']) => {
+            const stream = pointerStreams.current[event];
+            if (stream.timer !== null) {
+                window.clearTimeout(stream.timer);
+                stream.timer = null;
+            }
+            if (!onInteraction || stream.points.length === 0) return;
+            const message: CanvasPointerEventMessage = {
+                id: 0, component: 'canvas', type: 'event', src: id,
+                payload: event === 'drag'
+                    ? { event, points: stream.points, phase: stream.phase ?? 'move' }
+                    : { event, points: stream.points }
+            };
+            stream.points = [];
+            stream.phase = undefined;
+            stream.lastSent = performance.now();
+            onInteraction(message);
+        }, [id, onInteraction]);
+
+        const queuePointerSample = useCallback((event: CanvasPointerPayload['event'], point: { x: number; y: number }) => {
+            const maxRate = event === 'drag' ? pointerConfig.current.drag : pointerConfig.current.move;
+            if (!maxRate || maxRate <= 0) return;
+            const stream = pointerStreams.current[event];
+            stream.points.push(point);
+            if (stream.timer !== null) return; // A flush is already scheduled
+            const wait = stream.lastSent + 1000 / maxRate - performance.now();
+            if (wait <= 0) {
+                flushPointerStream(event);
+            } else {
+                stream.timer = window.setTimeout(() => flushPointerStream(event), wait);
+            }
+        }, [flushPointerStream]);
+
+        const handlePointerDown = useCallback((event: React.PointerEvent<HTMLCanvasElement>) => {
+            if (event.button !== 0 || !pointerConfig.current.drag) return;
+            isDragging.current = true;
+            event.currentTarget.setPointerCapture(event.pointerId); // Keep receiving moves outside the canvas
+            const stream = pointerStreams.current.drag;
+            stream.points.push(pointerPosition(event));
+            stream.phase = 'start';
+            flushPointerStream('drag');
+        }, [flushPointerStream]);
+
+        const handlePointerMove = useCallback((event: React.PointerEvent<HTMLCanvasElement>) => {
+            queuePointerSample(isDragging.current ? 'drag' : 'pointerMove', pointerPosition(event));
+        }, [queuePointerSample]);
+
+        const handlePointerUp = useCallback((event: React.PointerEvent<HTMLCanvasElement>) => {
+            if (!isDragging.current) return;
+            isDragging.current = false;
+            const stream = pointerStreams.current.drag;
+            stream.points.push(pointerPosition(event));
+            stream.phase = 'end';
+            flushPointerStream('drag'); // Also sends the samples still waiting for the throttle
+        }, [flushPointerStream]);
+
+        // Cancel pending flushes when the component unmounts.
+        useEffect(() => {
+            const streams = pointerStreams.current;
+            return () => {
+                Object.values(streams).forEach(stream => {
+                    if (stream.timer !== null) window.clearTimeout(stream.timer);
+                });
+            };
+        }, []);
+
+
         // --- Render ---
         if (initError) {
             return (
@@ -486,6 +586,10 @@ const CanvasComponent = forwardRef<ComponentHandle, CanvasComponentProps>(
                 height={height}
                 className="canvas-element"
                 onClick={handleCanvasClick} // Attach click handler
+                onPointerDown={handlePointerDown}
+                onPointerMove={handlePointerMove}
+                onPointerUp={handlePointerUp}
+                onPointerCancel={handlePointerUp}
                 style={{
                     maxWidth: '100%', // Ensure responsiveness
                     display: 'block', // Prevents extra space below
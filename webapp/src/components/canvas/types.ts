@@ -45,6 +45,8 @@ export interface DrawTextOptions extends BaseBufferOptions { x: number; y: numbe
 export interface CreateBufferOptions { bufferId: number; }
 export interface DrawBufferOptions { sourceBufferId: number; targetBufferId: number; }
 export interface DestroyBufferOptions { bufferId: number; }
+/** Enables pointer event streams. Each value is the maximum number of events per second, or null to disable the stream. */
+export interface SetPointerEventsOptions { move?: number | null; drag?: number | null; }
 
 // --- Update Payload (Discriminated Union - commandId removed) ---
 export type CanvasUpdatePayload =
@@ -58,7 +60,8 @@ export type CanvasUpdatePayload =
     | { action: "drawText";    options: DrawTextOptions; }
     | { action: "createBuffer";options: CreateBufferOptions; }
     | { action: "drawBuffer";  options: DrawBufferOptions; }
-    | { action: "destroyBuffer";options: DestroyBufferOptions; };
+    | { action: "destroyBuffer";options: DestroyBufferOptions; }
+    | { action: "setPointerEvents"; options: SetPointerEventsOptions; };
 
 // --- Event Payload (Sidekick -> Hero) ---
 export interface CanvasClickPayload {
@@ -71,4 +74,18 @@ export interface CanvasClickPayload {
 export interface CanvasClickEventMessage extends ComponentEventMessage {
     component: 'canvas';
     payload: CanvasClickPayload;
+}
+
+export type CanvasPointerPhase = "start" | "move" | "end";
+
+/** Throttled pointer stream event: all positions sampled since the previous event, oldest first. */
+export interface CanvasPointerPayload {
+    event: "pointerMove" | "drag";
+    points: Array<{ x: number; y: number }>;
+    phase?: CanvasPointerPhase; // Only for "drag".
+}
+
+export interface CanvasPointerEventMessage extends ComponentEventMessage {
+    component: 'canvas';
+    payload: CanvasPointerPayload;
 }
\ No newline at end of file
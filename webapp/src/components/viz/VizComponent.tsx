@@ -1,10 +1,11 @@
-import React, { useState, useMemo, forwardRef, useImperativeHandle } from 'react';
+import React, { useState, useMemo, useCallback, forwardRef, useImperativeHandle } from 'react';
 import './VizComponent.css';
-import { VizRepresentation, VizDictKeyValuePair, Path, VizChangeInfo, VizState } from './types';
-import { ComponentHandle, SentMessage } from '../../types';
+import { VizRepresentation, VizDictKeyValuePair, Path, VizChangeInfo, VizState, VizRequestPagePayload } from './types';
+import { ComponentHandle, ComponentEventMessage, SentMessage } from '../../types';
 
 // --- Constants ---
 const HIGHLIGHT_DURATION = 1500; // ms, Duration for the highlight animation
+const DEFAULT_PAGE_LIMIT = 50; // Page size used when the backend did not specify one
 
 // --- Define Props Interface ---
 interface VizComponentProps {
@@ -33,9 +34,10 @@ interface RenderValueProps {
     lastChangeInfo?: VizChangeInfo;// Information about the last change event for the root variable
     depth: number;                 // Current recursion depth
     parentRepId?: string;          // ID of the parent representation (for generating unique keys)
+    onRequestPage?: (path: Path, offset: number, limit: number) => void; // Asks the Hero for another page window
 }
 
-const RenderValue: React.FC<RenderValueProps> = React.memo(({ data, currentPath, lastChangeInfo, depth, parentRepId }) => {
+const RenderValue: React.FC<RenderValueProps> = React.memo(({ data, currentPath, lastChangeInfo, depth, parentRepId, onRequestPage }) => {
     // --- Handle non-VizRepresentation data (e.g., primitive values used directly) ---
     if (data === null || typeof data !== 'object' || !('id' in data && 'type' in data && 'value' in data)) {
         let displayValue = String(data); let className = 'viz-value-primitive';
@@ -80,6 +82,18 @@ const RenderValue: React.FC<RenderValueProps> = React.memo(({ data, currentPath,
     const hasLength = rep.length !== undefined && rep.length > 0;
     const canExpand = (rep.type === 'list' || rep.type === 'dict' || rep.type === 'set' || rep.type.startsWith('object')) && isValueExpandable && hasLength;
 
+    // --- Paging ---
+    // Large containers only carry a window of their items; the pager asks the Hero for other windows.
+    const isPaged = rep.pageOffset !== undefined && rep.length !== undefined;
+    const pageOffset = rep.pageOffset || 0;
+    const pageLimit = rep.pageLimit || DEFAULT_PAGE_LIMIT;
+    const requestPage = (e: React.MouseEvent, offset: number) => {
+        e.stopPropagation();
+        if (onRequestPage) onRequestPage(currentPath, offset, pageLimit);
+    };
+    // The truncation placeholder is redundant when the pager is shown
+    const isPlaceholder = (item: any) => isPaged && (item?.type === 'truncated' || item?.key?.type === 'truncated_key');
+
     return (
         // Use dynamicKey for potential re-mount on highlight
         <div key={dynamicKey} className={`viz-value-container ${typeClassName}${
@@ -102,19 +116,28 @@ const RenderValue: React.FC<RenderValueProps> = React.memo(({ data, currentPath,
             {(!canExpand || !isExpanded) && rep.type !== 'NoneType' && typeof rep.value !== 'object' && (
                 <span className="viz-value-inline">
                     {/* Recursively render the primitive value itself */}
-                    <RenderValue data={rep.value} currentPath={[...currentPath, '(primitive_value)']} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} />
+                    <RenderValue data={rep.value} currentPath={[...currentPath, '(primitive_value)']} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} onRequestPage={onRequestPage} />
                 </span>
             )}
 
+            {/* Pager for containers that only show a window of their items */}
+            {isExpanded && canExpand && isPaged && onRequestPage && (
+                <div className="viz-pager">
+                    <button className="viz-pager-button" disabled={pageOffset === 0} onClick={(e) => requestPage(e, Math.max(0, pageOffset - pageLimit))}>◀</button>
+                    <span className="viz-pager-info">{pageOffset}–{Math.min(pageOffset + pageLimit, rep.length ?? 0) - 1} of {rep.length}</span>
+                    <button className="viz-pager-button" disabled={pageOffset + pageLimit >= (rep.length ?? 0)} onClick={(e) => requestPage(e, pageOffset + pageLimit)}>▶</button>
+                </div>
+            )}
+
             {/* --- Render Expanded Container Content --- */}
             {/* List */}
             {isExpanded && canExpand && rep.type === 'list' && Array.isArray(rep.value) && (
                 <div className="viz-list">
-                    {rep.value.map((item, index) => (
-                        <div key={index} className={`viz-list-item`}>
-                            <span className="viz-list-index">{index}:</span>
-                            {/* Recurse for list item, appending index to path */}
-                            <RenderValue data={item} currentPath={[...currentPath, index]} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} />
+                    {rep.value.map((item, index) => isPlaceholder(item) ? null : (
+                        <div key={pageOffset + index} className={`viz-list-item`}>
+                            <span className="viz-list-index">{pageOffset + index}:</span>
+                            {/* Recurse for list item, appending the absolute index to path */}
+                            <RenderValue data={item} currentPath={[...currentPath, pageOffset + index]} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} onRequestPage={onRequestPage} />
                         </div>
                     ))}
                 </div>
@@ -124,12 +147,13 @@ const RenderValue: React.FC<RenderValueProps> = React.memo(({ data, currentPath,
                 // Sets are represented as sorted arrays, render similarly to lists but without index prefix
                 <div className="viz-list viz-set">
                     {rep.value.map((item, index) => {
+                        if (isPlaceholder(item)) return null;
                         // Use item's ID or index as path segment for sets (less precise highlighting)
                         const itemPathSegment = (item as VizRepresentation)?.id || `set_item_${index}`;
                         return (
                             <div key={index} className={`viz-list-item viz-set-item`}>
                                 {/* Recurse for set item */}
-                                <RenderValue data={item} currentPath={[...currentPath, itemPathSegment]} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} />
+                                <RenderValue data={item} currentPath={[...currentPath, itemPathSegment]} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} onRequestPage={onRequestPage} />
                             </div>
                         );
                     })}
@@ -140,6 +164,7 @@ const RenderValue: React.FC<RenderValueProps> = React.memo(({ data, currentPath,
                 <div className="viz-dict">
                     {rep.value.map((pair: any, index: number) => {
                         if (!isVizDictKeyValuePair(pair)) { return <div key={`error_${index}`} className="viz-dict-item viz-error">Invalid dict pair</div>; }
+                        if (isPlaceholder(pair)) return null;
                         const keyRep = pair.key;
                         const valueRep = pair.value;
                         // Use key's primitive value or ID as path segment
@@ -150,11 +175,11 @@ const RenderValue: React.FC<RenderValueProps> = React.memo(({ data, currentPath,
                                 {/* Render key */}
                                 <span className="viz-dict-key">
                                     {/* Recurse for key, adding '(key)' to path for distinction */}
-                                    <RenderValue data={keyRep} currentPath={[...currentPath, keySegment, '(key)']} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} />
+                                    <RenderValue data={keyRep} currentPath={[...currentPath, keySegment, '(key)']} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} onRequestPage={onRequestPage} />
                                 </span>
                                 {/* Render value */}
                                 {/* Recurse for value, using keySegment in path */}
-                                <RenderValue data={valueRep} currentPath={[...currentPath, keySegment]} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} />
+                                <RenderValue data={valueRep} currentPath={[...currentPath, keySegment]} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} onRequestPage={onRequestPage} />
                             </div>
                         );
                     })}
@@ -169,7 +194,7 @@ const RenderValue: React.FC<RenderValueProps> = React.memo(({ data, currentPath,
                             {/* Render attribute name */}
                             <span className="viz-dict-key viz-attr-name">.{attrName}</span>
                             {/* Recurse for attribute value, using attrName in path */}
-                            <RenderValue data={attrValueRep as VizRepresentation} currentPath={[...currentPath, attrName]} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} />
+                            <RenderValue data={attrValueRep as VizRepresentation} currentPath={[...currentPath, attrName]} lastChangeInfo={lastChangeInfo} depth={depth + 1} parentRepId={repId} onRequestPage={onRequestPage} />
                         </div>
                     ))}
                 </div>
@@ -181,9 +206,22 @@ RenderValue.displayName = 'RenderValue'; // Add display name for React DevTools
 
 // --- Main Viz Component ---
 const VizComponent = forwardRef<ComponentHandle, VizComponentProps>(
-    ({ id, state }, ref) => {
+    ({ id, state, onInteraction }, ref) => {
         // Ensure state exists before destructuring
         const { variables, lastChanges } = state || { variables: {}, lastChanges: {} };
+
+        // Ask the Hero for another page window of a large container inside a variable
+        const requestPage = useCallback((variableName: string, path: Path, offset: number, limit: number) => {
+            if (!onInteraction) {
+                console.warn(`VizComponent ${id}: onInteraction not provided, cannot request page.`);
+                return;
+            }
+            const payload: VizRequestPagePayload = { event: 'requestPage', variableName, path, offset, limit };
+            const message: ComponentEventMessage = {
+                id: 0, component: 'viz', type: 'event', src: id, payload: payload
+            };
+            onInteraction(message);
+        }, [id, onInteraction]);
         // Memoize sorted variable names to prevent recalculation on every render
         const sortedVarNames = useMemo(() => Object.keys(variables).sort(), [variables]);
 
@@ -205,7 +243,7 @@ const VizComponent = forwardRef<ComponentHandle, VizComponentProps>(
                         <div key={varName} className={`viz-variable-item`}>
                             <span className="viz-variable-name">{varName} =</span>
                             {/* Render the top-level value representation */}
-                            <RenderValue data={representation} currentPath={[]} lastChangeInfo={changeInfo} depth={0} parentRepId={id} />
+                            <RenderValue data={representation} currentPath={[]} lastChangeInfo={changeInfo} depth={0} parentRepId={id} onRequestPage={(path, offset, limit) => requestPage(varName, path, offset, limit)} />
                         </div>
                     );
                 })}
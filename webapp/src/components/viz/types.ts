@@ -5,6 +5,8 @@ export interface VizRepresentation {
     length?: number;    // Length if applicable (list, dict, set, etc.)
     observableTracked?: boolean; // True if this node came directly from an ObservableValue
     id: string;         // Unique ID for this representation node (for React keys, etc.)
+    pageOffset?: number; // Index of the first item in 'value' when only a page window is shown
+    pageLimit?: number;  // Page size used by the backend for this window
 }
 
 // Specific structure for dictionary key-value pairs within VizRepresentation.value
@@ -47,8 +49,22 @@ export interface VizUpdatePayload {
         valueRepresentation?: VizRepresentation | null; // New value representation
         keyRepresentation?: VizRepresentation | null;   // Key representation (for dict setitem)
         length?: number | null;                 // New length (for container operations)
+        offset?: number;                        // First item index of the window (for 'setPage')
+        operations?: VizBatchOperation[];       // Operations applied in order (for 'batch')
     };
 }
 
-// Viz component typically doesn't send notifications back based on direct interaction
-// export interface VizNotifyPayload { ... }
\ No newline at end of file
+// One operation of a 'batch' update, with the same action/options as a single update
+export interface VizBatchOperation {
+    action: string;
+    options: VizUpdatePayload['options'];
+}
+
+// Payload sent to the Hero to ask for another page window of a large container
+export interface VizRequestPagePayload {
+    event: "requestPage";
+    variableName: string; // Top-level variable containing the container
+    path: Path;           // Path from the variable root to the container
+    offset: number;       // Index of the first item requested
+    limit: number;        // Maximum number of items requested
+}
@@ -40,20 +40,23 @@ function findNodeInDraft(draftState: VizState, variableName: string, path: Path)
             return undefined; // Cannot navigate further
         }
 
-        // Navigate based on the current node's type
-        switch (currentNode.type) {
+        // Navigate based on the current node's type ("object (ClassName)" nodes navigate like 'object')
+        const nodeKind = typeof currentNode.type === 'string' && currentNode.type.startsWith('object') ? 'object' : currentNode.type;
+        switch (nodeKind) {
             case 'list':
             case 'set': // Sets are represented as arrays internally
+                // Paged containers only hold a window of items, so convert the absolute index.
+                const localIndex = typeof segment === 'number' ? segment - (currentNode.pageOffset || 0) : segment;
                 // Navigate list/set by numeric index
-                if (typeof segment !== 'number' || !Array.isArray(currentNode.value) || segment < 0 || segment >= currentNode.value.length) {
+                if (typeof localIndex !== 'number' || !Array.isArray(currentNode.value) || localIndex < 0 || localIndex >= currentNode.value.length) {
                     // Allow path to point just past the end for potential 'insert'/'setitem' append
-                    if (i === path.length - 1 && segment === currentNode.value.length) {
+                    if (i === path.length - 1 && localIndex === currentNode.value.length) {
                         break; // Let applyModification handle potential append/insert
                     }
                     console.error(`VizLogic: Path navigation failed at segment ${i}. Invalid list/set index '${segment}' for node:`, currentNode);
                     return undefined;
                 }
-                currentNode = currentNode.value[segment];
+                currentNode = currentNode.value[localIndex];
                 break;
             case 'dict':
                 // Navigate dictionary by key (matching value or ID)
@@ -160,6 +163,11 @@ function applyModification(
         return false; // Cannot apply modification if parent doesn't exist
     }
 
+    // Paged lists only hold a window of items; convert the absolute index to a window-relative one.
+    if (parentNode?.type === 'list' && typeof targetSegment === 'number' && parentNode.pageOffset) {
+        targetSegment = targetSegment - parentNode.pageOffset;
+    }
+
     try {
         // Apply modification based on the action type
         switch (action) {
@@ -400,6 +408,39 @@ export function updateState(currentState: VizState, payload: VizUpdatePayload):
             return; // End the recipe after creation attempt or error
         }
 
+        // --- Action: Replace the page window shown for a large container ---
+        if (action === 'setPage') {
+            const node = findNodeInDraft(draftState, variableName, path);
+            const page = options?.valueRepresentation;
+            if (!node || typeof node !== 'object' || !page) {
+                console.warn(`VizLogic: Cannot apply 'setPage' for variable "${variableName}" at path [${path.join(', ')}].`);
+                return;
+            }
+            node.value = page.value;
+            node.length = options.length ?? page.length;
+            node.pageOffset = page.pageOffset;
+            node.pageLimit = page.pageLimit;
+            draftState.lastChanges[variableName] = { action, path, timestamp: Date.now() };
+            return;
+        }
+
+        // --- Action: Apply several granular updates at once (from ObservableValue.batch()) ---
+        if (action === 'batch') {
+            const operations = options?.operations || [];
+            let lastApplied: VizChangeInfo | undefined;
+            for (const operation of operations) {
+                const operationPath = operation.options?.path || [];
+                if (applyModification(draftState, variableName, operation.action, operationPath, operation.options || {})) {
+                    lastApplied = { action: operation.action, path: operationPath, timestamp: Date.now() };
+                } else {
+                    console.warn(`VizLogic: Batch operation "${operation.action}" failed for variable "${variableName}", continuing with the next one.`);
+                }
+            }
+            // Highlight the last change that was applied successfully
+            if (lastApplied) draftState.lastChanges[variableName] = lastApplied;
+            return;
+        }
+
         // --- Action: Update an existing variable ---
         // Attempt to apply the modification directly to the draft state
         const modificationSuccessful = applyModification(
@@ -20,6 +20,11 @@ export default defineConfig(({ mode }) => {
     scriptUrl = JSON.stringify('https://script-sidekick.zhouer.workers.dev');
   }
 
+  // Point a build at a self-hosted relay, e.g. `python -m sidekick.relay` on a LAN.
+  if (process.env.SIDEKICK_WS_URL) {
+    wsUrl = JSON.stringify(process.env.SIDEKICK_WS_URL);
+  }
+
   if (mode === 'development') {
     const websocketServerPlugin = require('./vite-plugin-ws-server').default;
     plugins.push(websocketServerPlugin({ host: wsHost, port: wsPort }));